@@ -0,0 +1,30 @@
+# Generated by Django 3.1.14 on 2026-10-19 07:50
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0006_content_warning_tags"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(ends__isnull=False),
+                fields=["starts"],
+                name="event_multiday_starts_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(repeats__isnull=False),
+                fields=["starts"],
+                name="event_repeats_starts_idx",
+            ),
+        ),
+    ]
@@ -351,6 +351,9 @@ class EventManager(ActivityManager.from_queryset(EventQuerySet)):
 
 class Event(Activity):
 
+    # next dates depend on current time
+    CACHE_RENDERED_CONTENT = False
+
     # not exhaustive!
 
     ADDRESS_FORMATS = [
@@ -451,7 +454,18 @@ class Event(Activity):
 
     class Meta(Activity.Meta):
         indexes = Activity.Meta.indexes + [
-            models.Index(fields=["starts"], name="event_starts_idx")
+            models.Index(fields=["starts"], name="event_starts_idx"),
+            # so each branch of for_dates() can use an index
+            models.Index(
+                fields=["starts"],
+                name="event_multiday_starts_idx",
+                condition=models.Q(ends__isnull=False),
+            ),
+            models.Index(
+                fields=["starts"],
+                name="event_repeats_starts_idx",
+                condition=models.Q(repeats__isnull=False),
+            ),
         ]
 
     def __str__(self):
@@ -31,6 +31,7 @@ from localhub.activities.views.generic import (
     render_activity_list,
 )
 from localhub.common.decorators import add_messages_to_response_header
+from localhub.communities.cache import cache_anonymous_page
 from localhub.communities.decorators import community_required
 from localhub.users.utils import has_perm_or_403
 
@@ -119,6 +120,7 @@ event_detail_view = override_timezone(activity_detail_view)
 
 
 @community_required
+@cache_anonymous_page
 @override_timezone
 def event_detail_view(request, model, pk, template_name, slug=None):
     event = get_activity_or_404(
@@ -132,6 +134,7 @@ def event_detail_view(request, model, pk, template_name, slug=None):
 
 
 @community_required
+@cache_anonymous_page
 @override_timezone
 def event_list_view(request, model, template_name):
     qs = (
@@ -1,8 +1,13 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Standard Library
+import functools
+
 # Django
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.search import SearchVectorField
 from django.db import models, transaction
@@ -10,39 +15,44 @@ from django.urls import reverse
 from django.utils import timezone
 
 # Third Party Libraries
+from celery.utils.log import get_logger
 from model_utils.models import TimeStampedModel
 from taggit.managers import TaggableManager
-from taggit.models import Tag
+from taggit.models import TaggedItem
 
 # Localhub
 from localhub.bookmarks.models import Bookmark, BookmarkAnnotationsQuerySetMixin
 from localhub.comments.models import Comment, CommentAnnotationsQuerySetMixin
 from localhub.common.db.generic import (
     AbstractGenericRelation,
+    get_generic_related_exists,
     get_generic_related_queryset,
 )
 from localhub.common.db.search.mixins import SearchQuerySetMixin
 from localhub.common.db.tracker import TrackerModelMixin
 from localhub.common.db.utils import boolean_value
 from localhub.common.markdown.fields import MarkdownField
-from localhub.common.utils.itertools import takefirst
 from localhub.common.utils.text import slugify_unicode
-from localhub.communities.models import Community
+from localhub.communities.cache import bump_content_version
+from localhub.communities.models import Community, Membership
 from localhub.flags.models import Flag, FlagAnnotationsQuerySetMixin
 from localhub.hashtags.fields import HashtagsField
-from localhub.hashtags.utils import extract_hashtags
+from localhub.hashtags.utils import extract_hashtags, get_or_create_tags, sync_tags
 from localhub.likes.models import Like, LikeAnnotationsQuerySetMixin
 from localhub.notifications.decorators import notify
 from localhub.notifications.models import (
     Notification,
     NotificationAnnotationsQuerySetMixin,
 )
+from localhub.notifications.recipients import RecipientResolver
 from localhub.users.fields import MentionsField
 from localhub.users.utils import extract_mentions
 
 # Local
 from . import signals
 
+celery_logger = get_logger(__name__)
+
 
 class ActivityQuerySet(
     BookmarkAnnotationsQuerySetMixin,
@@ -177,6 +187,14 @@ class ActivityQuerySet(
         """
         return self.filter(published__isnull=False, deleted__isnull=True)
 
+    def sensitive(self):
+        """Returns activities with any community-defined content warning tags.
+
+        Returns:
+            QuerySet
+        """
+        return self.exclude(content_warning_tags=[])
+
     def deleted(self):
         """Returns activities deleted by moderator vs. "hard-deleted" i.e.
         deleted is NOT NULL.
@@ -215,6 +233,34 @@ class ActivityQuerySet(
             return self.none()
         return self.filter(published__isnull=True, deleted__isnull=True, owner=user)
 
+    def exists_membership(self, community):
+        """Returns expression if owner is an active member of community.
+
+        Args:
+            community (Community)
+
+        Returns:
+            Exists
+        """
+        return models.Exists(
+            Membership.objects.filter(
+                member=models.OuterRef("owner"), community=community, active=True
+            )
+        )
+
+    def exists_tags(self, tags):
+        """Returns expression if activity has any of these tags.
+
+        Args:
+            tags (QuerySet or list): Tag QuerySet or list of tags
+
+        Returns:
+            Exists
+        """
+        return get_generic_related_exists(
+            self.model, TaggedItem.objects.filter(tag__in=tags)
+        )
+
     def for_community(self, community):
         """Must match community, and owners must also be active members.
 
@@ -225,9 +271,8 @@ class ActivityQuerySet(
             QuerySet
         """
         return self.filter(
+            self.exists_membership(community),
             community=community,
-            owner__membership__community=community,
-            owner__membership__active=True,
             owner__is_active=True,
         )
 
@@ -244,7 +289,9 @@ class ActivityQuerySet(
         """
         if user.is_anonymous:
             return self
-        return self.filter(owner=user) | self.filter(owner__in=user.following.all())
+        return self.filter(
+            models.Q(owner=user) | models.Q(owner__in=user.following.all())
+        )
 
     def following_tags(self, user):
         """Returns instances where each activity either contains tags followed
@@ -260,7 +307,9 @@ class ActivityQuerySet(
 
         if user.is_anonymous:
             return self
-        return self.filter(owner=user) | self.filter(tags__in=user.following_tags.all())
+        return self.filter(
+            models.Q(owner=user) | models.Q(self.exists_tags(user.following_tags.all()))
+        )
 
     def with_activity_stream_filters(self, user):
         """
@@ -317,8 +366,8 @@ class ActivityQuerySet(
 
         if user.is_anonymous:
             return self
-        return self.exclude(
-            models.Q(tags__in=user.blocked_tags.all()), ~models.Q(owner=user)
+        return self.filter(
+            models.Q(owner=user) | ~models.Q(self.exists_tags(user.blocked_tags.all()))
         )
 
     def exclude_blocked(self, user):
@@ -350,7 +399,109 @@ class ActivityQuerySet(
 
 
 class ActivityManager(models.Manager.from_queryset(ActivityQuerySet)):
-    ...
+    def bulk_create_activities(self, activities, batch_size=500):
+        """Creates new activities with set-based statements, rather than
+        calling save() on each activity. Rows, tags, content warning tags and
+        search documents are the same as if each activity had been saved.
+
+        Poll answers are not created, and no notifications are sent: use
+        bulk_publish() to notify users.
+
+        Args:
+            activities (Iterable[Activity]): new activities
+            batch_size (int, optional): max rows per statement (default: 500)
+
+        Returns:
+            list: created activities
+        """
+        activities = list(activities)
+        if not activities:
+            return []
+
+        warning_tags = {}
+        hashtags = {}
+
+        for activity in activities:
+            if activity.community_id not in warning_tags:
+                warning_tags[
+                    activity.community_id
+                ] = activity.community.get_content_warning_tags()
+            activity.update_content_warning_tags(warning_tags[activity.community_id])
+            hashtags[id(activity)] = activity.extract_hashtags()
+
+        with transaction.atomic():
+            self.bulk_create(activities, batch_size=batch_size)
+
+            self.model.search_indexer.bulk_update_search_index(
+                activities, batch_size=batch_size
+            )
+
+            tags = {
+                tag.name.lower(): tag.id
+                for tag in get_or_create_tags(set().union(*hashtags.values()))
+            }
+
+            content_type = ContentType.objects.get_for_model(self.model)
+
+            TaggedItem.objects.bulk_create(
+                [
+                    TaggedItem(
+                        content_type=content_type,
+                        object_id=activity.pk,
+                        tag_id=tags[name],
+                    )
+                    for activity in activities
+                    for name in hashtags[id(activity)]
+                ],
+                batch_size=batch_size,
+                ignore_conflicts=True,
+            )
+
+            self.model.post_bulk_create(activities)
+
+            for community_id in warning_tags:
+                transaction.on_commit(
+                    functools.partial(bump_content_version, community_id)
+                )
+
+        return activities
+
+    def bulk_publish(self, activities, batch_size=500):
+        """Creates and publishes new activities with set-based statements
+        (see bulk_create_activities()), then sends notifications for all
+        activities in a single batch, as notify_on_publish() would for each
+        activity.
+
+        Activities without a publish date are published now.
+
+        Args:
+            activities (Iterable[Activity]): new activities
+            batch_size (int, optional): max rows per statement (default: 500)
+
+        Returns:
+            list: created activities
+        """
+        now = timezone.now()
+        activities = list(activities)
+
+        for activity in activities:
+            if activity.published is None:
+                activity.published = now
+
+        with transaction.atomic():
+            activities = self.bulk_create_activities(activities, batch_size)
+
+            @notify
+            def notify_on_publish():
+                return [
+                    notification
+                    for activity in activities
+                    for notification in activity.make_publish_notifications()
+                ]
+
+            notify_on_publish()
+
+        return activities
 
 
 class Activity(TrackerModelMixin, TimeStampedModel):
@@ -358,7 +509,13 @@ class Activity(TrackerModelMixin, TimeStampedModel):
     Base class for all activity-related entities e.g. posts, events, photos.
     """
 
-    RESHARED_FIELDS = ["title", "description", "hashtags", "mentions"]
+    RESHARED_FIELDS = [
+        "title",
+        "description",
+        "hashtags",
+        "mentions",
+        "content_warning_tags",
+    ]
 
     INDEXABLE_DESCRIPTION_FIELDS = [
         "description",
@@ -366,6 +523,14 @@ class Activity(TrackerModelMixin, TimeStampedModel):
         "mentions",
     ]
 
+    # rendered content is the same for all users (see render_activity)
+    # so can be cached
+    CACHE_RENDERED_CONTENT = True
+
+    # if True, tags and search document are not updated on save: this is
+    # done by the publish pipeline instead (see schedule_publish_pipeline)
+    defer_search_index = False
+
     community = models.ForeignKey(Community, on_delete=models.CASCADE)
 
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -387,6 +552,12 @@ class Activity(TrackerModelMixin, TimeStampedModel):
 
     description = MarkdownField(blank=True)
 
+    # community warning tags matching hashtags in the content: updated on save,
+    # and when the community changes its warning tags.
+    content_warning_tags = ArrayField(
+        models.CharField(max_length=100), default=list, blank=True, editable=False
+    )
+
     allow_comments = models.BooleanField(default=True)
 
     is_reshare = models.BooleanField(default=False)
@@ -430,9 +601,19 @@ class Activity(TrackerModelMixin, TimeStampedModel):
 
     def save(self, *args, **kwargs):
         is_new = self._state.adding
+
+        if self.should_extract_hashtags(is_new):
+            self.update_content_warning_tags()
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = [
+                    *kwargs["update_fields"],
+                    "content_warning_tags",
+                ]
+
         super().save(*args, **kwargs)
 
-        self.save_tags(is_new)
+        if not self.defer_search_index:
+            self.save_tags(is_new)
 
     def slugify(self):
         return slugify_unicode(self)
@@ -507,13 +688,30 @@ class Activity(TrackerModelMixin, TimeStampedModel):
         return get_generic_related_queryset(self, Notification)
 
     def get_content_warning_tags(self):
-        """Checks if any tags matching in title/description/additional
-        tags etc that match the warning tags for this community.
+        """Returns community warning tags matching tags in title/description/
+        additional tags etc. These are calculated when the activity is saved.
 
         Returns:
             set: tag strings
         """
-        return self.extract_hashtags() & self.community.get_content_warning_tags()
+        return set(self.content_warning_tags)
+
+    def update_content_warning_tags(self, warning_tags=None):
+        """Recalculates content warning tags. Does not save the instance.
+
+        Args:
+            warning_tags (set, optional): community warning tags. If None, uses
+                the current tags of the community (default: None)
+
+        Returns:
+            bool: True if tags have changed
+        """
+        if warning_tags is None:
+            warning_tags = self.community.get_content_warning_tags()
+        content_warning_tags = sorted(self.extract_hashtags() & warning_tags)
+        changed = content_warning_tags != self.content_warning_tags
+        self.content_warning_tags = content_warning_tags
+        return changed
 
     def is_content_sensitive(self, user):
         """
@@ -533,6 +731,18 @@ class Activity(TrackerModelMixin, TimeStampedModel):
             return False
         return bool(self.get_content_warning_tags())
 
+    def get_rendered_content_version(self):
+        """Returns value used in the cache key of rendered content (see
+        render_activity). It must change whenever the rendered content
+        changes.
+
+        Returns:
+            str or None: None if rendered content should not be cached
+        """
+        if not self.CACHE_RENDERED_CONTENT or self.pk is None:
+            return None
+        return self.modified.isoformat()
+
     @property
     def indexable_description(self):
         """Returns default indexable description fields for search trackers."""
@@ -565,7 +775,7 @@ class Activity(TrackerModelMixin, TimeStampedModel):
             verb=verb,
         )
 
-    def notify_mentioned_users(self, recipients):
+    def add_mentioned_users(self, resolver, recipients):
         qs = recipients.matches_usernames(self.extract_mentions()).exclude(
             pk=self.owner_id
         )
@@ -575,23 +785,22 @@ class Activity(TrackerModelMixin, TimeStampedModel):
 
         if self.parent:
             qs = qs.exclude(pk=self.parent.owner_id)
-        qs = qs.distinct()
 
-        return [self.make_notification(recipient, "mention") for recipient in qs]
+        resolver.add("mention", qs)
 
-    def notify_followers(self, recipients):
-        qs = recipients.filter(following=self.owner).distinct()
+    def add_followers(self, resolver, recipients):
+        qs = recipients.filter(following=self.owner)
 
         if self.editor:
             qs = qs.exclude(pk=self.editor.id)
 
-        return [self.make_notification(follower, "followed_user") for follower in qs]
+        resolver.add("followed_user", qs)
 
-    def notify_tag_followers(self, recipients):
-        if (hashtags := self.extract_hashtags()) and (
-            tags := Tag.objects.filter(slug__in=hashtags)
-        ):
-            qs = recipients.filter(following_tags__in=tags).exclude(pk=self.owner.id)
+    def add_tag_followers(self, resolver, recipients):
+        if hashtags := self.extract_hashtags():
+            qs = recipients.filter(following_tags__slug__in=hashtags).exclude(
+                pk=self.owner_id
+            )
 
             if self.editor:
                 qs = qs.exclude(pk=self.editor.id)
@@ -599,42 +808,100 @@ class Activity(TrackerModelMixin, TimeStampedModel):
             if self.parent:
                 qs = qs.exclude(pk=self.parent.owner_id)
 
-            qs = qs.distinct()
+            resolver.add("followed_tag", qs)
+
+    def add_parent_owner(self, resolver, recipients):
+        resolver.add("reshare", recipients.filter(pk=self.parent.owner_id))
+
+    def make_notifications(self, resolver):
+        return resolver.make_notifications(
+            content_object=self,
+            actor=self.owner,
+            community=self.community,
+        )
+
+    def schedule_publish_pipeline(self):
+        """Queues celery tasks to update the search document and tags and
+        send notifications after the activity is published (see
+        tasks.get_publish_pipeline). Should be called once the activity has
+        been committed.
+
+        If the tasks cannot be queued they are run immediately.
+        """
+        # Local
+        from . import tasks
+
+        pipeline = tasks.get_publish_pipeline(self._meta.label_lower, self.pk)
 
-            return [self.make_notification(follower, "followed_tag") for follower in qs]
-        return []
+        try:
+            return pipeline.delay()
+        except tasks.index_activity.OperationalError as e:
+            celery_logger.exception(e)
+            return pipeline.apply()
 
-    def notify_parent_owner(self, recipients):
-        if owner := recipients.filter(pk=self.parent.owner_id).first():
-            return [self.make_notification(owner, "reshare")]
-        return []
+    @classmethod
+    def post_bulk_create(cls, activities):
+        """Called by bulk_create_activities() for any work done by save()
+        not covered by the set-based statements.
+
+        Args:
+            activities (list): created activities
+        """
+
+    @classmethod
+    def pre_bulk_delete(cls, pks):
+        """Called by localhub.common.db.deletion before activities are deleted
+        in bulk: as with delete(), comment relations are set to NULL.
+
+        Args:
+            pks (list): primary keys of activities
+        """
+        Comment.objects.filter(
+            content_type=ContentType.objects.get_for_model(cls), object_id__in=pks
+        ).remove_content_objects()
 
     @notify
     def notify_on_publish(self):
+        """Sends notifications to users:
+        - owner of reshared activity
+        - @mentioned users
+        - users following any tags
+        - users following the owner
+
+        See make_publish_notifications().
+
+        Returns:
+            list: Notification instances
+        """
+        return self.make_publish_notifications()
+
+    def make_publish_notifications(self):
         """Generates Notification instances for users:
+        - owner of reshared activity
         - @mentioned users
         - users following any tags
-        - users following the owner or owner of reshared activity
-        - moderators
+        - users following the owner
 
-        Users blocking the owner will not receive notifications.
+        Users blocking the owner will not receive notifications. Each
+        recipient receives at most one notification, in the order of
+        priority above. Recipients are resolved in a single query.
 
         Returns:
             list: Notification instances
         """
-        notifications = []
+        resolver = RecipientResolver()
         recipients = self.get_notification_recipients()
 
         if self.parent:
-            notifications += self.notify_parent_owner(recipients)
+            self.add_parent_owner(resolver, recipients)
 
         if self.description:
-            notifications += self.notify_mentioned_users(recipients)
-            notifications += self.notify_tag_followers(recipients)
+            self.add_mentioned_users(resolver, recipients)
+            self.add_tag_followers(resolver, recipients)
 
-        notifications += self.notify_followers(recipients)
+        self.add_followers(resolver, recipients)
 
-        return takefirst(notifications, lambda n: n.recipient)
+        return self.make_notifications(resolver)
 
     def notify_owner_on_edit(self):
         return self.make_notification(self.owner, "edit", actor=self.editor)
@@ -646,19 +913,22 @@ class Activity(TrackerModelMixin, TimeStampedModel):
         Returns:
             list: Notification instances
         """
-        notifications = []
+        resolver = RecipientResolver()
         recipients = self.get_notification_recipients()
 
         if self.mentions_changed():
-            notifications += self.notify_mentioned_users(recipients)
+            self.add_mentioned_users(resolver, recipients)
 
         if self.hashtags_changed():
-            notifications += self.notify_tag_followers(recipients)
+            self.add_tag_followers(resolver, recipients)
+
+        notifications = self.make_notifications(resolver)
 
+        # mentions and tag followers already exclude the owner
         if self.editor and self.editor != self.owner:
             notifications.append(self.notify_owner_on_edit())
 
-        return takefirst(notifications, lambda n: n.recipient)
+        return notifications
 
     @notify
     def notify_on_delete(self, moderator):
@@ -707,7 +977,14 @@ class Activity(TrackerModelMixin, TimeStampedModel):
 
     def update_reshares(self):
         """Sync latest updates with all reshares."""
-        self.reshares.update(**self.get_resharable_data())
+        self.reshares.update(modified=timezone.now(), **self.get_resharable_data())
+
+        if self.hashtags_changed():
+            sync_tags(
+                self.__class__,
+                self.reshares.values_list("pk", flat=True),
+                self.extract_hashtags(),
+            )
 
     @transaction.atomic
     def soft_delete(self):
@@ -756,10 +1033,9 @@ class Activity(TrackerModelMixin, TimeStampedModel):
 
     def save_tags(self, is_new):
         if self.should_extract_hashtags(is_new):
-            if hashtags := self.extract_hashtags():
-                self.tags.set(*hashtags, clear=True)
-            else:
-                self.tags.clear()
+            sync_tags(self.__class__, [self.pk], self.extract_hashtags())
+            # clear any prefetched tags
+            getattr(self, "_prefetched_objects_cache", {}).pop("tags", None)
 
     @transaction.atomic
     def delete(self, *args, **kwargs):
@@ -1,9 +1,6 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
-# Standard Library
-import logging
-
 # Django
 from django import forms
 from django.utils.translation import gettext_lazy as _
@@ -11,13 +8,10 @@ from django.utils.translation import gettext_lazy as _
 # Localhub
 from localhub.activities.forms import ActivityForm
 from localhub.common.forms import ClearableImageInput, FormHelper
-from localhub.common.utils.exif import Exif
 
 # Local
 from .models import Photo
 
-logger = logging.getLogger(__name__)
-
 
 class PhotoForm(ActivityForm):
 
@@ -100,37 +94,14 @@ class PhotoForm(ActivityForm):
         except KeyError:
             return cleaned_data
 
-        exif = None
-
-        try:
-            exif = Exif.from_image(image)
-        except Exif.Invalid as e:
-            logger.exception(e)
-
-        # try and rotate image if orientation provided
-
-        if exif:
-            try:
-                exif.rotate()
-            except Exif.Invalid as e:
-                logger.exception(e)
-
-        latitude = cleaned_data.get("latitude")
-        longitude = cleaned_data.get("longitude")
+        # EXIF rotation and GPS extraction are done after upload in
+        # a celery task, or from GPS data kept from the processed image
+        # if the image is not changed: see Photo.save()
+        self.instance.extract_gps_data = cleaned_data.get("extract_gps_data", False)
 
         if cleaned_data.get("clear_gps_data"):
-            latitude, longitude = (None, None)
-
-        elif exif and cleaned_data["extract_gps_data"]:
-
-            try:
-                latitude, longitude = exif.locate()
-            except Exif.Invalid as e:
-                logger.exception(e)
-                latitude, longitude = (None, None)
-
-        cleaned_data["latitude"] = latitude
-        cleaned_data["longitude"] = longitude
+            cleaned_data["latitude"] = None
+            cleaned_data["longitude"] = None
 
         # try and get title from photo if missing
         if not cleaned_data["title"]:
@@ -0,0 +1,19 @@
+# Generated by Django 3.1.14 on 2026-10-19 01:46
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photos", "0002_auto_20200423_0312"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photo",
+            name="thumbnails",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
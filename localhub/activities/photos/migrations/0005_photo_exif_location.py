@@ -0,0 +1,24 @@
+# Generated by Django 3.1.14 on 2026-10-19 07:36
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("photos", "0004_content_warning_tags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="photo",
+            name="exif_latitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="photo",
+            name="exif_longitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+    ]
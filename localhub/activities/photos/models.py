@@ -1,16 +1,26 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Standard Library
+import functools
+import os
+
 # Django
-from django.db import models
+from django.core.files.base import ContentFile
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 # Third Party Libraries
+from celery.utils.log import get_logger
 from sorl.thumbnail import ImageField
 
 # Localhub
 from localhub.activities.models import Activity
 from localhub.common.db.search.indexer import SearchIndexer
+from localhub.common.thumbnails import ThumbnailGenerator
+from localhub.common.utils.images import normalize_image
+
+celery_logger = get_logger(__name__)
 
 
 class Photo(Activity):
@@ -35,8 +45,12 @@ class Photo(Activity):
         "cc_license",
         "latitude",
         "longitude",
+        "thumbnails",
     ]
 
+    # uploaded images are downsized so neither side exceeds this (pixels)
+    MAX_IMAGE_SIZE = 2048
+
     INDEXABLE_DESCRIPTION_FIELDS = Activity.INDEXABLE_DESCRIPTION_FIELDS + [
         "artist",
     ]
@@ -53,6 +67,11 @@ class Photo(Activity):
     latitude = models.FloatField(null=True, blank=True)
     longitude = models.FloatField(null=True, blank=True)
 
+    # GPS data of the image, kept when the image is processed as EXIF
+    # metadata is stripped: see process_image()
+    exif_latitude = models.FloatField(null=True, blank=True, editable=False)
+    exif_longitude = models.FloatField(null=True, blank=True, editable=False)
+
     artist = models.CharField(max_length=100, blank=True)
     original_url = models.URLField(max_length=500, null=True, blank=True)
     cc_license = models.CharField(
@@ -63,11 +82,132 @@ class Photo(Activity):
         verbose_name="Creative Commons license",
     )
 
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
+
     search_indexer = SearchIndexer(("A", "title"), ("B", "indexable_description"))
 
+    thumbnailer = ThumbnailGenerator(
+        "image",
+        ("500x300", {"crop": "top", "upscale": False}),
+        ("500", {"upscale": False}),
+        ("1000", {"upscale": False}),
+        schedule_on_save=False,
+    )
+
+    tracked_fields = Activity.tracked_fields + ["image"]
+
+    # set by the form: not stored, just used to set latitude and longitude
+    # from the image GPS data
+    extract_gps_data = False
+
     def __str__(self):
         return self.title or _("Photo")
 
+    def save(self, *args, **kwargs):
+        # reshares share the original (already processed) image
+        should_process_image = not self.is_reshare and self.has_tracker_changed(
+            ["image"]
+        )
+
+        # the image is already processed, so use the GPS data kept from it
+        if (
+            self.extract_gps_data
+            and not should_process_image
+            and self.exif_latitude is not None
+        ):
+            self.latitude = self.exif_latitude
+            self.longitude = self.exif_longitude
+
+        super().save(*args, **kwargs)
+
+        if should_process_image:
+            extract_gps_data = self.extract_gps_data
+            transaction.on_commit(
+                lambda: self.schedule_image_processing(extract_gps_data)
+            )
+
+    @classmethod
+    def post_bulk_create(cls, photos):
+        for photo in photos:
+            if not photo.is_reshare and photo.image:
+                transaction.on_commit(
+                    functools.partial(
+                        photo.schedule_image_processing, photo.extract_gps_data
+                    )
+                )
+
+    def schedule_image_processing(self, extract_gps_data=False):
+        """Queues celery task to process the image.
+
+        Args:
+            extract_gps_data (bool, optional): extract lat/lng from image (default: False)
+        """
+        # Local
+        from . import tasks
+
+        try:
+            return tasks.process_photo.delay(self.pk, extract_gps_data)
+        except tasks.process_photo.OperationalError as e:
+            celery_logger.exception(e)
+
+    def process_image(self, extract_gps_data=False):
+        """Rotates, downsizes and strips metadata from the uploaded image.
+        The processed image replaces the original in storage, and any rows
+        sharing the original (e.g. reshares) are updated. Thumbnails are then
+        generated for the processed image.
+
+        Any GPS data in the image is kept in exif_latitude and exif_longitude,
+        so it can be extracted later without processing the image again.
+
+        This is potentially expensive, so should be run in a celery task
+        rather than in the request.
+
+        Args:
+            extract_gps_data (bool, optional): set latitude and longitude from
+                EXIF GPS data if available (default: False)
+        """
+        with self.image.open("rb") as fp:
+            processed = normalize_image(fp, self.MAX_IMAGE_SIZE)
+
+        original_name = self.image.name
+
+        self.image.save(
+            os.path.basename(original_name), ContentFile(processed.content), save=False
+        )
+
+        Photo.objects.filter(image=original_name).update(image=self.image.name)
+
+        self.exif_latitude, self.exif_longitude = processed.location or (None, None)
+
+        if extract_gps_data and processed.location:
+            self.latitude, self.longitude = processed.location
+
+        Photo.objects.filter(pk=self.pk).update(
+            latitude=self.latitude,
+            longitude=self.longitude,
+            exif_latitude=self.exif_latitude,
+            exif_longitude=self.exif_longitude,
+        )
+
+        self.image.storage.delete(original_name)
+
+        self.thumbnailer.generate(self)
+
+    def get_rendered_content_version(self):
+        """Thumbnails and processed images are stored by celery tasks
+        without changing the modified date, so content is only cached once
+        thumbnails of the current image have been generated, and the key
+        includes the image name.
+
+        Returns:
+            str or None
+        """
+        if not self.thumbnailer.is_generated(self):
+            return None
+        if (version := super().get_rendered_content_version()) is None:
+            return None
+        return f"{version}:{self.image.name}"
+
     def has_attribution(self):
         return any((self.artist, self.original_url, self.cc_license))
 
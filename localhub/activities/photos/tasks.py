@@ -0,0 +1,42 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import time
+
+# Third Party Libraries
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+# Local
+from .models import Photo
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(name="localhub.activities.photos.process_photo")
+def process_photo(photo_id, extract_gps_data=False):
+    """Processes uploaded photo image (rotation, GPS extraction, metadata
+    stripping and resizing) and generates thumbnails.
+
+    Args:
+        photo_id (int): Photo primary key
+        extract_gps_data (bool, optional): extract lat/lng from image (default: False)
+    """
+    try:
+        photo = Photo.objects.get(pk=photo_id)
+    except Photo.DoesNotExist:
+        logger.info("Photo %s no longer exists", photo_id)
+        return
+
+    start = time.perf_counter()
+
+    try:
+        photo.process_image(extract_gps_data)
+    except Exception as e:
+        logger.exception(e)
+        return
+
+    logger.info(
+        "Photo %s processed in %.3f seconds", photo_id, time.perf_counter() - start
+    )
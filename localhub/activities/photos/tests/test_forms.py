@@ -12,7 +12,7 @@ pytestmark = pytest.mark.django_db
 
 
 class TestPhotoForm:
-    def test_clear_gps_data_if_not_latlng(self, photo, fake_image, mock_exif):
+    def test_clear_gps_data_if_not_latlng(self, photo, fake_image):
 
         form = PhotoForm(
             instance=photo,
@@ -27,10 +27,10 @@ class TestPhotoForm:
         assert form.is_valid()
 
         cleaned_data = form.clean()
-        assert cleaned_data["latitude"] == 61
-        assert cleaned_data["longitude"] == 24
+        assert cleaned_data["latitude"] is None
+        assert cleaned_data["longitude"] is None
 
-    def test_clear_gps_data_if_latlng(self, fake_image, mock_exif):
+    def test_clear_gps_data_if_latlng(self, fake_image):
 
         photo = PhotoFactory(latitude=61, longitude=24)
 
@@ -45,7 +45,7 @@ class TestPhotoForm:
         assert cleaned_data["latitude"] is None
         assert cleaned_data["longitude"] is None
 
-    def test_if_not_extract_gps_data(self, fake_image, mock_exif):
+    def test_if_not_extract_gps_data(self, fake_image):
 
         form = PhotoForm(*self.get_form_data(image=fake_image))
         assert "clear_gps_data" not in form.fields
@@ -55,6 +55,7 @@ class TestPhotoForm:
         cleaned_data = form.clean()
         assert cleaned_data["latitude"] is None
         assert cleaned_data["longitude"] is None
+        assert not form.instance.extract_gps_data
 
     def test_if_no_title(self, fake_image, mocker):
 
@@ -63,23 +64,13 @@ class TestPhotoForm:
         cleaned_data = form.clean()
         assert cleaned_data["title"] == "test.jpg"
 
-    def test_if_extract_gps_data(self, fake_image, mock_exif):
+    def test_if_extract_gps_data(self, fake_image):
 
         form = PhotoForm(*self.get_form_data(image=fake_image, extract_gps_data=True))
         assert form.is_valid()
 
-        cleaned_data = form.clean()
-        assert cleaned_data["latitude"] == 61
-        assert cleaned_data["longitude"] == 24
-
-    def test_if_extract_gps_data_invalid(self, fake_image, mock_invalid_exif):
-
-        form = PhotoForm(*self.get_form_data(image=fake_image, extract_gps_data=True))
-        assert form.is_valid()
-
-        cleaned_data = form.clean()
-        assert cleaned_data["latitude"] is None
-        assert cleaned_data["longitude"] is None
+        # GPS data is extracted after upload in celery task
+        assert form.instance.extract_gps_data
 
     def get_form_data(self, image, **overrides):
         data = {
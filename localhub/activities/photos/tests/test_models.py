@@ -1,12 +1,58 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Standard Library
+import io
+
+# Django
+from django.core.files import File
+
 # Third Party Libraries
 import pytest
+from PIL import Image
+
+# Localhub
+from localhub.common.utils.exif import GPS_INFO_TAG, ORIENTATION_TAG
+
+# Local
+from ..factories import PhotoFactory
+from ..models import Photo
 
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture
+def run_on_commit(mocker):
+    # tests run inside a transaction, so on_commit callbacks never fire
+    return mocker.patch(
+        "localhub.activities.photos.models.transaction.on_commit",
+        side_effect=lambda func: func(),
+    )
+
+
+@pytest.fixture
+def mock_process_photo(mocker):
+    return mocker.patch("localhub.activities.photos.tasks.process_photo")
+
+
+@pytest.fixture
+def exif_image():
+    exif = Image.Exif()
+    exif[ORIENTATION_TAG] = 6
+    exif[GPS_INFO_TAG] = {
+        1: "N",
+        2: (61.0, 0.0, 0.0),
+        3: "E",
+        4: (24.0, 0.0, 0.0),
+    }
+    file_obj = io.BytesIO()
+    Image.new("RGB", size=(3000, 1000), color="blue").save(
+        file_obj, "JPEG", exif=exif.tobytes()
+    )
+    file_obj.seek(0)
+    return File(file_obj, name="exif.jpg")
+
+
 class TestPhotoModel:
     def test_reshare(self, photo, user):
 
@@ -17,3 +63,126 @@ class TestPhotoModel:
         assert reshared.parent == photo
         assert reshared.community == photo.community
         assert reshared.owner == user
+
+    def test_save_new(self, run_on_commit, mock_process_photo):
+        photo = PhotoFactory()
+        mock_process_photo.delay.assert_called_once_with(photo.id, False)
+
+    def test_save_if_image_not_changed(self, photo, run_on_commit, mock_process_photo):
+        photo = Photo.objects.get(pk=photo.id)
+        photo.title = "changed"
+        photo.save()
+        assert not mock_process_photo.delay.called
+
+    def test_save_if_extract_gps_data(self, photo, run_on_commit, mock_process_photo):
+        Photo.objects.filter(pk=photo.id).update(exif_latitude=61, exif_longitude=24)
+
+        photo = Photo.objects.get(pk=photo.id)
+        photo.extract_gps_data = True
+        photo.save()
+
+        assert not mock_process_photo.delay.called
+
+        photo.refresh_from_db()
+        assert photo.latitude == 61
+        assert photo.longitude == 24
+
+    def test_save_if_extract_gps_data_not_available(
+        self, photo, run_on_commit, mock_process_photo
+    ):
+        photo = Photo.objects.get(pk=photo.id)
+        photo.extract_gps_data = True
+        photo.save()
+
+        assert not mock_process_photo.delay.called
+
+        photo.refresh_from_db()
+        assert photo.latitude is None
+        assert photo.longitude is None
+
+    def test_save_if_extract_gps_data_and_image_changed(
+        self, photo, exif_image, run_on_commit, mock_process_photo
+    ):
+        Photo.objects.filter(pk=photo.id).update(exif_latitude=50, exif_longitude=10)
+
+        photo = Photo.objects.get(pk=photo.id)
+        photo.image = exif_image
+        photo.extract_gps_data = True
+        photo.save()
+
+        mock_process_photo.delay.assert_called_once_with(photo.id, True)
+
+        photo.refresh_from_db()
+        assert photo.latitude is None
+        assert photo.longitude is None
+
+    def test_save_reshare(self, photo, user, run_on_commit, mock_process_photo):
+        photo.reshare(user)
+        assert not mock_process_photo.delay.called
+
+    def test_bulk_create_activities(
+        self, community, user, run_on_commit, mock_process_photo
+    ):
+        (photo,) = Photo.objects.bulk_create_activities(
+            [PhotoFactory.build(community=community, owner=user)]
+        )
+        mock_process_photo.delay.assert_called_once_with(photo.id, False)
+
+    def test_schedule_image_processing(self, photo, mock_process_photo):
+        photo.schedule_image_processing(extract_gps_data=True)
+        mock_process_photo.delay.assert_called_with(photo.id, True)
+
+    def test_process_image(self, user, exif_image):
+        photo = PhotoFactory(image=exif_image)
+        reshare = photo.reshare(user)
+
+        original_name = photo.image.name
+        storage = photo.image.storage
+
+        photo.process_image(extract_gps_data=True)
+
+        assert photo.image.name != original_name
+        assert not storage.exists(original_name)
+
+        photo.refresh_from_db()
+        assert photo.latitude == pytest.approx(61)
+        assert photo.longitude == pytest.approx(24)
+        assert photo.thumbnails["source"] == photo.image.name
+
+        with photo.image.open("rb") as fp:
+            image = Image.open(fp)
+            # rotated and downsized
+            assert image.height == Photo.MAX_IMAGE_SIZE
+            assert image.width < image.height
+            assert not image.getexif()
+
+        reshare.refresh_from_db()
+        assert reshare.image.name == photo.image.name
+        assert reshare.thumbnails == photo.thumbnails
+
+    def test_process_image_if_not_extract_gps_data(self, exif_image):
+        photo = PhotoFactory(image=exif_image)
+        photo.process_image()
+
+        photo.refresh_from_db()
+        assert photo.latitude is None
+        assert photo.longitude is None
+        assert photo.exif_latitude == pytest.approx(61)
+        assert photo.exif_longitude == pytest.approx(24)
+
+    def test_extract_gps_data_after_process_image(self, exif_image, mock_process_photo):
+        photo = PhotoFactory(image=exif_image)
+        photo.process_image()
+
+        photo = Photo.objects.get(pk=photo.id)
+        image_name = photo.image.name
+
+        photo.extract_gps_data = True
+        photo.save()
+
+        assert not mock_process_photo.delay.called
+
+        photo.refresh_from_db()
+        assert photo.latitude == pytest.approx(61)
+        assert photo.longitude == pytest.approx(24)
+        assert photo.image.name == image_name
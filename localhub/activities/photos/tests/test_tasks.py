@@ -0,0 +1,26 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Third Party Libraries
+import pytest
+
+# Local
+from ..tasks import process_photo
+
+pytestmark = pytest.mark.django_db
+
+
+class TestProcessPhoto:
+    def test_process(self, photo, mocker):
+        mock_process_image = mocker.patch(
+            "localhub.activities.photos.models.Photo.process_image"
+        )
+        process_photo(photo.id, True)
+        mock_process_image.assert_called_with(True)
+
+    def test_if_photo_deleted(self, mocker):
+        mock_process_image = mocker.patch(
+            "localhub.activities.photos.models.Photo.process_image"
+        )
+        process_photo(1234)
+        assert not mock_process_image.called
@@ -3,6 +3,7 @@
 
 # Localhub
 from localhub.common.pagination import render_paginated_queryset
+from localhub.communities.cache import cache_anonymous_page
 from localhub.communities.decorators import community_required
 
 # Local
@@ -10,6 +11,7 @@ from .models import Photo
 
 
 @community_required
+@cache_anonymous_page
 def photo_gallery_view(request):
     photos = (
         Photo.objects.for_community(request.community)
@@ -34,6 +34,9 @@ class PollManager(ActivityManager.from_queryset(PollQuerySet)):
 
 class Poll(Activity):
 
+    # answers show the user's votes
+    CACHE_RENDERED_CONTENT = False
+
     allow_voting = models.BooleanField(default=True)
 
     search_indexer = SearchIndexer(("A", "title"), ("B", "indexable_description"))
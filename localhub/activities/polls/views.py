@@ -21,6 +21,7 @@ from localhub.activities.views.generic import (
     render_activity_list,
     render_activity_update_form,
 )
+from localhub.communities.cache import cache_anonymous_page
 from localhub.communities.decorators import community_required
 from localhub.users.utils import has_perm_or_403
 
@@ -148,6 +149,7 @@ def poll_update_view(request, pk, model, form_class, template_name):
 
 
 @community_required
+@cache_anonymous_page
 def poll_detail_view(request, pk, model, template_name, slug=None):
     obj = get_object_or_404(
         get_activity_queryset(
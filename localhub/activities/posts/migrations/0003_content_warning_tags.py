@@ -0,0 +1,63 @@
+# Generated by Django 3.1.14 on 2026-10-19 04:50
+
+# Django
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+# Localhub
+from localhub.hashtags.utils import extract_hashtags
+
+BATCH_SIZE = 500
+
+
+def set_content_warning_tags(apps, schema_editor):
+    Community = apps.get_model("communities", "Community")
+    Post = apps.get_model("posts", "Post")
+
+    for community in Community.objects.exclude(content_warning_tags=""):
+        warning_tags = extract_hashtags(community.content_warning_tags)
+        changed = []
+
+        for obj in (
+            Post.objects.filter(community=community)
+            .only("pk", "title", "description", "hashtags", "content_warning_tags")
+            .iterator(chunk_size=BATCH_SIZE)
+        ):
+            content_warning_tags = sorted(
+                warning_tags
+                & (
+                    extract_hashtags(obj.title)
+                    | extract_hashtags(obj.description)
+                    | extract_hashtags(obj.hashtags)
+                )
+            )
+            if content_warning_tags != obj.content_warning_tags:
+                obj.content_warning_tags = content_warning_tags
+                changed.append(obj)
+
+        Post.objects.bulk_update(
+            changed, ["content_warning_tags"], batch_size=BATCH_SIZE
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communities", "0004_community_thumbnails"),
+        ("posts", "0002_auto_20200423_0312"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="content_warning_tags",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                blank=True,
+                default=list,
+                editable=False,
+                size=None,
+            ),
+        ),
+        migrations.RunPython(set_content_warning_tags, migrations.RunPython.noop),
+    ]
@@ -99,11 +99,15 @@ class TestPostModel:
     def test_update_reshares(self, post, user):
 
         reshared = post.reshare(user)
-        post.title = "a new title"
+        modified = reshared.modified
+        post.title = "a new title #nsfw"
         post.save()
         post.update_reshares()
         reshared.refresh_from_db()
-        assert reshared.title == "a new title"
+        assert reshared.title == "a new title #nsfw"
+        assert reshared.content_warning_tags == ["nsfw"]
+        assert reshared.modified > modified
+        assert "nsfw" in reshared.tags.names()
 
     def test_reshare_a_reshare(self, post, user):
 
@@ -142,6 +146,37 @@ class TestPostModel:
         post = PostFactory(description="This post is #legit")
         assert post.get_content_warning_tags() == set()
 
+    def test_content_warning_tags_saved(self):
+        post = PostFactory(
+            community=CommunityFactory(content_warning_tags="#nsfw #spoilers"),
+            title="#spoilers",
+            description="This post is #nsfw! #movies",
+        )
+        assert Post.objects.get(pk=post.id).content_warning_tags == [
+            "nsfw",
+            "spoilers",
+        ]
+
+    def test_content_warning_tags_updated_if_content_changed(self):
+        post = PostFactory(description="This post is #nsfw!")
+        post = Post.objects.get(pk=post.id)
+        post.description = "This post is #legit"
+        post.save()
+        assert Post.objects.get(pk=post.id).content_warning_tags == []
+
+    def test_content_warning_tags_updated_with_update_fields(self):
+        post = PostFactory()
+        post = Post.objects.get(pk=post.id)
+        post.hashtags = "#nsfw"
+        post.save(update_fields=["hashtags"])
+        assert Post.objects.get(pk=post.id).content_warning_tags == ["nsfw"]
+
+    def test_update_content_warning_tags(self):
+        post = PostFactory(description="This post is #nsfw #spoilers")
+        assert post.update_content_warning_tags({"nsfw", "spoilers"})
+        assert post.content_warning_tags == ["nsfw", "spoilers"]
+        assert not post.update_content_warning_tags({"nsfw", "spoilers"})
+
     def test_notify_on_publish(self, community, send_webpush_mock):
         # owner should not receive any notifications from their own posts
         owner = MembershipFactory(
@@ -14,6 +14,7 @@ import pytest
 # Localhub
 from localhub.bookmarks.factories import BookmarkFactory
 from localhub.bookmarks.models import Bookmark
+from localhub.comments.factories import CommentFactory
 from localhub.comments.models import Comment
 from localhub.communities.factories import MembershipFactory
 from localhub.communities.models import Membership
@@ -69,6 +70,22 @@ class TestPostCreateView:
         assert post.community == member.community
         assert post.published
 
+    def test_post_runs_publish_pipeline(
+        self, client, member, send_webpush_mock, run_on_commit
+    ):
+        follower = MembershipFactory(community=member.community).member
+        follower.following.add(member.member)
+
+        client.post(
+            reverse("posts:create"),
+            {"title": "test", "description": "test #movies"},
+        )
+
+        post = Post.objects.get()
+        assert list(post.tags.names()) == ["movies"]
+        assert Post.objects.search("movies").get() == post
+        assert post.get_notifications().get().recipient == follower
+
     def test_post_private(self, client, member, send_webpush_mock):
 
         MembershipFactory(community=member.community, role=Membership.Role.MODERATOR)
@@ -225,9 +242,31 @@ class TestPostDetailView:
         notification.refresh_from_db()
         assert notification.is_read
 
+    def test_get_if_not_modified(self, client, post, member, locmem_cache):
+        NotificationFactory(recipient=member.member, content_object=post, is_read=False)
+
+        response = client.get(post.get_absolute_url())
+        assert response.status_code == http.HTTPStatus.OK
+
+        response = client.get(
+            post.get_absolute_url(), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == http.HTTPStatus.NOT_MODIFIED
+
+    def test_get_if_new_comment(self, client, post, member, locmem_cache):
+        response = client.get(post.get_absolute_url())
+        assert response.status_code == http.HTTPStatus.OK
+
+        CommentFactory(content_object=post, community=post.community)
+
+        response = client.get(
+            post.get_absolute_url(), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == http.HTTPStatus.OK
+
 
 class TestPostReshareView:
-    def test_post(self, client, member, send_webpush_mock):
+    def test_post(self, client, member, send_webpush_mock, run_on_commit):
 
         post = PostFactory(
             community=member.community,
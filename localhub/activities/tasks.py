@@ -0,0 +1,195 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.apps import apps
+from django.db import InterfaceError, OperationalError
+
+# Third Party Libraries
+from celery import chain, shared_task
+from celery.utils.log import get_task_logger
+
+# Localhub
+from localhub.common.metrics import PUBLISH_STAGE_LATENCY
+from localhub.communities.cache import bump_content_version
+from localhub.communities.models import Community
+from localhub.hashtags.utils import sync_tags
+from localhub.notifications.decorators import notify
+from localhub.notifications.models import Notification
+
+# Local
+from .utils import get_activity_models, update_content_warning_tags
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(name="localhub.activities.update_content_warning_tags")
+def update_community_content_warning_tags(community_id):
+    """Recalculates content warning tags of all activities in community
+    after the community warning tags have been changed.
+
+    Args:
+        community_id (int): Community primary key
+    """
+    try:
+        community = Community.objects.get(pk=community_id)
+    except Community.DoesNotExist:
+        logger.info("Community %s no longer exists", community_id)
+        return
+
+    warning_tags = community.get_content_warning_tags()
+
+    num_updated = sum(
+        update_content_warning_tags(
+            model.objects.filter(community=community), warning_tags
+        )
+        for model in get_activity_models()
+    )
+
+    if num_updated:
+        bump_content_version(community.id)
+
+    logger.info(
+        "Content warning tags updated for %d activities in community %s",
+        num_updated,
+        community_id,
+    )
+
+
+# publish pipeline stages are retried if the database is unavailable. Each
+# stage can safely be run more than once.
+PUBLISH_RETRY_POLICY = {
+    "autoretry_for": (InterfaceError, OperationalError),
+    "retry_backoff": True,
+    "retry_jitter": True,
+    "retry_kwargs": {"max_retries": 5},
+}
+
+
+def get_publish_pipeline(model_label, pk):
+    """Returns chain of tasks run after an activity is published:
+
+    index -> tags -> fan-out -> notify
+
+    Args:
+        model_label (str): model label e.g. "posts.post"
+        pk (int): primary key of activity
+
+    Returns:
+        celery.chain
+    """
+    return chain(
+        index_activity.si(model_label, pk),
+        tag_activity.si(model_label, pk),
+        fan_out_activity.si(model_label, pk),
+        notify_activity.s(model_label, pk),
+    )
+
+
+def get_activity(model_label, pk, published=False):
+    """
+    Args:
+        model_label (str): model label e.g. "posts.post"
+        pk (int): primary key of activity
+        published (bool, optional): only return published activity (default: False)
+
+    Returns:
+        Activity or None if activity no longer exists
+    """
+    qs = apps.get_model(model_label)._default_manager.select_related(
+        "owner", "community", "parent", "editor"
+    )
+    if published:
+        qs = qs.published()
+    try:
+        return qs.get(pk=pk)
+    except qs.model.DoesNotExist:
+        logger.info("%s %s no longer exists or is not published", model_label, pk)
+        return None
+
+
+@shared_task(name="localhub.activities.index_activity", **PUBLISH_RETRY_POLICY)
+def index_activity(model_label, pk):
+    """Updates search document of activity.
+
+    Args:
+        model_label (str): model label e.g. "posts.post"
+        pk (int): primary key of activity
+    """
+    with PUBLISH_STAGE_LATENCY.labels("index").time():
+        if activity := get_activity(model_label, pk):
+            activity.search_indexer.update_search_index(activity)
+
+
+@shared_task(name="localhub.activities.tag_activity", **PUBLISH_RETRY_POLICY)
+def tag_activity(model_label, pk):
+    """Syncs tags of activity with hashtags in its content.
+
+    Args:
+        model_label (str): model label e.g. "posts.post"
+        pk (int): primary key of activity
+    """
+    with PUBLISH_STAGE_LATENCY.labels("tags").time():
+        if activity := get_activity(model_label, pk):
+            sync_tags(activity.__class__, [activity.pk], activity.extract_hashtags())
+
+
+@shared_task(name="localhub.activities.fan_out_activity", **PUBLISH_RETRY_POLICY)
+def fan_out_activity(model_label, pk):
+    """Resolves recipients of publish notifications: mentioned users, tag
+    followers, followers of the owner and owner of the reshared activity.
+
+    Args:
+        model_label (str): model label e.g. "posts.post"
+        pk (int): primary key of activity
+
+    Returns:
+        List[Tuple[int, str]]: (recipient_id, verb)
+    """
+    with PUBLISH_STAGE_LATENCY.labels("fan_out").time():
+        if activity := get_activity(model_label, pk, published=True):
+            return [
+                (notification.recipient_id, notification.verb)
+                for notification in activity.make_publish_notifications()
+            ]
+        return []
+
+
+@shared_task(name="localhub.activities.notify_activity", **PUBLISH_RETRY_POLICY)
+def notify_activity(recipients, model_label, pk):
+    """Saves and sends publish notifications. Recipients already notified
+    about this activity (e.g. if the task is retried) are skipped.
+
+    Args:
+        recipients (List[Tuple[int, str]]): (recipient_id, verb) from fan-out
+        model_label (str): model label e.g. "posts.post"
+        pk (int): primary key of activity
+    """
+    if not recipients:
+        return
+
+    with PUBLISH_STAGE_LATENCY.labels("notify").time():
+        if (activity := get_activity(model_label, pk, published=True)) is None:
+            return
+
+        notified = set(activity.get_notifications().values_list("recipient_id", "verb"))
+
+        @notify
+        def notify_recipients():
+            return [
+                Notification(
+                    recipient_id=recipient_id,
+                    verb=verb,
+                    content_object=activity,
+                    actor=activity.owner,
+                    community=activity.community,
+                )
+                for recipient_id, verb in recipients
+                if (recipient_id, verb) not in notified
+            ]
+
+        notifications = notify_recipients()
+
+    logger.info(
+        "%d notification(s) sent for %s %s", len(notifications), model_label, pk
+    )
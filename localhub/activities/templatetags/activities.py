@@ -1,9 +1,14 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Standard Library
+import hashlib
 
 # Django
 from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
 
 # Localhub
 from localhub.common.utils.http import is_audio_url, is_https
@@ -124,6 +129,75 @@ def render_activity(
         "is_content_sensitive": is_content_sensitive,
         "template_name": template,
         "activity_css_class": css_class,
+        "content_cache_key": get_content_cache_key(
+            user, object, extra_context.get("is_detail", False)
+        ),
         model_name: object,
         **extra_context,
     }
+
+
+def get_content_cache_key(user, object, is_detail=False):
+    """Returns cache key for the rendered content of an activity. Content
+    is shared by all users with the same display preferences (embedded
+    content, external images), so the key does not include the user.
+
+    The key changes when the activity is modified (see
+    Activity.get_rendered_content_version), so cached content does not
+    need to be deleted.
+
+    Args:
+        user (User)
+        object (Activity)
+        is_detail (bool, optional)
+
+    Returns:
+        str or None: None if content of this activity type cannot be cached
+    """
+    if (version := object.get_rendered_content_version()) is None:
+        return None
+
+    parts = [
+        object._meta.label_lower,
+        object.pk,
+        version,
+        settings.ACTIVITY_CONTENT_CACHE_VERSION,
+        translation.get_language(),
+        is_detail,
+        user.is_authenticated and user.show_embedded_content,
+        user.is_anonymous or user.show_external_images,
+    ]
+    digest = hashlib.md5("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+    return f"activities.content:{digest}"
+
+
+@register.tag
+def cache_activity_content(parser, token):
+    """Caches rendered content of activity, using the key provided by
+    render_activity:
+
+    {% cache_activity_content %}
+    {% block content %}{% endblock %}
+    {% endcache_activity_content %}
+
+    Only content which is the same for all users with the same display
+    preferences should be included: likes, bookmarks, permissions etc
+    should be rendered outside this tag.
+    """
+    nodelist = parser.parse(("endcache_activity_content",))
+    parser.delete_first_token()
+    return CacheActivityContentNode(nodelist)
+
+
+class CacheActivityContentNode(template.Node):
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    def render(self, context):
+        if (key := context.get("content_cache_key")) is None:
+            return self.nodelist.render(context)
+
+        if (content := cache.get(key)) is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, settings.ACTIVITY_CONTENT_CACHE_TIMEOUT)
+        return content
@@ -3,6 +3,7 @@
 
 
 # Django
+from django.db import connection
 from django.utils import timezone
 
 # Third Party Libraries
@@ -10,6 +11,7 @@ import pytest
 from taggit.models import Tag
 
 # Localhub
+from localhub.activities.events.factories import EventFactory
 from localhub.activities.events.models import Event
 from localhub.activities.photos.models import Photo
 from localhub.activities.posts.factories import PostFactory
@@ -21,11 +23,148 @@ from localhub.communities.models import Community
 from localhub.flags.factories import FlagFactory
 from localhub.likes.factories import LikeFactory
 from localhub.notifications.factories import NotificationFactory
+from localhub.notifications.models import Notification
 from localhub.users.factories import UserFactory
 
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture
+def warning_community():
+    return CommunityFactory(content_warning_tags="#nsfw")
+
+
+@pytest.fixture
+def index_on_save(mocker):
+    # tests run inside a transaction, so on_commit callbacks never fire
+    mocker.patch(
+        "localhub.common.db.search.indexer.transaction.on_commit",
+        side_effect=lambda func: func(),
+    )
+
+
+@pytest.mark.usefixtures("index_on_save")
+class TestBulkCreateActivities:
+    def get_saved(self, model, pk):
+        obj = model.objects.get(pk=pk)
+        return (
+            obj.content_warning_tags,
+            set(obj.tags.names()),
+            model.objects.filter(pk=pk).values_list("search_document", flat=True)[0],
+        )
+
+    def test_post_same_as_save(self, warning_community, user):
+        fields = {
+            "community": warning_community,
+            "owner": user,
+            "title": "Great #movies",
+            "description": "Some #nsfw films",
+            "hashtags": "#reviews",
+            "mentions": "@danjac",
+        }
+        saved = PostFactory(**fields)
+        (created,) = Post.objects.bulk_create_activities([Post(**fields)])
+
+        assert created.pk
+        assert self.get_saved(Post, created.pk) == self.get_saved(Post, saved.pk)
+
+        assert self.get_saved(Post, created.pk)[:2] == (
+            ["nsfw"],
+            {"movies", "nsfw", "reviews"},
+        )
+
+    def test_event_same_as_save(self, warning_community, user):
+        fields = {
+            "community": warning_community,
+            "owner": user,
+            "title": "Party #nsfw",
+            "description": "Bring #snacks",
+            "venue": "The Venue",
+            "locality": "Helsinki",
+            "starts": timezone.now(),
+        }
+        saved = EventFactory(**fields)
+        (created,) = Event.objects.bulk_create_activities(
+            [EventFactory.build(**fields)]
+        )
+
+        assert self.get_saved(Event, created.pk) == self.get_saved(Event, saved.pk)
+
+    def test_empty(self):
+        assert Post.objects.bulk_create_activities([]) == []
+
+    def test_num_queries(self, community, user):
+        def count_queries(num_posts):
+            queries = []
+            with connection.execute_wrapper(
+                lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)
+            ):
+                Post.objects.bulk_create_activities(
+                    [
+                        PostFactory.build(
+                            community=community,
+                            owner=user,
+                            description=f"#tag{counter % 10} #movies",
+                        )
+                        for counter in range(num_posts)
+                    ]
+                )
+            return len(queries)
+
+        # first call creates the tags
+        count_queries(10)
+        assert count_queries(10) == count_queries(50)
+
+
+class TestBulkPublish:
+    def get_notifications(self, post):
+        return set(
+            Notification.objects.filter(object_id=post.id).values_list(
+                "recipient", "verb"
+            )
+        )
+
+    def test_notifications_same_as_notify_on_publish(
+        self, community, send_webpush_mock
+    ):
+        owner = MembershipFactory(community=community).member
+        mentioned = MembershipFactory(
+            community=community, member=UserFactory(username="danjac")
+        ).member
+
+        tag_follower = MembershipFactory(community=community).member
+        tag_follower.following_tags.add(Tag.objects.create(name="movies"))
+
+        follower = MembershipFactory(community=community).member
+        follower.following.add(owner)
+
+        fields = {
+            "community": community,
+            "owner": owner,
+            "description": "hello @danjac #movies",
+        }
+
+        saved = PostFactory(**fields)
+        saved.notify_on_publish()
+
+        (created,) = Post.objects.bulk_publish([Post(**fields)])
+
+        assert created.published
+        assert self.get_notifications(created) == self.get_notifications(saved)
+        assert self.get_notifications(created) == {
+            (mentioned.id, "mention"),
+            (tag_follower.id, "followed_tag"),
+            (follower.id, "followed_user"),
+        }
+
+    def test_keep_published_date(self, community, user):
+        published = timezone.now() - timezone.timedelta(days=1)
+        (created,) = Post.objects.bulk_publish(
+            [PostFactory.build(community=community, owner=user, published=published)]
+        )
+        assert Post.objects.get(pk=created.pk).published == published
+
+
 class TestActivityManager:
     def test_search(self, member, transactional_db):
         PostFactory(community=member.community, title="test", owner=member.member)
@@ -66,6 +205,11 @@ class TestActivityManager:
         PostFactory()
         assert Post.objects.published().count() == 1
 
+    def test_sensitive(self):
+        PostFactory(description="#nsfw")
+        PostFactory(description="#legit")
+        assert Post.objects.sensitive().count() == 1
+
     def test_deleted_if_false(self):
         PostFactory(deleted=None)
         assert Post.objects.deleted().count() == 0
@@ -199,6 +343,15 @@ class TestActivityManager:
 
         assert Post.objects.following_tags(anonymous_user).count() == 3
 
+    def test_following_tags_if_many_tags_followed(self, user):
+        post = PostFactory()
+        post.tags.add("movies", "reviews")
+
+        user.following_tags.add(*Tag.objects.all())
+
+        # no duplicates without DISTINCT
+        assert list(Post.objects.following_tags(user)) == [post]
+
     def test_with_activity_stream_filters_if_none_set(self, user, anonymous_user):
 
         PostFactory(owner=user)
@@ -365,7 +518,7 @@ class TestActivityManager:
         user.blocked.add(fourth_post.owner)
         user.blocked_tags.add(Tag.objects.get(name="movies"))
 
-        assert Post.objects.exclude_blocked(user).distinct().get() == third_post
+        assert Post.objects.exclude_blocked(user).get() == third_post
 
     def test_for_community(self, community: Community):
 
@@ -0,0 +1,141 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.db import OperationalError
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.events.factories import EventFactory
+from localhub.activities.posts.factories import PostFactory
+from localhub.activities.posts.models import Post
+from localhub.communities.cache import get_content_version
+from localhub.communities.factories import MembershipFactory
+
+# Local
+from ..tasks import (
+    fan_out_activity,
+    get_publish_pipeline,
+    index_activity,
+    notify_activity,
+    tag_activity,
+    update_community_content_warning_tags,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("locmem_cache")]
+
+
+class TestUpdateCommunityContentWarningTags:
+    def test_update(self, community):
+        post = PostFactory(community=community, description="#spoilers")
+        event = EventFactory(community=community, hashtags="#nsfw")
+        other = PostFactory(description="#spoilers")
+
+        community.content_warning_tags = "#spoilers"
+        community.save()
+
+        version = get_content_version(community.id)
+
+        update_community_content_warning_tags(community.id)
+
+        post.refresh_from_db()
+        assert post.content_warning_tags == ["spoilers"]
+
+        event.refresh_from_db()
+        assert event.content_warning_tags == []
+
+        other.refresh_from_db()
+        assert other.content_warning_tags == []
+
+        assert get_content_version(community.id) != version
+
+    def test_if_community_deleted(self):
+        update_community_content_warning_tags(1234)
+
+
+@pytest.fixture
+def deferred_post(member):
+    post = PostFactory.build(
+        community=member.community,
+        owner=member.member,
+        description="test #movies",
+    )
+    post.defer_search_index = True
+    post.save()
+    return post
+
+
+@pytest.fixture
+def follower(member):
+    follower = MembershipFactory(community=member.community).member
+    follower.following.add(member.member)
+    return follower
+
+
+class TestPublishPipeline:
+    def test_pipeline(self, deferred_post, follower, send_webpush_mock):
+        assert not deferred_post.tags.exists()
+
+        get_publish_pipeline("posts.post", deferred_post.id).delay()
+
+        assert list(deferred_post.tags.names()) == ["movies"]
+        assert Post.objects.search("movies").get() == deferred_post
+        assert deferred_post.get_notifications().get().recipient == follower
+
+    def test_schedule_publish_pipeline(self, deferred_post, follower, mocker):
+        mock_delay = mocker.patch("celery.canvas._chain.delay")
+        deferred_post.schedule_publish_pipeline()
+        assert mock_delay.called
+
+    def test_schedule_publish_pipeline_if_broker_down(
+        self, deferred_post, follower, mocker, send_webpush_mock
+    ):
+        mocker.patch(
+            "celery.canvas._chain.delay",
+            side_effect=index_activity.OperationalError,
+        )
+        deferred_post.schedule_publish_pipeline()
+        assert deferred_post.get_notifications().count() == 1
+
+    def test_index_activity(self, deferred_post):
+        index_activity("posts.post", deferred_post.id)
+        assert Post.objects.search("movies").get() == deferred_post
+
+    def test_index_activity_if_deleted(self):
+        index_activity("posts.post", 1234)
+
+    def test_tag_activity(self, deferred_post):
+        tag_activity("posts.post", deferred_post.id)
+        tag_activity("posts.post", deferred_post.id)
+        assert list(deferred_post.tags.names()) == ["movies"]
+
+    def test_fan_out_activity(self, deferred_post, follower):
+        assert fan_out_activity("posts.post", deferred_post.id) == [
+            (follower.id, "followed_user")
+        ]
+
+    def test_fan_out_activity_if_not_published(self, deferred_post, follower):
+        Post.objects.update(published=None)
+        assert fan_out_activity("posts.post", deferred_post.id) == []
+
+    def test_notify_activity(self, deferred_post, follower, send_webpush_mock):
+        recipients = [[follower.id, "followed_user"]]
+
+        notify_activity(recipients, "posts.post", deferred_post.id)
+        # already notified e.g. if retried
+        notify_activity(recipients, "posts.post", deferred_post.id)
+
+        assert deferred_post.get_notifications().count() == 1
+
+    def test_retry_if_database_unavailable(self, deferred_post, mocker):
+        mocker.patch(
+            "localhub.activities.tasks.sync_tags", side_effect=OperationalError
+        )
+        mock_retry = mocker.patch.object(
+            tag_activity, "retry", side_effect=OperationalError
+        )
+        with pytest.raises(OperationalError):
+            tag_activity.delay("posts.post", deferred_post.id)
+        assert mock_retry.called
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 # Django
+from django.template import Context, Template
 from django.utils import timezone
 
 # Third Party Libraries
@@ -9,9 +10,11 @@ import pytest
 
 # Localhub
 from localhub.activities.posts.factories import PostFactory
+from localhub.users.factories import UserFactory
 
 # Local
 from ..templatetags.activities import (
+    get_content_cache_key,
     get_pinned_activity,
     is_oembed_url,
     render_activity,
@@ -50,6 +53,80 @@ class TestRenderActivity:
         assert context["template_name"] == "posts/includes/post.html"
 
 
+class TestGetContentCacheKey:
+    def test_same_for_other_user(self, user, post):
+        assert get_content_cache_key(user, post) == get_content_cache_key(
+            UserFactory(), post
+        )
+
+    def test_display_preferences_changed(self, user, post):
+        other = UserFactory(show_external_images=False)
+        assert get_content_cache_key(user, post) != get_content_cache_key(other, post)
+
+    def test_is_detail(self, user, post):
+        assert get_content_cache_key(user, post) != get_content_cache_key(
+            user, post, is_detail=True
+        )
+
+    def test_modified(self, user, post):
+        key = get_content_cache_key(user, post)
+        post.save()
+        assert get_content_cache_key(user, post) != key
+
+    def test_version_changed(self, user, post, settings):
+        key = get_content_cache_key(user, post)
+        settings.ACTIVITY_CONTENT_CACHE_VERSION = "2"
+        assert get_content_cache_key(user, post) != key
+
+    def test_not_cacheable(self, user, event, poll):
+        assert get_content_cache_key(user, event) is None
+        assert get_content_cache_key(user, poll) is None
+
+    def test_photo_thumbnails_not_generated(self, user, photo):
+        assert get_content_cache_key(user, photo) is None
+
+    def test_photo_image_processed(self, user, photo):
+        photo.thumbnailer.generate(photo)
+        key = get_content_cache_key(user, photo)
+        assert key
+
+        photo.process_image()
+        assert get_content_cache_key(user, photo) not in (key, None)
+
+
+class TestCacheActivityContent:
+    def render(self, rf, user, post):
+        return Template(
+            "{% load activities %}{% render_activity request user object %}"
+        ).render(Context({"request": rf.get("/"), "user": user, "object": post}))
+
+    def test_shared_between_users(self, rf, post, locmem_cache):
+        post.description = "first"
+        assert "first" in self.render(rf, UserFactory(), post)
+
+        # not saved, so key is unchanged
+        post.description = "second"
+        assert "first" in self.render(rf, UserFactory(), post)
+
+    def test_modified(self, rf, post, locmem_cache):
+        post.description = "first"
+        assert "first" in self.render(rf, UserFactory(), post)
+
+        post.description = "second"
+        post.save()
+        assert "second" in self.render(rf, UserFactory(), post)
+
+    def test_photo_thumbnails_generated(self, rf, photo, locmem_cache):
+        # original image shown until thumbnails are generated
+        assert photo.image.url in self.render(rf, UserFactory(), photo)
+
+        thumbnails = photo.thumbnailer.generate(photo)
+
+        content = self.render(rf, UserFactory(), photo)
+        assert thumbnails["variants"]["1000"]["url"] in content
+        assert photo.image.url not in content
+
+
 class TestGetPinnedActivity:
     def test_get_pinned_activity_if_none(self, member):
         pinned = get_pinned_activity(member.member, member.community)
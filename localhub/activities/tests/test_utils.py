@@ -27,6 +27,7 @@ from ..utils import (
     get_activity_queryset_count,
     get_activity_querysets,
     load_objects,
+    update_content_warning_tags,
 )
 
 pytestmark = pytest.mark.django_db
@@ -90,3 +91,35 @@ class TestGetActivityQuerysetCount:
         EventFactory()
 
         assert get_activity_queryset_count(lambda model: model.objects.all()) == 2
+
+
+class TestUpdateContentWarningTags:
+    def test_update_content_warning_tags(self, community):
+        changed = PostFactory(community=community, description="#spoilers #movies")
+        unchanged = PostFactory(community=community, description="#movies")
+        removed = PostFactory(community=community, description="#nsfw")
+
+        num_updated = update_content_warning_tags(
+            Post.objects.filter(community=community), {"spoilers", "movies"}
+        )
+        assert num_updated == 3
+
+        changed.refresh_from_db()
+        assert changed.content_warning_tags == ["movies", "spoilers"]
+
+        unchanged.refresh_from_db()
+        assert unchanged.content_warning_tags == ["movies"]
+
+        removed.refresh_from_db()
+        assert removed.content_warning_tags == []
+
+    def test_only_changed_updated(self, community):
+        PostFactory(community=community, description="#nsfw")
+        PostFactory(community=community, description="#movies")
+
+        assert (
+            update_content_warning_tags(
+                Post.objects.filter(community=community), {"nsfw"}, batch_size=1
+            )
+            == 0
+        )
@@ -41,6 +41,31 @@ class TestActivityStreamView:
         assert response.status_code == 200
         assert len(response.context["object_list"]) == 4
 
+    def test_get_if_not_modified(self, client, member, locmem_cache):
+        PostFactory(community=member.community, owner=member.member)
+
+        response = client.get(settings.HOME_PAGE_URL)
+        assert response.status_code == 200
+
+        response = client.get(
+            settings.HOME_PAGE_URL, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == 304
+
+    def test_get_if_modified(self, client, member, locmem_cache):
+        post = PostFactory(community=member.community, owner=member.member)
+
+        response = client.get(settings.HOME_PAGE_URL)
+        assert response.status_code == 200
+
+        post.title = "changed"
+        post.save()
+
+        response = client.get(
+            settings.HOME_PAGE_URL, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == 200
+
 
 class TestActivityTimelineView:
     def test_get(self, client, member):
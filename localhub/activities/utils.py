@@ -1,6 +1,9 @@
 # Standard Library
 import collections
 
+# Localhub
+from localhub.hashtags.utils import extract_hashtags
+
 # Local
 from .models import Activity
 
@@ -123,6 +126,67 @@ def get_activity_querysets(queryset_fn, ordering=None, values=None, all=False):
     return qs, querysets
 
 
+def get_activity_queryset_last_modified(queryset_fn):
+    """Returns latest modified date of all activities in querysets.
+
+    Args:
+        queryset_fn: function taking argument of Activity model. Takes a Model
+            class and returns a QuerySet.
+
+    Returns:
+        datetime or None if no activities
+    """
+    querysets = [
+        queryset_fn(model).order_by().values_list("modified", flat=True)
+        for model in get_activity_models()
+    ]
+    return unionize_querysets(querysets, all=True).order_by("-modified").first()
+
+
 def get_activity_queryset_count(queryset_fn):
     querysets = [queryset_fn(model).only("pk") for model in get_activity_models()]
     return unionize_querysets(querysets, all=True).count()
+
+
+def update_content_warning_tags(queryset, warning_tags, batch_size=500):
+    """Recalculates content warning tags of activities in bulk, e.g. when
+    a community changes its warning tags. Only activities whose tags have
+    changed are updated.
+
+    Args:
+        queryset (QuerySet): Activity QuerySet
+        warning_tags (set): community warning tags
+        batch_size (int, optional): number of rows loaded and updated in
+            each batch (default: 500)
+
+    Returns:
+        int: number of activities updated
+    """
+    changed = []
+    num_updated = 0
+
+    for activity in queryset.only(
+        "pk", "title", "description", "hashtags", "content_warning_tags"
+    ).iterator(chunk_size=batch_size):
+        content_warning_tags = sorted(
+            warning_tags
+            & (
+                extract_hashtags(activity.title)
+                | extract_hashtags(activity.description)
+                | extract_hashtags(activity.hashtags)
+            )
+        )
+        if content_warning_tags != activity.content_warning_tags:
+            activity.content_warning_tags = content_warning_tags
+            changed.append(activity)
+
+        if len(changed) >= batch_size:
+            queryset.bulk_update(changed, ["content_warning_tags"])
+            num_updated += len(changed)
+            changed = []
+
+    if changed:
+        queryset.bulk_update(changed, ["content_warning_tags"])
+        num_updated += len(changed)
+
+    return num_updated
@@ -5,8 +5,8 @@
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db import IntegrityError
-from django.db.models import QuerySet
+from django.db import IntegrityError, transaction
+from django.db.models import Max, QuerySet
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.utils import timezone
@@ -19,14 +19,16 @@ from turbo_response import TurboFrame, TurboStream, redirect_303, render_form_re
 # Localhub
 from localhub.bookmarks.models import Bookmark
 from localhub.comments.forms import CommentForm
+from localhub.common.conditional import conditional_response
 from localhub.common.decorators import add_messages_to_response_header
 from localhub.common.forms import handle_form
 from localhub.common.pagination import get_pagination_context, render_paginated_queryset
 from localhub.common.template.defaultfilters import resolve_url
+from localhub.communities.cache import cache_anonymous_page, get_content_version
 from localhub.communities.decorators import community_required
 from localhub.flags.views import handle_flag_create
 from localhub.likes.models import Like
-from localhub.users.utils import has_perm_or_403
+from localhub.users.utils import bump_state_versions, has_perm_or_403
 
 # Local
 from ..forms import ActivityTagsForm
@@ -128,6 +130,7 @@ def activity_list_view(
 
 
 @community_required
+@cache_anonymous_page
 def activity_detail_view(request, pk, model, template_name, slug=None):
     obj = get_activity_or_404(
         request,
@@ -148,9 +151,11 @@ def activity_reshare_view(request, pk, model):
         permission="activities.reshare_activity",
     )
 
-    reshare = obj.reshare(request.user)
+    reshare = obj.reshare(request.user, commit=False)
+    reshare.defer_search_index = True
+    reshare.save()
 
-    reshare.notify_on_publish()
+    transaction.on_commit(reshare.schedule_publish_pipeline)
 
     messages.success(
         request, model_translation_string(_("You have reshared this %(model)s"), obj)
@@ -170,8 +175,10 @@ def activity_publish_view(request, pk, model):
     )
 
     obj.published = timezone.now()
+    obj.defer_search_index = True
     obj.save(update_fields=["published"])
-    obj.notify_on_publish()
+
+    transaction.on_commit(obj.schedule_publish_pipeline)
 
     messages.success(
         request, model_translation_string(_("Your %(model)s has been published"), obj)
@@ -460,11 +467,12 @@ def process_activity_create_form(
 
             if publish:
                 obj.published = timezone.now()
+                obj.defer_search_index = True
 
             obj.save()
 
             if publish:
-                obj.notify_on_publish()
+                transaction.on_commit(obj.schedule_publish_pipeline)
 
             success_message = (
                 _("Your %(model)s has been published")
@@ -556,47 +564,71 @@ def render_activity_update_form(
 
 
 def render_activity_detail(request, obj, template_name, *, extra_context=None):
+    """Renders activity with comments and reshares. Returns 304 Not Modified
+    if the activity and its comments have not changed since the client
+    last fetched the page.
+    """
 
     if request.user.is_authenticated:
-        obj.get_notifications().for_recipient(request.user).unread().update(
-            is_read=True
+        if (
+            obj.get_notifications()
+            .for_recipient(request.user)
+            .unread()
+            .update(is_read=True)
+        ):
+            bump_state_versions(request.user.pk)
+
+    def _render():
+        comments = (
+            obj.get_comments()
+            .for_community(request.community)
+            .with_common_annotations(request.user, request.community)
+            .exclude_deleted()
+            .with_common_related()
+            .order_by("created")
         )
 
-    comments = (
-        obj.get_comments()
-        .for_community(request.community)
-        .with_common_annotations(request.user, request.community)
-        .exclude_deleted()
-        .with_common_related()
-        .order_by("created")
-    )
-
-    reshares = (
-        obj.reshares.for_community(request.community)
-        .exclude_blocked_users(request.user)
-        .select_related("owner")
-        .order_by("-created")
-    )
-
-    context = {
-        "object": obj,
-        "reshares": reshares,
-        **get_pagination_context(request, comments),
-    }
-
-    if request.user.has_perm("communities.moderate_community", request.community):
-        context["flags"] = (
-            obj.get_flags()
-            .select_related("user")
-            .prefetch_related("content_object")
+        reshares = (
+            obj.reshares.for_community(request.community)
+            .exclude_blocked_users(request.user)
+            .select_related("owner")
             .order_by("-created")
         )
 
-    if request.user.has_perm("activities.create_comment", obj):
-        context["comment_form"] = CommentForm()
+        context = {
+            "object": obj,
+            "reshares": reshares,
+            **get_pagination_context(request, comments),
+        }
+
+        if request.user.has_perm("communities.moderate_community", request.community):
+            context["flags"] = (
+                obj.get_flags()
+                .select_related("user")
+                .prefetch_related("content_object")
+                .order_by("-created")
+            )
 
-    return TemplateResponse(
-        request, template_name, {**context, **(extra_context or {})}
+        if request.user.has_perm("activities.create_comment", obj):
+            context["comment_form"] = CommentForm()
+
+        return TemplateResponse(
+            request, template_name, {**context, **(extra_context or {})}
+        )
+
+    return conditional_response(
+        request,
+        _render,
+        last_modified=max(
+            filter(
+                None,
+                [
+                    obj.modified,
+                    obj.get_comments().aggregate(Max("modified"))["modified__max"],
+                ],
+            )
+        ),
+        version=[get_content_version(request.community.id)],
     )
 
 
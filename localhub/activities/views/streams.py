@@ -19,16 +19,24 @@ from django.views.generic.dates import _date_from_string
 from dateutil import relativedelta
 
 # Localhub
+from localhub.common.conditional import conditional_response
 from localhub.common.pagination import PresetCountPaginator
+from localhub.communities.cache import cache_anonymous_page, get_content_version
 from localhub.communities.decorators import community_required
 from localhub.join_requests.models import JoinRequest
 from localhub.notifications.models import Notification
 
 # Local
-from ..utils import get_activity_queryset_count, get_activity_querysets, load_objects
+from ..utils import (
+    get_activity_queryset_count,
+    get_activity_queryset_last_modified,
+    get_activity_querysets,
+    load_objects,
+)
 
 
 @community_required
+@cache_anonymous_page
 def activity_stream_view(request):
     """
     Default "Home Page" of community.
@@ -47,6 +55,7 @@ def activity_stream_view(request):
             .for_recipient(request.user)
             .exclude_blocked_actors(request.user)
             .unread()
+            .prefetch_related("content_object")
             .select_related("actor", "content_type", "community", "recipient")
             .order_by("-created")
         )
@@ -133,9 +142,7 @@ def timeline_view(request):
 
     _, querysets = get_activity_querysets(
         lambda model: _filter_queryset(
-            model.objects.for_activity_stream(
-                request.user, request.community
-            ).distinct(),
+            model.objects.for_activity_stream(request.user, request.community),
             with_date_kwargs=False,
         )
     )
@@ -222,17 +229,18 @@ def get_activity_stream_context(
 
     qs, querysets = get_activity_querysets(
         lambda model: queryset_filter(
-            model.objects.for_community(request.community)
-            .for_activity_stream(request.user, request.community)
-            .distinct()
+            model.objects.for_community(request.community).for_activity_stream(
+                request.user, request.community
+            )
         ),
         ordering=ordering,
+        # querysets have no duplicate rows, and rows of different models
+        # have different object types
+        all=True,
     )
 
     count = get_activity_queryset_count(
-        lambda model: queryset_filter(
-            model.objects.for_community(request.community).distinct()
-        )
+        lambda model: queryset_filter(model.objects.for_community(request.community))
     )
 
     page = PresetCountPaginator(
@@ -258,15 +266,27 @@ def render_activity_stream(
     """
     Pattern adapted from:
     https://simonwillison.net/2018/Mar/25/combined-recent-additions/
+
+    Returns 304 Not Modified if no activities have changed since the
+    client last fetched the page.
     """
 
-    return TemplateResponse(
+    return conditional_response(
         request,
-        template_name,
-        {
-            **get_activity_stream_context(request, queryset_filter, **kwargs),
-            **(extra_context or {}),
-        },
+        lambda: TemplateResponse(
+            request,
+            template_name,
+            {
+                **get_activity_stream_context(request, queryset_filter, **kwargs),
+                **(extra_context or {}),
+            },
+        ),
+        last_modified=get_activity_queryset_last_modified(
+            lambda model: queryset_filter(
+                model.objects.for_community(request.community)
+            )
+        ),
+        version=[get_content_version(request.community.id)],
     )
 
 
@@ -0,0 +1,165 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import dataclasses
+import difflib
+import os
+import pathlib
+import warnings
+
+# Django
+from django.core.management import call_command
+from django.db import connection
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.communities.models import Community, Membership
+from localhub.communities.seeder import CommunitySeeder
+
+# Local
+from .plans import QueryPlan, QueryPlanChanged
+from .recorder import BenchmarkRecorder
+
+SNAPSHOTS_DIR = pathlib.Path(__file__).parent / "snapshots"
+
+DATASET_SIZES = {
+    "small": {"num_users": 200, "num_activities": 2000},
+    "medium": {"num_users": 1000, "num_activities": 10000},
+    "large": {"num_users": 5000, "num_activities": 50000},
+}
+
+
+@dataclasses.dataclass
+class Dataset:
+    size: str
+    community: Community
+    admin: object
+
+
+def get_dataset_sizes():
+    return os.environ.get("BENCHMARK_SIZES", "small").split(",")
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder():
+    recorder = BenchmarkRecorder(
+        rounds=int(os.environ.get("BENCHMARK_ROUNDS", 5)),
+        baseline=BenchmarkRecorder.load_baseline(os.environ.get("BENCHMARK_COMPARE")),
+        max_time_regression=float(os.environ.get("BENCHMARK_MAX_TIME_REGRESSION", 0.2)),
+        max_query_regression=int(os.environ.get("BENCHMARK_MAX_QUERY_REGRESSION", 0)),
+        max_memory_regression=float(
+            os.environ.get("BENCHMARK_MAX_MEMORY_REGRESSION", 0.25)
+        ),
+    )
+    yield recorder
+    if recorder.results:
+        recorder.save(os.environ.get("BENCHMARK_SAVE", ".benchmarks/results.json"))
+
+
+@pytest.fixture(scope="session", params=get_dataset_sizes())
+def dataset(request, django_db_setup, django_db_blocker):
+    """Seeds a community once per session for each size. Data is
+    committed, so is shared by all benchmarks: changes made inside each
+    benchmark are rolled back as usual.
+    """
+    size = request.param
+    with django_db_blocker.unblock():
+        community = Community.objects.create(
+            name=f"Benchmark {size}",
+            domain=f"{size}.example.com",
+            active=True,
+        )
+        CommunitySeeder(community, seed=1, **DATASET_SIZES[size]).seed()
+
+        # update planner statistics and visibility maps now, rather than
+        # have autovacuum change them (and query plans) during the session
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM ANALYZE")
+
+        admin = Membership.objects.get(
+            community=community, role=Membership.Role.ADMIN
+        ).member
+
+    yield Dataset(size=size, community=community, admin=admin)
+
+    # remove the dataset before seeding the next size, so planner
+    # statistics and query plans only depend on the current dataset
+    with django_db_blocker.unblock():
+        call_command("flush", interactive=False, verbosity=0)
+
+
+@pytest.fixture
+def benchmark(request, benchmark_recorder, dataset):
+    """Runs benchmark, named by test and dataset size e.g.
+    "TestStreams::test_activity_stream[small]". To run more than one
+    benchmark in a test, add a suffix to the name of each.
+
+    Example:
+
+    def test_my_view(benchmark, client):
+        benchmark(lambda: client.get("/"))
+    """
+
+    def _benchmark(func, setup=None, suffix=None):
+        name = request.node.nodeid.split("::", 1)[1]
+        if suffix:
+            name = f"{name}-{suffix}"
+        return benchmark_recorder.run(name, func, setup)
+
+    return _benchmark
+
+
+@pytest.fixture
+def explain(request, dataset):
+    """Runs EXPLAIN (without running the query) against the dataset, and
+    compares the outline of the plan with a snapshot in
+    snapshots/<size>/<test name>.txt.
+
+    Plans depend on planner statistics and the PostgreSQL version, so a
+    changed plan is reported as a QueryPlanChanged warning with a diff,
+    rather than failing the test: tests should assert stable properties of
+    the plan instead, e.g. indexes used.
+
+    Missing snapshots are created. To update snapshots after an intended
+    change, set BENCHMARK_UPDATE_SNAPSHOTS=1: the updated snapshots should
+    then be committed, so changes to plans can be reviewed. To run more than
+    one EXPLAIN in a test, add a suffix to the name of each.
+
+    Example:
+
+    def test_my_query(explain):
+        plan = explain(Post.objects.filter(title="test"))
+        assert not plan.has_seq_scan("posts_post")
+    """
+
+    def _explain(queryset, suffix=None):
+        plan = QueryPlan.explain(queryset)
+        outline = plan.get_outline()
+
+        name = request.node.originalname
+        if suffix:
+            name = f"{name}-{suffix}"
+
+        path = SNAPSHOTS_DIR / dataset.size / f"{name}.txt"
+
+        if path.exists() and not os.environ.get("BENCHMARK_UPDATE_SNAPSHOTS"):
+            if (snapshot := path.read_text()) != outline:
+                diff = "".join(
+                    difflib.unified_diff(
+                        snapshot.splitlines(keepends=True),
+                        outline.splitlines(keepends=True),
+                        fromfile=str(path.relative_to(SNAPSHOTS_DIR)),
+                        tofile="current plan",
+                    )
+                )
+                warnings.warn(f"Query plan has changed:\n{diff}", QueryPlanChanged)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(outline)
+
+        return plan
+
+    return _explain
@@ -0,0 +1,189 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import json
+
+# Django
+from django.db import connections
+from django.db.models.query import RawQuerySet
+
+
+class QueryPlanChanged(UserWarning):
+    """Plan outline differs from its snapshot."""
+
+
+class QueryPlan:
+    """Wraps output of PostgreSQL EXPLAIN (FORMAT JSON) for checking
+    properties of a plan, e.g. which indexes are used.
+
+    Args:
+        plan (dict): root "Plan" node
+    """
+
+    def __init__(self, plan):
+        self.plan = plan
+
+    @classmethod
+    def explain(cls, queryset):
+        """Runs EXPLAIN for a QuerySet or RawQuerySet. The query is planned
+        but not run.
+
+        Args:
+            queryset (QuerySet or RawQuerySet)
+
+        Returns:
+            QueryPlan
+        """
+        if isinstance(queryset, RawQuerySet):
+            sql, params = queryset.query.sql, queryset.query.params
+        else:
+            sql, params = queryset.query.sql_with_params()
+
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            result = cursor.fetchone()[0]
+
+        # psycopg2 decodes json columns, but not if returned as text
+        if isinstance(result, str):
+            result = json.loads(result)
+        return cls(result[0]["Plan"])
+
+    @property
+    def total_cost(self):
+        """
+        Returns:
+            float: estimated total cost of the query
+        """
+        return self.plan["Total Cost"]
+
+    def nodes(self, node=None):
+        """Iterates all plan nodes, depth first.
+
+        Yields:
+            dict: plan node
+        """
+        node = node or self.plan
+        yield node
+        for child in node.get("Plans", []):
+            yield from self.nodes(child)
+
+    def get_indexes(self):
+        """
+        Returns:
+            Set[str]: names of all indexes used in the plan
+        """
+        return {node["Index Name"] for node in self.nodes() if "Index Name" in node}
+
+    def get_seq_scans(self):
+        """
+        Returns:
+            Set[str]: names of all tables read with a sequential scan
+        """
+        return {
+            node["Relation Name"]
+            for node in self.nodes()
+            if node["Node Type"] == "Seq Scan"
+        }
+
+    def uses_index(self, name):
+        """
+        Args:
+            name (str): index name
+
+        Returns:
+            bool
+        """
+        return name in self.get_indexes()
+
+    def has_node(self, node_type):
+        """
+        Args:
+            node_type (str): e.g. "Unique" or "Sort"
+
+        Returns:
+            bool
+        """
+        return any(node["Node Type"] == node_type for node in self.nodes())
+
+    def is_semi_joined(self, table):
+        """Checks table is only used to filter rows, so never returns
+        duplicate rows: every scan of the table is either in a subplan
+        (e.g. EXISTS or IN), or the inner side of a semi or anti join, or of
+        a join where each outer row matches at most one inner row.
+
+        Args:
+            table (str): table name
+
+        Returns:
+            bool: False if table is not in the plan
+        """
+        scans = list(self._find_scans(self.plan, table, []))
+        return bool(scans) and all(map(self._is_filter, scans))
+
+    def _find_scans(self, node, table, ancestors):
+        if node.get("Relation Name") == table:
+            yield [*ancestors, node]
+        for child in node.get("Plans", []):
+            yield from self._find_scans(child, table, [*ancestors, node])
+
+    def _is_filter(self, path):
+        # rows of a subplan are only checked, never returned
+        if any(
+            node.get("Parent Relationship") in ("SubPlan", "InitPlan") for node in path
+        ):
+            return True
+        # walk up from the scan to the nearest join
+        for parent, child in zip(reversed(path[:-1]), reversed(path[1:])):
+            if "Join Type" in parent:
+                return child.get("Parent Relationship") == "Inner" and (
+                    parent["Join Type"] in ("Semi", "Anti")
+                    or parent.get("Inner Unique", False)
+                )
+        return False
+
+    def has_seq_scan(self, table):
+        """
+        Args:
+            table (str): table name
+
+        Returns:
+            bool
+        """
+        return table in self.get_seq_scans()
+
+    def get_outline(self):
+        """Returns plan as indented text, one line per node, without costs
+        or row estimates. Outlines only change when the shape of the plan
+        changes, so are suitable for snapshots.
+
+        Returns:
+            str
+        """
+        lines = []
+
+        def _outline(node, depth):
+            line = node["Node Type"]
+            if strategy := node.get("Strategy"):
+                line = f"{strategy} {line}"
+            if join_type := node.get("Join Type"):
+                line += f" ({join_type})"
+            if index := node.get("Index Name"):
+                line += f" using {index}"
+            if relation := node.get("Relation Name"):
+                line += f" on {relation}"
+            if cte := node.get("CTE Name"):
+                line += f" on {cte}"
+            if subplan := node.get("Subplan Name"):
+                line += f" [{subplan}]"
+
+            lines.append("  " * depth + line)
+
+            for child in node.get("Plans", []):
+                _outline(child, depth + 1)
+
+        _outline(self.plan, 0)
+        return "\n".join(lines) + "\n"
+
+    def __str__(self):
+        return self.get_outline()
@@ -0,0 +1,137 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import json
+import pathlib
+import statistics
+import time
+import tracemalloc
+
+# Django
+from django.db import connection
+
+
+class BenchmarkRecorder:
+    """Measures wall time, query count and peak memory of a function, and
+    compares results with a baseline from a previous run.
+
+    Args:
+        rounds (int): number of timed runs. The fastest is used for
+            comparison, as it is least affected by noise.
+        baseline (dict, optional): results of a previous run
+        max_time_regression (float): max fractional time increase
+        max_query_regression (int): max additional queries
+        max_memory_regression (float): max fractional peak memory increase
+    """
+
+    def __init__(
+        self,
+        rounds=5,
+        baseline=None,
+        max_time_regression=0.2,
+        max_query_regression=0,
+        max_memory_regression=0.25,
+    ):
+        self.rounds = rounds
+        self.baseline = baseline or {}
+        self.max_time_regression = max_time_regression
+        self.max_query_regression = max_query_regression
+        self.max_memory_regression = max_memory_regression
+        self.results = {}
+
+    def run(self, name, func, setup=None):
+        """Runs benchmark and records results.
+
+        Args:
+            name (str): unique benchmark name, e.g. view and dataset size
+            func (callable): function to measure
+            setup (callable, optional): returns arguments for func. Called
+                before each run, and not measured.
+
+        Returns:
+            dict: results
+
+        Raises:
+            AssertionError: if result regresses beyond thresholds
+        """
+        setup = setup or (lambda: ())
+
+        # warm up caches, template loaders etc
+        func(*setup())
+
+        times = []
+        for _ in range(self.rounds):
+            args = setup()
+            # not using CaptureQueriesContext, as the test client resets
+            # the queries log at the start of each request
+            queries = []
+            with connection.execute_wrapper(
+                lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)
+            ):
+                start = time.perf_counter()
+                func(*args)
+                times.append(time.perf_counter() - start)
+
+        # tracemalloc slows everything down, so run separately
+        args = setup()
+        tracemalloc.start()
+        try:
+            func(*args)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = self.results[name] = {
+            "time": min(times),
+            "mean_time": statistics.mean(times),
+            "queries": len(queries),
+            "peak_memory": peak_memory,
+        }
+
+        self.check_regressions(name, result)
+        return result
+
+    def check_regressions(self, name, result):
+        if (baseline := self.baseline.get(name)) is None:
+            return
+
+        errors = []
+
+        if result["time"] > baseline["time"] * (1 + self.max_time_regression):
+            errors.append(f"time {baseline['time']:.4f}s -> {result['time']:.4f}s")
+
+        if result["queries"] > baseline["queries"] + self.max_query_regression:
+            errors.append(f"queries {baseline['queries']} -> {result['queries']}")
+
+        if result["peak_memory"] > baseline["peak_memory"] * (
+            1 + self.max_memory_regression
+        ):
+            errors.append(
+                f"peak memory {baseline['peak_memory']} -> {result['peak_memory']}"
+            )
+
+        assert not errors, f"{name} regressed: {', '.join(errors)}"
+
+    def save(self, path):
+        """Saves results as JSON.
+
+        Args:
+            path (str)
+        """
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.results, indent=2, sort_keys=True))
+
+    @classmethod
+    def load_baseline(cls, path):
+        """
+        Args:
+            path (str, optional): JSON results of a previous run
+
+        Returns:
+            dict: empty if no path or file not found
+        """
+        if path and (path := pathlib.Path(path)).exists():
+            return json.loads(path.read_text())
+        return {}
@@ -0,0 +1,40 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Memory benchmarks of loading large numbers of model instances, e.g. for
+tracked fields (see TrackerModelMixin):
+
+BENCHMARK_SIZES=medium pytest -m benchmark localhub/benchmarks/test_memory.py
+"""
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.utils import get_activity_models
+from localhub.comments.models import Comment
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+MAX_INSTANCES = 10000
+
+
+class TestTrackerMemory:
+    def test_load_activities(self, benchmark, dataset):
+        def _load():
+            objects = []
+            for model in get_activity_models():
+                objects += model.objects.filter(community=dataset.community)[
+                    : MAX_INSTANCES - len(objects)
+                ]
+            return objects
+
+        benchmark(_load)
+
+    def test_load_comments(self, benchmark, dataset):
+        benchmark(
+            lambda: list(
+                Comment.objects.filter(community=dataset.community)[:MAX_INSTANCES]
+            )
+        )
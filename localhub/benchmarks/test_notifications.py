@@ -0,0 +1,95 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Benchmarks of sending notifications to all followers of a member of a
+seeded community, e.g. when a post is published:
+
+BENCHMARK_SIZES=large pytest -m benchmark localhub/benchmarks/test_notifications.py -p no:xdist
+"""
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.posts.factories import PostFactory
+from localhub.communities.models import Membership
+from localhub.users.models import User
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+# seeded datasets have at most a few thousand members, so extra followers
+# are added to the owner of each post
+NUM_FOLLOWERS = 10000
+
+BATCH_SIZE = 5000
+
+
+@pytest.fixture
+def followers(dataset):
+    """Adds NUM_FOLLOWERS new members following the admin. These are created
+    inside the test transaction, so are rolled back after the benchmark.
+
+    Email notifications are turned off for the new members: the benchmark
+    measures resolving and saving notifications, rather than rendering
+    emails.
+    """
+    followers = User.objects.bulk_create(
+        [
+            User(
+                username=f"follower{counter}",
+                email=f"follower{counter}@{dataset.community.domain}",
+                send_email_notifications=False,
+            )
+            for counter in range(NUM_FOLLOWERS)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    Membership.objects.bulk_create(
+        [
+            Membership(member=follower, community=dataset.community)
+            for follower in followers
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    User.following.through.objects.bulk_create(
+        [
+            User.following.through(from_user=follower, to_user=dataset.admin)
+            for follower in followers
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    return followers
+
+
+class TestNotifyOnPublish:
+    def test_followers(self, benchmark, dataset, followers, send_webpush_mock):
+        mentioned = followers[:2]
+        posts = []
+
+        def _setup():
+            post = PostFactory(
+                owner=dataset.admin,
+                community=dataset.community,
+                description=" ".join(
+                    [f"@{follower.username}" for follower in mentioned] + ["#movies"]
+                ),
+            )
+            posts.append(post)
+            return (post,)
+
+        result = benchmark(lambda post: post.notify_on_publish(), _setup)
+
+        assert dataset.admin.followers.count() >= NUM_FOLLOWERS
+
+        notifications = posts[-1].get_notifications()
+        assert notifications.filter(
+            verb="mention", recipient__in=mentioned
+        ).count() == len(mentioned)
+        assert set(notifications.values_list("recipient", flat=True)) >= {
+            follower.id for follower in followers
+        }
+        assert result["queries"] < 10
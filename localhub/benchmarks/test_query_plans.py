@@ -0,0 +1,227 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Query plan regression tests for the busiest querysets, run against the
+seeded benchmark datasets:
+
+BENCHMARK_SIZES=small pytest -m benchmark localhub/benchmarks/test_query_plans.py
+
+Exact plans and estimated costs depend on planner statistics, which change
+with other benchmarks run in the same session, and on the PostgreSQL
+version. Tests only check stable properties of each plan, such as the
+indexes used, and tables which should never be read with a sequential scan.
+
+Outlines of the plans are kept in snapshots/<size>, so changes to plans
+show up in reviews: a plan that differs from its snapshot is reported as
+a warning with a diff. Set BENCHMARK_UPDATE_SNAPSHOTS=1 to update them.
+"""
+
+# Standard Library
+from datetime import timedelta
+
+# Django
+from django.db.models import F, Q
+from django.utils import timezone
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.events.models import Event
+from localhub.activities.posts.models import Post
+from localhub.activities.utils import get_activity_querysets
+from localhub.notifications.models import Notification
+from localhub.private_messages.models import Message
+from localhub.users.models import User
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+
+@pytest.fixture
+def user(dataset):
+    user = dataset.admin
+    user.activity_stream_filters = [
+        User.ActivityStreamFilters.USERS,
+        User.ActivityStreamFilters.TAGS,
+    ]
+    return user
+
+
+class TestActivityPlans:
+    def test_for_activity_stream(self, explain, dataset, user):
+        qs, _ = get_activity_querysets(
+            lambda model: model.objects.for_community(dataset.community)
+            .for_activity_stream(user, dataset.community)
+            .published()
+            .with_activity_stream_filters(user)
+            .exclude_blocked(user),
+            ordering="-published",
+            all=True,
+        )
+        plan = explain(qs[:20])
+        # filters are semi-joins, so rows are never deduplicated
+        assert not plan.has_node("Unique")
+        assert plan.is_semi_joined("communities_membership")
+        assert plan.is_semi_joined("taggit_taggeditem")
+
+    def test_semi_joins_vs_distinct(self, benchmark, explain, dataset, user):
+        """Benchmarks the activity stream with the previous implementation,
+        which joined tags and memberships and so needed DISTINCT, and UNION
+        rather than UNION ALL. Both are recorded, see BENCHMARK_COMPARE.
+        """
+
+        def _joined(model):
+            return (
+                model.objects.published()
+                .for_activity_stream(user, dataset.community)
+                .filter(
+                    community=dataset.community,
+                    owner__membership__community=dataset.community,
+                    owner__membership__active=True,
+                    owner__is_active=True,
+                )
+                .filter(
+                    Q(owner=user)
+                    | Q(owner__in=user.following.all())
+                    | Q(tags__in=user.following_tags.all())
+                )
+                .exclude_blocked_users(user)
+                .exclude(Q(tags__in=user.blocked_tags.all()), ~Q(owner=user))
+                .distinct()
+            )
+
+        def _semi_joined(model):
+            return (
+                model.objects.for_community(dataset.community)
+                .published()
+                .for_activity_stream(user, dataset.community)
+                .with_activity_stream_filters(user)
+                .exclude_blocked(user)
+            )
+
+        joined, _ = get_activity_querysets(_joined, ordering="-published")
+        semi_joined, _ = get_activity_querysets(
+            _semi_joined, ordering="-published", all=True
+        )
+
+        joined, semi_joined = joined[:20], semi_joined[:20]
+
+        assert [item["pk"] for item in semi_joined] == [item["pk"] for item in joined]
+
+        joined_plan = explain(joined, suffix="distinct")
+        semi_joined_plan = explain(semi_joined, suffix="semi-join")
+
+        # duplicates may be removed with Unique or a hashed aggregate, so
+        # only check that tags are joined
+        assert not joined_plan.is_semi_joined("taggit_taggeditem")
+
+        assert not semi_joined_plan.has_node("Unique")
+        assert semi_joined_plan.is_semi_joined("taggit_taggeditem")
+
+        benchmark(lambda: list(joined.all()), suffix="distinct")
+        benchmark(lambda: list(semi_joined.all()), suffix="semi-join")
+
+    def test_with_activity_stream_filters(self, explain, dataset, user):
+        plan = explain(
+            Post.objects.for_community(dataset.community)
+            .published()
+            .with_activity_stream_filters(user)
+            .order_by("-published")[:20]
+        )
+        assert plan.uses_index("posts_post_publish_0f09a8_idx")
+        assert not plan.has_seq_scan("posts_post")
+        assert not plan.has_seq_scan("taggit_taggeditem")
+        assert not plan.has_node("Unique")
+        assert plan.is_semi_joined("taggit_taggeditem")
+
+    def test_for_community(self, explain, dataset):
+        plan = explain(
+            Post.objects.for_community(dataset.community)
+            .published()
+            .order_by("-published")[:20]
+        )
+        assert plan.uses_index("posts_post_publish_0f09a8_idx")
+        assert not plan.has_seq_scan("posts_post")
+        assert plan.is_semi_joined("communities_membership")
+
+    def test_exclude_blocked(self, explain, dataset, user):
+        plan = explain(
+            Post.objects.for_community(dataset.community)
+            .published()
+            .exclude_blocked(user)
+            .order_by("-published")[:20]
+        )
+        assert plan.uses_index("posts_post_publish_0f09a8_idx")
+        assert not plan.has_seq_scan("posts_post")
+        assert not plan.has_seq_scan("taggit_taggeditem")
+        assert not plan.has_node("Unique")
+        assert plan.is_semi_joined("taggit_taggeditem")
+
+
+class TestEventPlans:
+    def test_for_dates(self, explain, dataset):
+        today = timezone.now()
+        plan = explain(
+            Event.objects.for_community(dataset.community)
+            .published()
+            .for_dates(today, today + timedelta(days=30))
+        )
+        # single day, multiple day and repeating events
+        assert plan.uses_index("event_starts_idx")
+        assert plan.uses_index("event_multiday_starts_idx")
+        assert plan.uses_index("event_repeats_starts_idx")
+        assert not plan.has_seq_scan("events_event")
+        assert not plan.has_seq_scan("users_user")
+        assert not plan.has_node("Unique")
+
+
+class TestMessagePlans:
+    def test_between(self, explain, dataset):
+        message = Message.objects.filter(community=dataset.community).first()
+        plan = explain(
+            Message.objects.for_community(dataset.community)
+            .between(message.sender, message.recipient)
+            .order_by("-created")
+        )
+        assert plan.uses_index("private_messages_message_sender_id_b7eb849f")
+        assert not plan.has_seq_scan("private_messages_message")
+
+    def test_all_replies(self, explain, dataset):
+        message = Message.objects.filter(community=dataset.community).first()
+        plan = explain(Message.objects.raw_replies(message))
+        assert plan.has_node("Recursive Union")
+        # small tables may be scanned rather than using the index
+        if dataset.size != "small":
+            assert plan.uses_index("private_messages_message_parent_id_6139407c")
+
+
+class TestNotificationPlans:
+    def test_unread_count(self, explain, dataset, user):
+        plan = explain(
+            Notification.objects.for_community(dataset.community)
+            .for_recipient(user)
+            .exclude_blocked_actors(user)
+            .unread()
+        )
+        assert plan.uses_index("notification_unread_idx")
+        assert not plan.has_seq_scan("notifications_notification")
+
+    def test_unread_external_count(self, explain, dataset, user):
+        plan = explain(
+            Notification.objects.filter(
+                community__membership__member=user,
+                community__membership__active=True,
+                community__active=True,
+                actor__membership__community=F("community"),
+                actor__membership__active=True,
+                actor__is_active=True,
+            )
+            .exclude(community=dataset.community)
+            .for_recipient(user)
+            .exclude_blocked_actors(user)
+            .unread()
+        )
+        assert plan.uses_index("notification_unread_idx")
+        assert not plan.has_seq_scan("notifications_notification")
+        assert not plan.has_seq_scan("communities_membership")
@@ -0,0 +1,56 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Throughput benchmarks of scanning large comment bodies for hashtags and
+mentions (see localhub.common.utils.tokenizer):
+
+BENCHMARK_SIZES=small pytest -m benchmark localhub/benchmarks/test_tokenizer.py
+
+Throughput (characters per second) is added to the saved results.
+"""
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.posts.models import Post
+from localhub.common.markdown.utils import markdownify
+from localhub.common.utils.tokenizer import tokenize
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+BODY_SIZE = 100_000
+
+
+@pytest.fixture
+def body(dataset):
+    """Seeded descriptions include hashtags and mentions."""
+    descriptions = []
+    size = 0
+    for description in (
+        Post.objects.filter(community=dataset.community)
+        .order_by("id")
+        .values_list("description", flat=True)
+        .iterator()
+    ):
+        descriptions.append(description)
+        if (size := size + len(description)) > BODY_SIZE:
+            break
+    return "\n\n".join(descriptions)
+
+
+class TestTokenizer:
+    def test_tokenize(self, benchmark, body):
+        result = benchmark(lambda: tokenize(body))
+        result["throughput"] = len(body) / result["time"]
+
+    def test_linkify(self, benchmark, body):
+        result = benchmark(
+            lambda: tokenize(body, linkify_hashtags=True, linkify_mentions=True)
+        )
+        result["throughput"] = len(body) / result["time"]
+
+    def test_markdownify(self, benchmark, body):
+        result = benchmark(lambda: markdownify(body))
+        result["throughput"] = len(body) / result["time"]
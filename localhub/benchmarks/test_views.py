@@ -0,0 +1,78 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Benchmarks of the busiest views against seeded datasets. These are not run
+by default, and should not be run with pytest-xdist:
+
+BENCHMARK_SIZES=small,medium pytest -m benchmark localhub/benchmarks -p no:xdist
+
+Results are saved to BENCHMARK_SAVE (default .benchmarks/results.json).
+To check for regressions, copy the results of a previous commit and set
+BENCHMARK_COMPARE to its path: a benchmark fails if its fastest time,
+query count or peak memory is worse than the baseline beyond the
+BENCHMARK_MAX_TIME_REGRESSION, BENCHMARK_MAX_QUERY_REGRESSION or
+BENCHMARK_MAX_MEMORY_REGRESSION thresholds.
+"""
+
+# Django
+from django.urls import reverse
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.posts.models import Post
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+
+@pytest.fixture
+def get(client, dataset):
+    client.force_login(dataset.admin)
+
+    def _get(url, **params):
+        def _request():
+            response = client.get(url, params, HTTP_HOST=dataset.community.domain)
+            assert response.status_code == 200
+            return response
+
+        return _request
+
+    return _get
+
+
+class TestStreamViews:
+    def test_activity_stream(self, benchmark, get):
+        benchmark(get(reverse("activity_stream")))
+
+    def test_activity_search(self, benchmark, get, dataset):
+        # search for a common word in the generated titles
+        title = Post.objects.filter(community=dataset.community).first().title
+        benchmark(get(reverse("activities:search"), q=title.split()[0]))
+
+    def test_timeline(self, benchmark, get):
+        benchmark(get(reverse("activities:timeline")))
+
+    def test_event_calendar(self, benchmark, get):
+        benchmark(get(reverse("events:calendar")))
+
+
+class TestDetailViews:
+    def test_activity_detail(self, benchmark, get, dataset):
+        # post with most comments
+        post = (
+            Post.objects.filter(community=dataset.community)
+            .with_num_comments(dataset.community)
+            .order_by("-num_comments")
+            .first()
+        )
+        benchmark(get(post.get_absolute_url()))
+
+
+class TestNotificationViews:
+    def test_notification_list(self, benchmark, get):
+        benchmark(get(reverse("notifications:list")))
+
+    def test_inbox(self, benchmark, get):
+        benchmark(get(reverse("private_messages:inbox")))
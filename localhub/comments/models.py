@@ -3,6 +3,7 @@
 
 # Django
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.indexes import GinIndex
@@ -25,7 +26,6 @@ from localhub.common.db.search.indexer import SearchIndexer
 from localhub.common.db.search.mixins import SearchQuerySetMixin
 from localhub.common.db.tracker import TrackerModelMixin
 from localhub.common.markdown.fields import MarkdownField
-from localhub.common.utils.itertools import takefirst
 from localhub.communities.models import Community, Membership
 from localhub.flags.models import Flag, FlagAnnotationsQuerySetMixin
 from localhub.likes.models import Like, LikeAnnotationsQuerySetMixin
@@ -34,6 +34,7 @@ from localhub.notifications.models import (
     Notification,
     NotificationAnnotationsQuerySetMixin,
 )
+from localhub.notifications.recipients import RecipientResolver
 
 
 class CommentQuerySet(
@@ -256,13 +257,20 @@ class Comment(TrackerModelMixin, TimeStampedModel):
             verb=verb,
         )
 
-    def notify_mentioned(self, recipients):
-        return [
-            self.make_notification("mention", recipient)
-            for recipient in recipients.matches_usernames(
-                self.content.extract_mentions()
-            ).exclude(pk=self.owner_id)
-        ]
+    def add_mentioned(self, resolver, recipients):
+        resolver.add(
+            "mention",
+            recipients.matches_usernames(self.content.extract_mentions()).exclude(
+                pk=self.owner_id
+            ),
+        )
+
+    def make_notifications(self, resolver):
+        return resolver.make_notifications(
+            content_object=self,
+            actor=self.owner,
+            community=self.community,
+        )
 
     def get_notification_recipients(self):
         return self.community.members.exclude(blocked=self.owner)
@@ -299,46 +307,50 @@ class Comment(TrackerModelMixin, TimeStampedModel):
 
     @notify
     def notify_on_create(self):
+        """Generates Notification instances for users:
+        - @mentioned users
+        - owner of the commented activity
+        - owner of the parent comment
+        - other commentors on the activity
+        - users following the comment owner
+
+        Each recipient receives at most one notification, in the order of
+        priority above. Recipients are resolved in a single query.
+
+        Returns:
+            list: Notification instances
+        """
         if (content_object := self.get_content_object()) is None:
             return []
 
-        notifications = []
+        resolver = RecipientResolver()
 
         recipients = self.get_notification_recipients()
-        notifications += self.notify_mentioned(recipients)
+        self.add_mentioned(resolver, recipients)
+
+        users = get_user_model()._default_manager
 
         # notify the activity owner
         if self.owner_id != content_object.owner_id:
-            notifications += [
-                self.make_notification("new_comment", content_object.owner)
-            ]
+            resolver.add("new_comment", users.filter(pk=content_object.owner_id))
 
         # notify the person being replied to
-
         if self.parent:
-            notifications += [self.make_notification("reply", self.parent.owner)]
+            resolver.add("reply", users.filter(pk=self.parent.owner_id))
 
         # notify anyone who has commented on this post, excluding
         # this comment owner and parent owner
-        other_commentors = (
-            recipients.filter(comment__in=content_object.get_comments())
-            .exclude(pk__in=(self.owner_id, content_object.owner_id))
-            .distinct()
-        )
+        other_commentors = recipients.filter(
+            comment__in=content_object.get_comments()
+        ).exclude(pk__in=(self.owner_id, content_object.owner_id))
+
         if self.parent:
-            other_commentors = other_commentors.exclude(pk=self.parent.owner.id)
+            other_commentors = other_commentors.exclude(pk=self.parent.owner_id)
 
-        notifications += [
-            self.make_notification("new_sibling", commentor)
-            for commentor in other_commentors
-        ]
-        notifications += [
-            self.make_notification("followed_user", follower)
-            for follower in recipients.filter(following=self.owner)
-            .exclude(pk__in=other_commentors)
-            .distinct()
-        ]
-        return takefirst(notifications, lambda n: n.recipient)
+        resolver.add("new_sibling", other_commentors)
+        resolver.add("followed_user", recipients.filter(following=self.owner))
+
+        return self.make_notifications(resolver)
 
     @notify
     def notify_on_update(self):
@@ -348,10 +360,9 @@ class Comment(TrackerModelMixin, TimeStampedModel):
         if not self.has_tracker_changed():
             return []
 
-        return takefirst(
-            self.notify_mentioned(self.get_notification_recipients()),
-            lambda n: n.recipient,
-        )
+        resolver = RecipientResolver()
+        self.add_mentioned(resolver, self.get_notification_recipients())
+        return self.make_notifications(resolver)
 
     @notify
     def notify_on_delete(self, moderator):
@@ -91,6 +91,28 @@ class TestCommentDetailView:
         notification.refresh_from_db()
         assert notification.is_read
 
+    def test_get_if_not_modified(self, client, member, locmem_cache):
+        comment = CommentFactory(
+            owner=member.member,
+            community=member.community,
+            content_object=PostFactory(community=member.community),
+        )
+        url = reverse("comments:detail", args=[comment.id])
+
+        etag = client.get(url)["ETag"]
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == http.HTTPStatus.NOT_MODIFIED
+
+        CommentFactory(
+            parent=comment,
+            community=member.community,
+            content_object=comment.content_object,
+        )
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == http.HTTPStatus.OK
+
     def test_get_if_no_content_object(self, client, member):
         comment = CommentFactory(
             owner=member.member,
@@ -5,6 +5,7 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.db import IntegrityError
+from django.db.models import Max
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.utils import timezone
@@ -16,13 +17,15 @@ from turbo_response import TurboFrame, redirect_303, render_form_response
 
 # Localhub
 from localhub.bookmarks.models import Bookmark
+from localhub.common.conditional import conditional_response
 from localhub.common.decorators import add_messages_to_response_header
 from localhub.common.forms import handle_form
 from localhub.common.pagination import render_paginated_queryset
+from localhub.communities.cache import get_content_version
 from localhub.communities.decorators import community_required
 from localhub.flags.views import handle_flag_create
 from localhub.likes.models import Like
-from localhub.users.utils import has_perm_or_403
+from localhub.users.utils import bump_state_versions, has_perm_or_403
 
 # Local
 from .forms import CommentForm
@@ -46,28 +49,52 @@ def comment_detail_view(request, pk):
     comment = get_comment_or_404(request, pk)
 
     if request.user.is_authenticated:
-        comment.get_notifications().for_recipient(request.user).unread().update(
-            is_read=True
-        )
-
-    context = {"comment": comment, "content_object": comment.get_content_object()}
-
-    if request.user.has_perm("communities.moderate_community", request.community):
+        if (
+            comment.get_notifications()
+            .for_recipient(request.user)
+            .unread()
+            .update(is_read=True)
+        ):
+            bump_state_versions(request.user.pk)
+
+    def _render():
+        context = {"comment": comment, "content_object": comment.get_content_object()}
+
+        if request.user.has_perm("communities.moderate_community", request.community):
+
+            context["flags"] = (
+                comment.get_flags()
+                .select_related("user", "community")
+                .prefetch_related("content_object")
+                .order_by("-created")
+            )
 
-        context["flags"] = (
-            comment.get_flags()
-            .select_related("user", "community")
-            .prefetch_related("content_object")
-            .order_by("-created")
+        context["replies"] = (
+            Comment.objects.none()
+            if comment.deleted
+            else get_comment_queryset(request)
+            .filter(parent=comment)
+            .order_by("created")
         )
 
-    context["replies"] = (
-        Comment.objects.none()
-        if comment.deleted
-        else get_comment_queryset(request).filter(parent=comment).order_by("created")
-    )
+        return TemplateResponse(request, "comments/comment_detail.html", context)
 
-    return TemplateResponse(request, "comments/comment_detail.html", context)
+    return conditional_response(
+        request,
+        _render,
+        last_modified=max(
+            filter(
+                None,
+                [
+                    comment.modified,
+                    Comment.objects.filter(parent=comment).aggregate(Max("modified"))[
+                        "modified__max"
+                    ],
+                ],
+            )
+        ),
+        version=[get_content_version(request.community.id)],
+    )
 
 
 @login_required
@@ -0,0 +1,109 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Conditional GET support for views. Validators are computed cheaply from
+the latest modified date of the rows shown in the page, plus any
+version numbers (e.g. the community content version). The viewer's state
+version and language are always included, as pages show viewer-specific
+content such as unread counts and likes.
+
+Last-Modified is not sent, as the latest modified date alone does not
+cover these versions: clients must revalidate with If-None-Match.
+"""
+
+# Standard Library
+import hashlib
+
+# Django
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+    quote_etag,
+)
+
+# Localhub
+from localhub.users.utils import get_state_version
+
+
+def make_etag(request, last_modified=None, version=None):
+    """
+    Args:
+        request (HttpRequest)
+        last_modified (datetime, optional)
+        version (list, optional): other values included in the ETag
+
+    Returns:
+        str: quoted ETag
+    """
+    parts = [
+        request.user.pk,
+        get_state_version(request.user),
+        request.LANGUAGE_CODE,
+        request.headers.get("Turbo-Frame", ""),
+        last_modified.isoformat() if last_modified else "",
+        *(version or []),
+    ]
+    return quote_etag(
+        hashlib.md5("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+    )
+
+
+def conditional_response(request, render, *, last_modified=None, version=None):
+    """Returns 304 Not Modified if the client already has the current page,
+    otherwise calls render() and adds ETag and cache headers.
+
+    Args:
+        request (HttpRequest)
+        render (callable): returns HttpResponse
+        last_modified (datetime, optional): latest modified date of content,
+            included in the ETag
+        version (list, optional): other values included in the ETag
+
+    Returns:
+        HttpResponse
+    """
+    if request.method not in ("GET", "HEAD"):
+        return render()
+
+    etag = make_etag(request, last_modified, version)
+
+    # headers are copied to the 304 response. If the client doesn't have
+    # the current page the same response is returned, and is discarded.
+    headers = patch_headers(request, HttpResponse(), etag)
+    if (
+        response := get_conditional_response(request, etag=etag, response=headers)
+    ) is not headers:
+        return response
+
+    response = render()
+
+    if response.status_code == 200:
+        patch_headers(request, response, etag)
+
+    return response
+
+
+def patch_headers(request, response, etag):
+    """Adds ETag and cache headers to response.
+
+    Args:
+        request (HttpRequest)
+        response (HttpResponse)
+        etag (str)
+
+    Returns:
+        HttpResponse
+    """
+    response["ETag"] = etag
+
+    # browsers should always check the page is current
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    patch_vary_headers(response, ("Cookie",))
+
+    return response
@@ -0,0 +1,36 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.utils.translation import gettext_lazy as _
+
+# Local
+from .deletion import get_deletion_progress
+
+
+class ChunkedDeletionAdminMixin:
+    """
+    Deletes objects with schedule_deletion() in a background task, rather
+    than with the Django delete collector. The confirmation page does not
+    list related objects, as collecting them is just as expensive.
+    """
+
+    def get_list_display(self, request):
+        return [*super().get_list_display(request), "deletion_progress"]
+
+    def get_deleted_objects(self, objs, request):
+        return [str(obj) for obj in objs], {}, set(), []
+
+    def delete_model(self, request, obj):
+        obj.schedule_deletion()
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            obj.schedule_deletion()
+
+    def deletion_progress(self, obj):
+        if progress := get_deletion_progress(self.model, obj.pk):
+            return _("%(count)d rows deleted") % {"count": sum(progress.values())}
+        return ""
+
+    deletion_progress.short_description = _("Deletion")
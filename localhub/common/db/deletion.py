@@ -0,0 +1,172 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Chunked deletion of objects with many related rows, e.g. user accounts
+and communities.
+
+Django's delete collector loads every related row into memory before
+deleting anything. Instead, related rows are deleted table by table in
+chunks of primary keys, starting with the rows furthest from the deleted
+object, so each chunk is small and committed separately:
+
+- reverse foreign keys (including many-to-many tables) with CASCADE are
+  deleted, and with SET_NULL are set to NULL
+- generic relations (likes, bookmarks, flags, notifications) and tags are
+  deleted by content type
+
+Rows already deleted are not loaded again, so an interrupted deletion can
+simply be run again to finish the job.
+
+Models can define a pre_bulk_delete(pks) classmethod for any other
+housekeeping before each chunk is deleted.
+"""
+
+# Django
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import InterfaceError, OperationalError, models, transaction
+from django.db.models.deletion import get_candidate_relations_to_delete
+
+# Third Party Libraries
+from taggit.managers import TaggableManager
+
+# deletion tasks are acknowledged only when finished, so are run again if
+# a worker is lost, and retried if the database is unavailable.
+DELETION_TASK_OPTIONS = {
+    "acks_late": True,
+    "autoretry_for": (InterfaceError, OperationalError),
+    "retry_backoff": True,
+    "retry_jitter": True,
+    "retry_kwargs": {"max_retries": 5},
+}
+
+
+def get_deletion_progress_key(model, pk):
+    return f"deletion:{model._meta.label_lower}:{pk}"
+
+
+def get_deletion_progress(model, pk):
+    """
+    Args:
+        model (Model class)
+        pk (int): primary key
+
+    Returns:
+        dict or None: number of rows deleted for each model label
+    """
+    return cache.get(get_deletion_progress_key(model, pk))
+
+
+def delete_in_chunks(queryset, *, batch_size=None, progress=None):
+    """Deletes all rows in queryset, and all related rows, in chunks.
+
+    Args:
+        queryset (QuerySet)
+        batch_size (int, optional): max rows in each chunk (default:
+            settings.DELETION_BATCH_SIZE)
+        progress (callable, optional): called with (model, num_deleted) after
+            each chunk is deleted, including chunks of related rows
+
+    Returns:
+        int: number of rows deleted from queryset
+    """
+    batch_size = batch_size or settings.DELETION_BATCH_SIZE
+    model = queryset.model
+    queryset = queryset.order_by()
+    num_deleted = 0
+
+    while pks := list(queryset.values_list("pk", flat=True)[:batch_size]):
+        delete_related(model, pks, batch_size=batch_size, progress=progress)
+
+        with transaction.atomic():
+            if pre_bulk_delete := getattr(model, "pre_bulk_delete", None):
+                pre_bulk_delete(pks)
+            _, deleted = model._base_manager.filter(pk__in=pks).delete()
+
+        count = deleted.get(model._meta.label, 0)
+        num_deleted += count
+
+        if progress:
+            progress(model, count)
+
+    return num_deleted
+
+
+def delete_related(model, pks, *, batch_size=None, progress=None):
+    """Deletes (or sets to NULL) rows related to objects, so objects can be
+    deleted without cascading.
+
+    Args:
+        model (Model class)
+        pks (list): primary keys of objects
+        batch_size (int, optional): max rows in each chunk
+        progress (callable, optional): see delete_in_chunks()
+    """
+    for relation in get_candidate_relations_to_delete(model._meta):
+        related_model = relation.related_model
+        filters = {f"{relation.field.name}__in": pks}
+
+        if relation.on_delete is models.CASCADE:
+            delete_in_chunks(
+                related_model._base_manager.filter(**filters),
+                batch_size=batch_size,
+                progress=progress,
+            )
+        elif relation.on_delete is models.SET_NULL:
+            related_model._base_manager.filter(**filters).update(
+                **{relation.field.name: None}
+            )
+
+    for field in [*model._meta.private_fields, *model._meta.many_to_many]:
+        if isinstance(field, GenericRelation):
+            queryset = field.remote_field.model._base_manager.filter(
+                **{
+                    field.content_type_field_name: ContentType.objects.get_for_model(
+                        model, for_concrete_model=field.for_concrete_model
+                    ),
+                    f"{field.object_id_field_name}__in": pks,
+                }
+            )
+        elif isinstance(field, TaggableManager):
+            # taggit does not delete tagged items with the object
+            queryset = field.through._base_manager.filter(
+                content_type=ContentType.objects.get_for_model(model),
+                object_id__in=pks,
+            )
+        else:
+            continue
+
+        delete_in_chunks(queryset, batch_size=batch_size, progress=progress)
+
+
+def delete_object_in_chunks(model, pk, *, batch_size=None):
+    """Deletes object and all related rows in chunks. The number of rows
+    deleted is stored, see get_deletion_progress().
+
+    Args:
+        model (Model class)
+        pk (int): primary key
+        batch_size (int, optional): max rows in each chunk
+
+    Returns:
+        bool: if object was deleted
+    """
+    key = get_deletion_progress_key(model, pk)
+    # keep counts from an earlier, interrupted run
+    deleted = cache.get(key) or {}
+
+    def _progress(related_model, count):
+        label = related_model._meta.label
+        deleted[label] = deleted.get(label, 0) + count
+        cache.set(key, deleted, settings.DELETION_PROGRESS_TIMEOUT)
+
+    return bool(
+        delete_in_chunks(
+            model._base_manager.filter(pk=pk),
+            batch_size=batch_size,
+            progress=_progress,
+        )
+    )
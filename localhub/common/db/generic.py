@@ -6,9 +6,13 @@ Functions for more efficient handling of ContentType related
 objects with querysets.
 """
 
+# Standard Library
+from collections import defaultdict
+
 # Django
-from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
 from django.db import models
 
 
@@ -34,6 +38,98 @@ class AbstractGenericRelation:
         relation.contribute_to_class(cls, name)
 
 
+class SelectRelatedGenericForeignKey(GenericForeignKey):
+    """
+    GenericForeignKey which joins related fields when prefetched with
+    prefetch_related(). Objects are fetched in one query per content type,
+    so a list of e.g. notifications can be rendered in a fixed number of
+    queries regardless of the number of rows.
+
+    Related fields not available on a particular model are ignored.
+
+    class Notification(Model):
+        content_object = SelectRelatedGenericForeignKey(
+            "content_type", "object_id", select_related=["owner", "community"]
+        )
+
+    Notification.objects.prefetch_related("content_object")
+    """
+
+    def __init__(
+        self,
+        ct_field="content_type",
+        fk_field="object_id",
+        select_related=None,
+        **kwargs,
+    ):
+        super().__init__(ct_field, fk_field, **kwargs)
+        self.select_related = select_related or []
+
+    def get_related_fields(self, model):
+        """Returns select_related fields available on the model.
+
+        Args:
+            model (Model): content object model class
+
+        Returns:
+            List[str]
+        """
+        fields = []
+        for name in self.select_related:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_one or field.one_to_one:
+                fields.append(name)
+        return fields
+
+    def get_prefetch_queryset(self, instances, queryset=None):
+        if queryset is not None:
+            raise ValueError("Custom queryset can't be used for this lookup.")
+
+        fk_dict = defaultdict(set)
+        instance_dict = {}
+
+        ct_attname = self.model._meta.get_field(self.ct_field).get_attname()
+
+        for instance in instances:
+            if (ct_id := getattr(instance, ct_attname)) is not None and (
+                fk_val := getattr(instance, self.fk_field)
+            ) is not None:
+                fk_dict[ct_id].add(fk_val)
+                instance_dict[ct_id] = instance
+
+        objects = []
+        for ct_id, fkeys in fk_dict.items():
+            model = self.get_content_type(
+                id=ct_id, using=instance_dict[ct_id]._state.db
+            ).model_class()
+            objects.extend(
+                model._base_manager.using(instance_dict[ct_id]._state.db)
+                .filter(pk__in=fkeys)
+                .select_related(*self.get_related_fields(model))
+            )
+
+        def gfk_key(obj):
+            if (ct_id := getattr(obj, ct_attname)) is None:
+                return None
+            model = self.get_content_type(id=ct_id, using=obj._state.db).model_class()
+            return (
+                model._meta.pk.get_prep_value(getattr(obj, self.fk_field)),
+                model,
+            )
+
+        return (
+            objects,
+            lambda obj: (obj.pk, obj.__class__),
+            gfk_key,
+            True,
+            self.name,
+            True,
+        )
+
+
 def get_generic_related_exists(
     model,
     related,
@@ -0,0 +1,98 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import contextlib
+import contextvars
+import random
+
+# Django
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# state of the current use_replicas() block, or None if outside a block
+_replicas = contextvars.ContextVar("replicas", default=None)
+
+# inside a use_primary() block
+_primary = contextvars.ContextVar("primary", default=False)
+
+
+def get_replica_aliases():
+    """
+    Returns:
+        List[str]: database aliases of configured replicas
+    """
+    return settings.DATABASE_REPLICAS
+
+
+def replicas_enabled():
+    """
+    Returns:
+        bool: if reads in current context are sent to replicas
+    """
+    return (
+        (state := _replicas.get()) is not None
+        and not state["written"]
+        and not _primary.get()
+        and bool(get_replica_aliases())
+    )
+
+
+def has_written():
+    """
+    Returns:
+        bool: if any writes made inside the current use_replicas() block
+    """
+    return (state := _replicas.get()) is not None and state["written"]
+
+
+@contextlib.contextmanager
+def use_replicas():
+    """Sends reads inside this block to replicas. Any write inside the block
+    pins all further reads to the primary, so we can always read our own
+    writes.
+    """
+    token = _replicas.set({"written": False})
+    try:
+        yield
+    finally:
+        _replicas.reset(token)
+
+
+@contextlib.contextmanager
+def use_primary():
+    """Sends all reads inside this block to the primary database."""
+    token = _primary.set(True)
+    try:
+        yield
+    finally:
+        _primary.reset(token)
+
+
+class ReplicaRouter:
+    """Sends reads to a random replica inside use_replicas() blocks, e.g.
+    safe requests wrapped by the ReplicaMiddleware. All other reads and all
+    writes go to the primary: this includes celery tasks and management
+    commands, which may run immediately after a write and so should not be
+    affected by replication lag.
+
+    Replicas are configured in settings.DATABASE_REPLICAS.
+    """
+
+    def db_for_read(self, model, **hints):
+        if replicas_enabled():
+            return random.choice(get_replica_aliases())
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # read-your-writes: stick to the primary for the rest of the block
+        if (state := _replicas.get()) is not None:
+            state["written"] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas have the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
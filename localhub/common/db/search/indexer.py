@@ -23,6 +23,10 @@ class SearchIndexer:
             ("A", "title"),
             ("B", "description")
         ))
+
+    The search document is updated when the instance is saved, unless the
+    instance has defer_search_index set to True, e.g. if the update is run
+    later in a celery task.
     """
 
     def __init__(self, *search_components, search_document_field="search_document"):
@@ -40,17 +44,40 @@ class SearchIndexer:
             ]
         ]
 
+    def get_search_document(self, instance):
+        return functools.reduce(operator.add, self.get_search_vectors(instance))
+
     def update_search_index(self, instance):
         self.cls.objects.filter(pk=instance.pk).update(
-            **{
-                self.search_document_field: functools.reduce(
-                    operator.add, self.get_search_vectors(instance)
-                )
-            }
+            **{self.search_document_field: self.get_search_document(instance)}
         )
 
+    def bulk_update_search_index(self, instances, batch_size=None):
+        """Updates search documents of many instances with a single UPDATE
+        for each batch.
+
+        Args:
+            instances (Iterable[Model]): saved instances
+            batch_size (int, optional): max instances per UPDATE (default: None)
+        """
+        # copies are used, so search document expressions are not left on
+        # the instances
+        documents = [
+            self.cls(
+                pk=instance.pk,
+                **{self.search_document_field: self.get_search_document(instance)},
+            )
+            for instance in instances
+        ]
+        if documents:
+            self.cls._default_manager.bulk_update(
+                documents, [self.search_document_field], batch_size=batch_size
+            )
+
     def finalize(self, sender, **kwargs):
         def update_search_document(instance, **kwargs):
+            if getattr(instance, "defer_search_index", False):
+                return
             transaction.on_commit(lambda: self.update_search_index(instance))
 
         models.signals.post_save.connect(
@@ -61,4 +88,6 @@ class SearchIndexer:
 
         self.cls = cls
 
+        setattr(cls, name, self)
+
         models.signals.class_prepared.connect(self.finalize, sender=cls, weak=False)
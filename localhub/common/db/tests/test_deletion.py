@@ -0,0 +1,139 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Third Party Libraries
+import pytest
+from taggit.models import TaggedItem
+
+# Localhub
+from localhub.activities.posts.factories import PostFactory
+from localhub.activities.posts.models import Post
+from localhub.bookmarks.factories import BookmarkFactory
+from localhub.bookmarks.models import Bookmark
+from localhub.comments.factories import CommentFactory
+from localhub.comments.models import Comment
+from localhub.communities.factories import CommunityFactory, MembershipFactory
+from localhub.communities.models import Community, Membership
+from localhub.likes.factories import LikeFactory
+from localhub.likes.models import Like
+from localhub.private_messages.factories import MessageFactory
+from localhub.private_messages.models import Message
+from localhub.users.factories import UserFactory
+
+# Local
+from ..deletion import delete_in_chunks, delete_object_in_chunks, get_deletion_progress
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("locmem_cache")]
+
+
+@pytest.fixture
+def user(community):
+    return MembershipFactory(community=community).member
+
+
+class TestDeleteInChunks:
+    def test_delete_user(self, community, user):
+        posts = PostFactory.create_batch(
+            3, community=community, owner=user, description="#spam"
+        )
+        other_post = PostFactory(community=community)
+
+        # comments by other users on user's posts are kept
+        comment = CommentFactory(content_object=posts[0], community=community)
+        CommentFactory.create_batch(
+            2, content_object=other_post, community=community, owner=user
+        )
+
+        # reply to user's comment is kept
+        reply = CommentFactory(
+            content_object=other_post,
+            community=community,
+            parent=Comment.objects.filter(owner=user).first(),
+        )
+
+        LikeFactory(content_object=posts[1], community=community, recipient=user)
+        LikeFactory(content_object=other_post, community=community, user=user)
+        BookmarkFactory(content_object=posts[2], community=community)
+        MessageFactory(community=community, sender=user)
+
+        user.following.add(other_post.owner)
+        user.following_tags.add(*TaggedItem.objects.values_list("tag", flat=True)[:1])
+
+        progress = []
+
+        num_deleted = delete_in_chunks(
+            type(user).objects.filter(pk=user.id),
+            batch_size=2,
+            progress=lambda model, count: progress.append((model, count)),
+        )
+
+        assert num_deleted == 1
+
+        assert not Post.objects.filter(owner=user).exists()
+        assert not Comment.objects.filter(owner=user).exists()
+        assert not Like.objects.exists()
+        assert not Bookmark.objects.exists()
+        assert not Message.objects.exists()
+        assert not Membership.objects.filter(member=user).exists()
+        assert not TaggedItem.objects.filter(
+            object_id__in=[post.id for post in posts]
+        ).exists()
+
+        assert Post.objects.filter(pk=other_post.id).exists()
+        assert other_post.owner.followers.count() == 0
+
+        comment.refresh_from_db()
+        assert comment.content_object is None
+
+        reply.refresh_from_db()
+        assert reply.parent is None
+
+        # posts deleted in chunks of 2
+        assert [count for model, count in progress if model is Post] == [2, 1]
+
+    def test_delete_community(self, community, user):
+        post = PostFactory(community=community, owner=user)
+        CommentFactory(content_object=post, community=community)
+        LikeFactory(content_object=post, community=community)
+
+        other = PostFactory(community=CommunityFactory(), owner=user)
+
+        assert delete_in_chunks(Community.objects.filter(pk=community.id)) == 1
+
+        assert not Post.objects.filter(pk=post.id).exists()
+        assert not Comment.objects.exists()
+        assert not Like.objects.exists()
+        assert not Membership.objects.filter(community=community).exists()
+
+        assert Post.objects.filter(pk=other.id).exists()
+
+    def test_delete_if_empty(self):
+        assert delete_in_chunks(Post.objects.all()) == 0
+
+
+class TestDeleteObjectInChunks:
+    def test_delete(self, community, user):
+        PostFactory.create_batch(3, community=community, owner=user)
+
+        assert delete_object_in_chunks(type(user), user.id, batch_size=2)
+
+        progress = get_deletion_progress(type(user), user.id)
+        assert progress[Post._meta.label] == 3
+        assert progress[type(user)._meta.label] == 1
+
+    def test_resume(self, community, user):
+        PostFactory.create_batch(3, community=community, owner=user)
+
+        # first run interrupted after deleting some posts
+        delete_in_chunks(
+            Post.objects.filter(pk=Post.objects.filter(owner=user).first().pk)
+        )
+
+        assert delete_object_in_chunks(type(user), user.id)
+        assert not Post.objects.filter(owner=user).exists()
+
+    def test_already_deleted(self):
+        user = UserFactory()
+        user.delete()
+
+        assert not delete_object_in_chunks(type(user), user.id)
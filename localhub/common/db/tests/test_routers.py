@@ -0,0 +1,62 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.db import DEFAULT_DB_ALIAS
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.posts.models import Post
+
+# Local
+from ..routers import ReplicaRouter, has_written, use_primary, use_replicas
+
+
+@pytest.fixture
+def router():
+    return ReplicaRouter()
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_0"]
+
+
+class TestReplicaRouter:
+    def test_db_for_read_outside_block(self, router, replicas):
+        assert router.db_for_read(Post) == DEFAULT_DB_ALIAS
+
+    def test_db_for_read_if_no_replicas(self, router, settings):
+        settings.DATABASE_REPLICAS = []
+        with use_replicas():
+            assert router.db_for_read(Post) == DEFAULT_DB_ALIAS
+
+    def test_db_for_read_in_block(self, router, replicas):
+        with use_replicas():
+            assert router.db_for_read(Post) == "replica_0"
+        assert router.db_for_read(Post) == DEFAULT_DB_ALIAS
+
+    def test_db_for_read_if_use_primary(self, router, replicas):
+        with use_replicas():
+            with use_primary():
+                assert router.db_for_read(Post) == DEFAULT_DB_ALIAS
+            assert router.db_for_read(Post) == "replica_0"
+
+    def test_db_for_read_after_write(self, router, replicas):
+        with use_replicas():
+            assert not has_written()
+            assert router.db_for_write(Post) == DEFAULT_DB_ALIAS
+            assert has_written()
+            assert router.db_for_read(Post) == DEFAULT_DB_ALIAS
+
+    def test_db_for_read_after_write_in_use_primary(self, router, replicas):
+        with use_replicas():
+            with use_primary():
+                router.db_for_write(Post)
+            assert router.db_for_read(Post) == DEFAULT_DB_ALIAS
+
+    def test_allow_migrate(self, router):
+        assert router.allow_migrate(DEFAULT_DB_ALIAS, "posts")
+        assert not router.allow_migrate("replica_0", "posts")
@@ -0,0 +1,82 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.photos.models import Photo
+from localhub.activities.posts.models import Post
+from localhub.comments.factories import CommentFactory
+from localhub.comments.models import Comment
+
+pytestmark = pytest.mark.django_db
+
+
+class TestTrackerModelMixin:
+    def test_new_instance(self):
+        assert Post(title="test").has_tracker_changed()
+
+    def test_loaded_instance(self, post):
+        post = Post.objects.get(pk=post.id)
+        assert not post.has_tracker_changed()
+
+    def test_changed(self, post):
+        post = Post.objects.get(pk=post.id)
+        post.description = "changed"
+        assert post.has_tracker_changed()
+        assert post.has_tracker_changed(["description"])
+        assert not post.has_tracker_changed(["title"])
+
+    def test_changed_back(self, post):
+        post = Post.objects.get(pk=post.id)
+        description = post.description
+        post.description = "changed"
+        post.description = description
+        assert not post.has_tracker_changed()
+
+    def test_does_not_keep_values_if_unchanged(self, post):
+        post = Post.objects.get(pk=post.id)
+        assert post._tracked_values is None
+
+        post.description = "changed"
+        assert list(post._tracked_values) == ["description"]
+
+    def test_deferred_fields(self, post):
+        post = Post.objects.only("id", "title").get(pk=post.id)
+        assert not post.has_tracker_changed(["title"])
+        post.title = "changed"
+        assert post.has_tracker_changed(["title"])
+
+    def test_load_deferred_field(self, post):
+        post = Post.objects.only("id", "description").get(pk=post.id)
+        post.description = "changed"
+        # loads title, should not reset description
+        assert post.title
+        assert not post.has_tracker_changed(["title"])
+        assert post.has_tracker_changed(["description"])
+
+    def test_set_deferred_field(self, post):
+        title = post.title
+        post = Post.objects.only("id", "description").get(pk=post.id)
+        # original value not known, so assumed changed
+        post.title = title
+        assert post.has_tracker_changed(["title"])
+
+    def test_refresh_from_db(self, post):
+        post = Post.objects.get(pk=post.id)
+        post.title = "changed"
+        post.refresh_from_db()
+        assert not post.has_tracker_changed()
+
+    def test_image_field(self, photo):
+        photo = Photo.objects.get(pk=photo.id)
+        assert not photo.has_tracker_changed(["image"])
+        photo.image = "other.jpg"
+        assert photo.has_tracker_changed(["image"])
+
+    def test_reset_tracker(self):
+        comment = Comment.objects.get(pk=CommentFactory().id)
+        comment.content = "changed"
+        comment.reset_tracker()
+        assert not comment.has_tracker_changed()
@@ -1,6 +1,14 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Standard Library
+import inspect
+
+# Django
+from django.db.models import DEFERRED
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
+
 
 class TrackerModelMixin:
     """Django Model Mixin allowing simple tracking of
@@ -37,6 +45,10 @@ class TrackerModelMixin:
     # comment.refresh_from_db() also has same effect...
     comment.reset_tracker()
     comment.has_tracker_changed() -> False
+
+    Values are not copied when instances are loaded, as most instances
+    (e.g. in list pages) are never changed: instead the original value of
+    a tracked field is kept when the field is first set.
     """
 
     # would be nice to be able to do this in Meta...
@@ -45,12 +57,8 @@ class TrackerModelMixin:
     @classmethod
     def from_db(cls, db, field_names, values):
         new = super(TrackerModelMixin, cls).from_db(db, field_names, values)
-        new._tracked_values = {
-            field: values[field_names.index(field)]
-            for field in cls.tracked_fields
-            if field in field_names
-        }
-
+        # values are only copied when first changed (see TrackedFieldDescriptor)
+        new._tracked_values = None
         return new
 
     def refresh_from_db(self, using=None, fields=None):
@@ -64,9 +72,11 @@ class TrackerModelMixin:
             fields (Iterable, optional): list of fields to reset. If None, then
                 resets tracker on all tracked fields (default: None)
         """
-        self._tracked_values = {
-            field: getattr(self, field) for field in fields or self.tracked_fields
-        }
+        if fields is None or not getattr(self, "_tracked_values", None):
+            self._tracked_values = None
+            return
+        for field in fields:
+            self._tracked_values.pop(field, None)
 
     def has_tracker_changed(self, fields=None):
         """Checks if fields are dirty i.e. have changed since last DB load.
@@ -83,7 +93,54 @@ class TrackerModelMixin:
         """
         if not hasattr(self, "_tracked_values"):
             return True
+        if not self._tracked_values:
+            return False
         for field in fields or self.tracked_fields:
-            if getattr(self, field) != self._tracked_values[field]:
+            if (
+                field in self._tracked_values
+                and getattr(self, field) != self._tracked_values[field]
+            ):
                 return True
         return False
+
+    def _save_tracked_value(self, field):
+        if self._tracked_values is None:
+            self._tracked_values = {}
+        if field not in self._tracked_values:
+            # deferred fields always appear changed if set before loaded
+            self._tracked_values[field] = self.__dict__.get(field, DEFERRED)
+
+
+class TrackedFieldDescriptor:
+    """Wraps the descriptor of a tracked field, saving the original value
+    when the field is first set after the instance is loaded.
+
+    Args:
+        field (str): field name
+        descriptor (object): original descriptor of the field
+    """
+
+    def __init__(self, field, descriptor):
+        self.field = field
+        self.descriptor = descriptor
+
+    def __get__(self, instance=None, owner=None):
+        return self.descriptor.__get__(instance, owner)
+
+    def __set__(self, instance, value):
+        if instance.__dict__.get("_tracked_values", DEFERRED) is not DEFERRED:
+            instance._save_tracked_value(self.field)
+        if hasattr(self.descriptor, "__set__"):
+            self.descriptor.__set__(instance, value)
+        else:
+            instance.__dict__[self.field] = value
+
+
+@receiver(class_prepared)
+def add_tracked_field_descriptors(sender, **kwargs):
+    if not issubclass(sender, TrackerModelMixin):
+        return
+    for field in sender.tracked_fields:
+        descriptor = inspect.getattr_static(sender, field)
+        if not isinstance(descriptor, TrackedFieldDescriptor):
+            setattr(sender, field, TrackedFieldDescriptor(field, descriptor))
@@ -8,10 +8,13 @@ Custom functionality for the Markdownx field.
 This provides additional methods on the field:
 
 - obj.description.markdown() -> returns safe HTML string
-- obj.description.extract_mentions() -> returns set of "@" mention strings
-- obj.description.extract_hashtags() -> returns set of "#" tag strings
+- obj.description.extract_mentions() -> returns frozenset of "@" mention strings
+- obj.description.extract_hashtags() -> returns frozenset of "#" tag strings
 """
 
+# Standard Library
+import functools
+
 # Django
 from django.template.defaultfilters import striptags
 from django.utils.safestring import mark_safe
@@ -20,37 +23,77 @@ from django.utils.safestring import mark_safe
 from markdownx.models import MarkdownxField
 
 # Localhub
-from localhub.hashtags.utils import extract_hashtags
-from localhub.users.utils import extract_mentions
+from localhub.common.utils.tokenizer import tokenize
 
 # Local
 from .utils import markdownify
 from .widget import TypeaheadMarkdownWidget
 
 
+def memoize(method):
+    """Caches result of MarkdownProxy method on the proxy."""
+
+    # must not be the method name, or the value would hide the method
+    key = f"_{method.__name__}"
+
+    @functools.wraps(method)
+    def _wrapper(self):
+        try:
+            return self.__dict__[key]
+        except KeyError:
+            value = self.__dict__[key] = method(self)
+            return value
+
+    return _wrapper
+
+
 class MarkdownProxy(str):
+    """Markdown content with derived values. Values are calculated on
+    first access, and kept as long as the proxy, so mutable values are
+    returned as immutable types.
+    """
+
+    @memoize
     def markdown(self):
         return mark_safe(markdownify(self))
 
+    @memoize
+    def tokens(self):
+        return tokenize(self)
+
+    @memoize
     def extract_mentions(self):
-        return extract_mentions(self)
+        return frozenset(self.tokens().mentions)
 
+    @memoize
     def extract_hashtags(self):
-        return extract_hashtags(self)
+        return frozenset(self.tokens().hashtags)
 
+    @memoize
     def plaintext(self):
         return striptags(self.markdown()).strip()
 
 
 class MarkdownFieldDescriptor:
+    """Returns field value as MarkdownProxy. The proxy is kept on the
+    instance until the field is set again, so derived values are only
+    calculated once per instance.
+    """
+
     def __init__(self, field):
         self.field = field
 
     def __get__(self, instance=None, owner=None):
-        value = instance.__dict__[self.field] if instance else None
-        if value is None:
+        if instance is None:
             return None
-        return MarkdownProxy(value)
+        if self.field not in instance.__dict__:
+            # deferred field
+            instance.refresh_from_db(fields=[self.field])
+        value = instance.__dict__[self.field]
+        if value is None or isinstance(value, MarkdownProxy):
+            return value
+        value = instance.__dict__[self.field] = MarkdownProxy(value)
+        return value
 
     def __set__(self, instance, value):
         instance.__dict__[self.field] = value
@@ -1,3 +1,6 @@
+# Standard Library
+from collections import Counter
+
 # Django
 from django.utils.encoding import force_str
 
@@ -6,6 +9,9 @@ import pytest
 
 # Localhub
 from localhub.activities.posts.factories import PostFactory
+from localhub.activities.posts.models import Post
+from localhub.comments.factories import CommentFactory
+from localhub.common.markdown import fields
 
 pytestmark = pytest.mark.django_db
 
@@ -18,3 +24,69 @@ class TestMarkdownField:
     def test_extract_mentions(self):
         post = PostFactory(description="hello @danjac")
         assert "danjac" in post.description.extract_mentions()
+
+    def test_proxy_is_cached(self):
+        post = PostFactory(description="# test")
+        assert post.description is post.description
+
+    def test_markdown_is_memoized(self, mocker):
+        markdownify = mocker.spy(fields, "markdownify")
+        post = PostFactory(description="# test")
+        post.description.markdown()
+        post.description.markdown()
+        post.description.plaintext()
+        assert markdownify.call_count == 1
+
+    def test_set_value(self):
+        post = PostFactory(description="# test")
+        post.description.markdown()
+        post.description = "# other"
+        assert force_str(post.description.markdown()) == "<h1>other</h1>"
+
+    def test_none(self):
+        post = PostFactory()
+        post.description = None
+        assert post.description is None
+
+    def test_deferred(self):
+        post = PostFactory(description="# test")
+        post = Post.objects.only("id").get(pk=post.id)
+        assert post.description == "# test"
+
+    def test_tokens_are_memoized(self, mocker, user):
+        post = Post.objects.get(pk=PostFactory(description="#movies").id)
+        tokenize = mocker.spy(fields, "tokenize")
+
+        post.save_tags(is_new=True)
+        post.is_content_sensitive(user)
+        post.is_content_sensitive(user)
+        post.extract_hashtags()
+
+        # community content warning tags are also extracted
+        counts = Counter(call.args[0] for call in tokenize.call_args_list)
+        assert counts["#movies"] == 1
+
+
+class TestMarkdownFieldPerRequest:
+    def test_parse_once_per_field(self, client, member, mocker):
+        markdownify = mocker.spy(fields, "markdownify")
+
+        post = PostFactory(
+            community=member.community,
+            owner=member.member,
+            description="#movies @someone",
+        )
+        for _ in range(3):
+            CommentFactory(
+                content_object=post,
+                community=member.community,
+                owner=member.member,
+                content="#movies",
+            )
+
+        response = client.get(post.get_absolute_url())
+        assert response.status_code == 200
+
+        # post description and each comment parsed once
+        counts = Counter(call.args[0] for call in markdownify.call_args_list)
+        assert counts == {"#movies @someone": 1, "#movies": 3}
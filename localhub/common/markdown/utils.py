@@ -19,8 +19,8 @@ from bleach.linkifier import TLDS, LinkifyFilter, build_url_re
 from markdownx.utils import markdownify as default_markdownify
 
 # Localhub
-from localhub.hashtags.utils import linkify_hashtags
-from localhub.users.utils import linkify_mentions
+from localhub.common.metrics import MARKDOWN_LATENCY
+from localhub.common.utils.tokenizer import tokenize
 
 ALLOWED_TAGS = bleach.ALLOWED_TAGS + [
     "abbr",
@@ -101,9 +101,12 @@ def markdownify(content):
     - Restricts permitted HTML tags to safer subset
 
     """
-    return cleaner.clean(
-        default_markdownify(linkify_hashtags(linkify_mentions(content)))
-    )
+    with MARKDOWN_LATENCY.time():
+        return cleaner.clean(
+            default_markdownify(
+                tokenize(content, linkify_hashtags=True, linkify_mentions=True).text
+            )
+        )
 
 
 cleaner = Cleaner(
@@ -0,0 +1,159 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Prometheus metrics for web and celery hot paths.
+
+If running more than one process (e.g. gunicorn workers or a celery
+prefork pool) the PROMETHEUS_MULTIPROC_DIR environment variable should be
+set to a directory shared by these processes, and cleared on startup.
+Metrics from all processes are then collected by get_registry().
+"""
+
+# Standard Library
+import os
+import time
+
+# Third Party Libraries
+from celery import signals
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+
+REQUEST_LATENCY = Histogram(
+    "localhub_request_latency_seconds",
+    "Request latency by URL name",
+    ["view", "method"],
+)
+
+SEARCH_LATENCY = Histogram(
+    "localhub_search_latency_seconds",
+    "Latency of requests with a search query, by URL name",
+    ["view"],
+)
+
+NOTIFY_RECIPIENTS = Histogram(
+    "localhub_notify_recipients",
+    "Number of notifications dispatched by each @notify call",
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, float("inf")),
+)
+
+NOTIFY_LATENCY = Histogram(
+    "localhub_notify_latency_seconds",
+    "Time to resolve, save and dispatch notifications in each @notify call",
+)
+
+PUBLISH_STAGE_LATENCY = Histogram(
+    "localhub_publish_stage_latency_seconds",
+    "Run time of each stage of the activity publish pipeline",
+    ["stage"],
+)
+
+SEND_LATENCY = Histogram(
+    "localhub_send_latency_seconds",
+    "Notification send latency by channel (emails are queued, see "
+    "localhub_email_enqueue_latency_seconds)",
+    ["channel"],
+)
+
+# emails are only queued when sent: delivery is run in the
+# djcelery_email_send_multiple task, see TASK_LATENCY
+EMAIL_ENQUEUE_LATENCY = Histogram(
+    "localhub_email_enqueue_latency_seconds",
+    "Time to render notification emails and queue them for delivery",
+)
+
+SEND_FAILURES = Counter(
+    "localhub_send_failures",
+    "Notification send failures by channel",
+    ["channel"],
+)
+
+MARKDOWN_LATENCY = Histogram(
+    "localhub_markdown_latency_seconds",
+    "Markdown render time",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, float("inf")),
+)
+
+SCRAPER_LATENCY = Histogram(
+    "localhub_scraper_latency_seconds",
+    "HTML scraper fetch time",
+)
+
+TASK_LATENCY = Histogram(
+    "localhub_task_latency_seconds",
+    "Celery task run time",
+    ["task"],
+)
+
+TASK_QUEUE_WAIT = Histogram(
+    "localhub_task_queue_wait_seconds",
+    "Time between a celery task being sent and starting to run",
+    ["task"],
+)
+
+TASK_FAILURES = Counter(
+    "localhub_task_failures",
+    "Celery task failures",
+    ["task"],
+)
+
+
+def get_registry():
+    """Returns registry with metrics from all processes if running in
+    multiprocess mode, otherwise the default registry.
+
+    Returns:
+        CollectorRegistry
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+# task start times, by task id
+_task_started = {}
+
+
+@signals.before_task_publish.connect
+def add_task_sent_header(headers=None, **kwargs):
+    if headers is not None:
+        headers["sent_at"] = time.time()
+
+
+@signals.task_prerun.connect
+def record_task_started(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+    sent_at = getattr(task.request, "sent_at", None) or (
+        task.request.headers or {}
+    ).get("sent_at")
+
+    if sent_at:
+        TASK_QUEUE_WAIT.labels(task.name).observe(max(time.time() - sent_at, 0))
+
+
+@signals.task_postrun.connect
+def record_task_finished(task_id=None, task=None, **kwargs):
+    if (started := _task_started.pop(task_id, None)) is not None:
+        TASK_LATENCY.labels(task.name).observe(time.perf_counter() - started)
+
+
+@signals.task_failure.connect
+def record_task_failure(sender=None, **kwargs):
+    TASK_FAILURES.labels(sender.name).inc()
+
+
+@signals.worker_ready.connect
+def start_worker_metrics_server(**kwargs):
+    # celery workers don't serve HTTP, so run a metrics server if a port
+    # is provided
+    if port := os.environ.get("CELERY_METRICS_PORT"):
+        start_http_server(int(port), registry=get_registry())
@@ -0,0 +1,37 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import time
+
+# Localhub
+from localhub.common.metrics import REQUEST_LATENCY, SEARCH_LATENCY
+
+
+class MetricsMiddleware:
+    """
+    Records request latency by URL name. Requests which do not resolve to a
+    URL (e.g. 404s) are recorded as "unresolved", to avoid unbounded label
+    values.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        view_name = (
+            request.resolver_match.view_name
+            if getattr(request, "resolver_match", None)
+            else "unresolved"
+        )
+
+        REQUEST_LATENCY.labels(view_name, request.method).observe(elapsed)
+
+        if getattr(request, "search", None):
+            SEARCH_LATENCY.labels(view_name).observe(elapsed)
+
+        return response
@@ -0,0 +1,292 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import collections
+import contextlib
+import contextvars
+import cProfile
+import dataclasses
+import functools
+import json
+import logging
+import os
+import random
+import re
+import time
+
+# Django
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template
+
+# Third Party Libraries
+import requests
+
+logger = logging.getLogger(__name__)
+
+# profile of the current request, or None if not profiling
+_current_profile = contextvars.ContextVar("current_profile", default=None)
+
+_sql_literals_re = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_sql_placeholders_re = re.compile(r"%s(?:\s*,\s*%s)+")
+_whitespace_re = re.compile(r"\s+")
+
+
+def get_fingerprint(sql):
+    """Normalizes SQL so queries differing only in their parameters have
+    the same fingerprint, e.g. the same query run for each item in a list.
+
+    Args:
+        sql (str)
+
+    Returns:
+        str
+    """
+    sql = _sql_literals_re.sub("%s", sql)
+    sql = _sql_placeholders_re.sub("%s, ...", sql)
+    return _whitespace_re.sub(" ", sql).strip()
+
+
+@dataclasses.dataclass
+class RequestProfile:
+    """Metrics collected for a single request. All times are in
+    milliseconds.
+    """
+
+    started: float = dataclasses.field(default_factory=time.perf_counter)
+
+    queries: int = 0
+    query_time: float = 0
+    fingerprints: collections.Counter = dataclasses.field(
+        default_factory=collections.Counter
+    )
+
+    template_time: float = 0
+    template_depth: int = 0
+
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    http_requests: int = 0
+    http_time: float = 0
+
+    @property
+    def total_time(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def get_duplicate_queries(self, limit=5):
+        """
+        Args:
+            limit (int, optional): max number of fingerprints (default: 5)
+
+        Returns:
+            List[Tuple[str, int]]: most common repeated fingerprints with counts
+        """
+        return [
+            (fingerprint, count)
+            for fingerprint, count in self.fingerprints.most_common(limit)
+            if count > 1
+        ]
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper: see connection.execute_wrapper()."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += (time.perf_counter() - start) * 1000
+            self.fingerprints[get_fingerprint(sql)] += 1
+
+    def get_server_timing(self):
+        """
+        Returns:
+            str: Server-Timing header value
+        """
+        return ", ".join(
+            [
+                f'db;dur={self.query_time:.1f};desc="{self.queries} queries"',
+                f"tpl;dur={self.template_time:.1f}",
+                f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+                f'http;dur={self.http_time:.1f};desc="{self.http_requests} requests"',
+                f"total;dur={self.total_time:.1f}",
+            ]
+        )
+
+    def as_dict(self):
+        return {
+            "queries": self.queries,
+            "query_time": round(self.query_time, 1),
+            "duplicate_queries": self.get_duplicate_queries(),
+            "template_time": round(self.template_time, 1),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "http_requests": self.http_requests,
+            "http_time": round(self.http_time, 1),
+            "total_time": round(self.total_time, 1),
+        }
+
+
+def _profile_template_render(render):
+    @functools.wraps(render)
+    def wrapper(self, *args, **kwargs):
+        if (profile := _current_profile.get()) is None:
+            return render(self, *args, **kwargs)
+
+        # includes and render_to_string() calls inside template tags are
+        # rendered inside the outer template, so only time the outermost
+        profile.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            profile.template_depth -= 1
+            if not profile.template_depth:
+                profile.template_time += (time.perf_counter() - start) * 1000
+
+    return wrapper
+
+
+def _profile_cache_get(get):
+    missing = object()
+
+    @functools.wraps(get)
+    def wrapper(self, key, default=None, *args, **kwargs):
+        if (profile := _current_profile.get()) is None:
+            return get(self, key, default, *args, **kwargs)
+
+        value = get(self, key, missing, *args, **kwargs)
+        if value is missing:
+            profile.cache_misses += 1
+            return default
+
+        profile.cache_hits += 1
+        return value
+
+    return wrapper
+
+
+def _profile_cache_get_many(get_many):
+    @functools.wraps(get_many)
+    def wrapper(self, keys, *args, **kwargs):
+        values = get_many(self, keys, *args, **kwargs)
+        if (profile := _current_profile.get()) is not None:
+            keys = list(keys)
+            profile.cache_hits += len(values)
+            profile.cache_misses += len(keys) - len(values)
+        return values
+
+    return wrapper
+
+
+def _profile_http_send(send):
+    @functools.wraps(send)
+    def wrapper(self, *args, **kwargs):
+        if (profile := _current_profile.get()) is None:
+            return send(self, *args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return send(self, *args, **kwargs)
+        finally:
+            profile.http_requests += 1
+            profile.http_time += (time.perf_counter() - start) * 1000
+
+    return wrapper
+
+
+def _patch(cls, name, decorator):
+    method = getattr(cls, name)
+    if not getattr(method, "_profiled", False):
+        method = decorator(method)
+        method._profiled = True
+        setattr(cls, name, method)
+
+
+def install_instrumentation():
+    """Wraps template rendering, cache lookups and outbound HTTP requests
+    (made with the requests library) so they are recorded in the current
+    request profile. Safe to call more than once.
+    """
+    _patch(Template, "render", _profile_template_render)
+    _patch(requests.Session, "send", _profile_http_send)
+
+    for alias in settings.CACHES:
+        cache_cls = type(caches[alias])
+        _patch(cache_cls, "get", _profile_cache_get)
+        _patch(cache_cls, "get_many", _profile_cache_get_many)
+
+
+class ProfilingMiddleware:
+    """
+    Records database queries, duplicate query fingerprints, template render
+    time, cache hits and misses and outbound HTTP time for each request.
+
+    Metrics are added to the response as a Server-Timing header, and logged
+    as JSON for a sample (PROFILING_LOG_SAMPLE_RATE) of requests.
+
+    If PROFILING_CPROFILE_THRESHOLD is set, requests are run under cProfile
+    and stats for requests taking longer than the threshold (in
+    milliseconds) are dumped to PROFILING_CPROFILE_DIR.
+
+    Only enabled if PROFILING_ENABLED is set, as the instrumentation adds
+    some overhead to every request.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        install_instrumentation()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+
+                if settings.PROFILING_CPROFILE_THRESHOLD:
+                    response = self.get_response_with_cprofile(request, profile)
+                else:
+                    response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+
+        response["Server-Timing"] = profile.get_server_timing()
+
+        if random.random() < settings.PROFILING_LOG_SAMPLE_RATE:
+            logger.info(
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        **profile.as_dict(),
+                    }
+                )
+            )
+        return response
+
+    def get_response_with_cprofile(self, request, profile):
+        profiler = cProfile.Profile()
+        response = profiler.runcall(self.get_response, request)
+
+        if profile.total_time > settings.PROFILING_CPROFILE_THRESHOLD:
+            filename = os.path.join(
+                settings.PROFILING_CPROFILE_DIR,
+                "{}-{}.prof".format(
+                    int(time.time() * 1000),
+                    request.path.strip("/").replace("/", "-") or "index",
+                ),
+            )
+            os.makedirs(settings.PROFILING_CPROFILE_DIR, exist_ok=True)
+            profiler.dump_stats(filename)
+            logger.info("Profile for %s saved to %s", request.path, filename)
+
+        return response
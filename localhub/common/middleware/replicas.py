@@ -0,0 +1,46 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.conf import settings
+
+# Localhub
+from localhub.common.db.routers import has_written, use_primary, use_replicas
+
+
+class ReplicaMiddleware:
+    """
+    Sends database reads in safe (GET, HEAD, OPTIONS) requests to replicas.
+
+    Requests which write to the database set a cookie, so the user's
+    following requests stick to the primary for REPLICA_STICKY_SECONDS and
+    they always see their own changes, regardless of replication lag.
+    """
+
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+    cookie_name = "use_primary"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with use_replicas():
+            if (
+                request.method in self.safe_methods
+                and self.cookie_name not in request.COOKIES
+            ):
+                response = self.get_response(request)
+            else:
+                with use_primary():
+                    response = self.get_response(request)
+            is_write = has_written()
+
+        if is_write and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                self.cookie_name,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
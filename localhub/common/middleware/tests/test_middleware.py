@@ -2,14 +2,28 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 # Django
-from django.http import HttpResponseNotAllowed
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse, HttpResponseNotAllowed
+from django.shortcuts import render
 from django.test import override_settings
 
 # Third Party Libraries
 import pytest
+import requests
+from prometheus_client import REGISTRY
+
+# Localhub
+from localhub.activities.posts.models import Post
+from localhub.common.db.routers import ReplicaRouter
+from localhub.users.models import User
 
 # Local
 from ..http import HttpResponseNotAllowedMiddleware
+from ..metrics import MetricsMiddleware
+from ..profiling import ProfilingMiddleware, get_fingerprint
+from ..replicas import ReplicaMiddleware
 
 pytestmark = pytest.mark.django_db
 
@@ -45,3 +59,155 @@ class TestHttpResponseNotAllowedMiddleware:
         with override_settings(DEBUG=False):
             resp = mw(req)
             assert b"Not Allowed" not in resp.content
+
+
+class TestReplicaMiddleware:
+    @pytest.fixture
+    def replicas(self, settings):
+        settings.DATABASE_REPLICAS = ["replica_0"]
+
+    def get_response(self, write=False):
+        router = ReplicaRouter()
+
+        def _get_response(req):
+            if write:
+                router.db_for_write(Post)
+            return HttpResponse(router.db_for_read(Post))
+
+        return _get_response
+
+    def test_get(self, rf, replicas):
+        resp = ReplicaMiddleware(self.get_response())(rf.get("/"))
+        assert resp.content == b"replica_0"
+        assert "use_primary" not in resp.cookies
+
+    def test_get_if_write(self, rf, replicas):
+        resp = ReplicaMiddleware(self.get_response(write=True))(rf.get("/"))
+        assert resp.content == DEFAULT_DB_ALIAS.encode()
+        assert "use_primary" in resp.cookies
+
+    def test_get_if_cookie(self, rf, replicas):
+        req = rf.get("/")
+        req.COOKIES["use_primary"] = "1"
+        resp = ReplicaMiddleware(self.get_response())(req)
+        assert resp.content == DEFAULT_DB_ALIAS.encode()
+        assert "use_primary" not in resp.cookies
+
+    def test_post(self, rf, replicas):
+        resp = ReplicaMiddleware(self.get_response(write=True))(rf.post("/"))
+        assert resp.content == DEFAULT_DB_ALIAS.encode()
+        assert resp.cookies["use_primary"]["max-age"] == 10
+
+    def test_post_if_no_write(self, rf, replicas):
+        resp = ReplicaMiddleware(self.get_response())(rf.post("/"))
+        assert resp.content == DEFAULT_DB_ALIAS.encode()
+        assert "use_primary" not in resp.cookies
+
+    def test_post_if_no_replicas(self, rf, settings):
+        settings.DATABASE_REPLICAS = []
+        resp = ReplicaMiddleware(self.get_response(write=True))(rf.post("/"))
+        assert "use_primary" not in resp.cookies
+
+
+class TestGetFingerprint:
+    def test_params(self):
+        assert get_fingerprint(
+            "SELECT * FROM users_user WHERE id = %s"
+        ) == get_fingerprint("SELECT * FROM users_user WHERE id = 1")
+
+    def test_in(self):
+        assert get_fingerprint(
+            "SELECT * FROM users_user WHERE id IN (%s, %s, %s)"
+        ) == get_fingerprint("SELECT * FROM users_user WHERE id IN (%s, %s)")
+
+    def test_literals(self):
+        assert get_fingerprint(
+            "SELECT * FROM users_user WHERE username = 'danjac'"
+        ) == get_fingerprint("SELECT * FROM users_user WHERE username = %s")
+
+
+class TestProfilingMiddleware:
+    @pytest.fixture
+    def profiling(self, settings):
+        settings.PROFILING_ENABLED = True
+        settings.PROFILING_LOG_SAMPLE_RATE = 1
+        settings.PROFILING_CPROFILE_THRESHOLD = 0
+
+    @pytest.fixture
+    def get_response(self, mocker, community):
+        mocker.patch(
+            "requests.adapters.HTTPAdapter.send", return_value=requests.Response()
+        )
+
+        def _get_response(req):
+            User.objects.count()
+            User.objects.count()
+            cache.get("missing")
+            requests.get("https://example.com")
+            req.community = community
+            return render(req, "405.html")
+
+        return _get_response
+
+    def test_disabled(self, settings, get_response):
+        settings.PROFILING_ENABLED = False
+        with pytest.raises(MiddlewareNotUsed):
+            ProfilingMiddleware(get_response)
+
+    def test_enabled(self, rf, profiling, get_response, caplog):
+        req = rf.get("/")
+        resp = ProfilingMiddleware(get_response)(req)
+
+        header = resp["Server-Timing"]
+        assert 'desc="2 queries"' in header
+        assert 'desc="0 hits, 1 misses"' in header
+        assert 'desc="1 requests"' in header
+        assert "tpl;dur=0.0" not in header
+
+        assert "duplicate_queries" in caplog.text
+
+    def test_cprofile(self, rf, profiling, get_response, settings, tmp_path):
+        settings.PROFILING_CPROFILE_THRESHOLD = 0.001
+        settings.PROFILING_CPROFILE_DIR = str(tmp_path)
+        ProfilingMiddleware(get_response)(rf.get("/some/path/"))
+        assert [p.name.endswith("-some-path.prof") for p in tmp_path.iterdir()] == [
+            True
+        ]
+
+    def test_installed_after_metrics_middleware(self, settings):
+        # community lookup and all other middleware queries are profiled
+        assert (
+            settings.MIDDLEWARE.index(
+                "localhub.common.middleware.profiling.ProfilingMiddleware"
+            )
+            == settings.MIDDLEWARE.index(
+                "localhub.common.middleware.metrics.MetricsMiddleware"
+            )
+            + 1
+        )
+
+
+class TestMetricsMiddleware:
+    def get_sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_resolved(self, client, community):
+        labels = {"view": "community_not_found", "method": "GET"}
+        count = self.get_sample("localhub_request_latency_seconds_count", **labels)
+        client.get("/not-found/")
+        assert (
+            self.get_sample("localhub_request_latency_seconds_count", **labels)
+            == count + 1
+        )
+
+    def test_search(self, rf):
+        req = rf.get("/")
+        req.search = "test"
+        count = self.get_sample(
+            "localhub_search_latency_seconds_count", view="unresolved"
+        )
+        MetricsMiddleware(lambda req: HttpResponse())(req)
+        assert (
+            self.get_sample("localhub_search_latency_seconds_count", view="unresolved")
+            == count + 1
+        )
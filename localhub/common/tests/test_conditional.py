@@ -0,0 +1,134 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+from datetime import timedelta
+
+# Django
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.http import http_date
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.users.utils import bump_state_versions
+
+# Local
+from ..conditional import conditional_response, make_etag
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("locmem_cache")]
+
+
+@pytest.fixture
+def make_request(rf, user):
+    def _make_request(method="get", **headers):
+        req = getattr(rf, method)("/", **headers)
+        req.user = user
+        req.LANGUAGE_CODE = "en"
+        return req
+
+    return _make_request
+
+
+@pytest.fixture
+def render(mocker):
+    return mocker.Mock(side_effect=lambda: HttpResponse("ok"))
+
+
+class TestMakeEtag:
+    def test_same(self, make_request):
+        now = timezone.now()
+        assert make_etag(make_request(), now, [1]) == make_etag(
+            make_request(), now, [1]
+        )
+
+    def test_last_modified_changed(self, make_request):
+        now = timezone.now()
+        assert make_etag(make_request(), now) != make_etag(
+            make_request(), now + timedelta(seconds=1)
+        )
+
+    def test_version_changed(self, make_request):
+        assert make_etag(make_request(), None, [1]) != make_etag(
+            make_request(), None, [2]
+        )
+
+    def test_state_version_changed(self, make_request, user):
+        etag = make_etag(make_request())
+        bump_state_versions(user.id)
+        assert make_etag(make_request()) != etag
+
+    def test_language_changed(self, make_request):
+        req = make_request()
+        etag = make_etag(req)
+        req.LANGUAGE_CODE = "fi"
+        assert make_etag(req) != etag
+
+
+class TestConditionalResponse:
+    def test_no_validators_in_request(self, make_request, render):
+        now = timezone.now()
+        response = conditional_response(make_request(), render, last_modified=now)
+        assert response.status_code == 200
+        assert response["ETag"]
+        assert "Last-Modified" not in response
+        assert "private" in response["Cache-Control"]
+        assert "no-cache" in response["Cache-Control"]
+        render.assert_called_once()
+
+    def test_etag_matches(self, make_request, render):
+        now = timezone.now()
+        etag = conditional_response(make_request(), render, last_modified=now)["ETag"]
+        render.reset_mock()
+
+        response = conditional_response(
+            make_request(HTTP_IF_NONE_MATCH=etag), render, last_modified=now
+        )
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert "private" in response["Cache-Control"]
+        assert "no-cache" in response["Cache-Control"]
+        assert response["Vary"] == "Cookie"
+        render.assert_not_called()
+
+    def test_if_modified_since_ignored(self, make_request, render, user):
+        now = timezone.now()
+        conditional_response(make_request(), render, last_modified=now)
+        render.reset_mock()
+
+        # e.g. unread count changed, but no content was modified
+        bump_state_versions(user.id)
+
+        response = conditional_response(
+            make_request(HTTP_IF_MODIFIED_SINCE=http_date(now.timestamp() + 60)),
+            render,
+            last_modified=now,
+        )
+        assert response.status_code == 200
+        render.assert_called_once()
+
+    def test_etag_does_not_match(self, make_request, render):
+        now = timezone.now()
+        etag = conditional_response(make_request(), render, last_modified=now)["ETag"]
+        render.reset_mock()
+
+        response = conditional_response(
+            make_request(HTTP_IF_NONE_MATCH=etag),
+            render,
+            last_modified=now + timedelta(seconds=1),
+        )
+        assert response.status_code == 200
+        render.assert_called_once()
+
+    def test_anonymous(self, make_request, render, anonymous_user):
+        req = make_request()
+        req.user = anonymous_user
+        response = conditional_response(req, render)
+        assert "private" not in response["Cache-Control"]
+
+    def test_post(self, make_request, render):
+        response = conditional_response(make_request("post"), render)
+        assert response.status_code == 200
+        assert "ETag" not in response
@@ -0,0 +1,49 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import time
+
+# Third Party Libraries
+import pytest
+from prometheus_client import REGISTRY
+
+# Localhub
+from localhub.notifications.tasks import send_webpush
+
+# Local
+from ..metrics import record_task_failure, record_task_finished, record_task_started
+
+
+def get_sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestTaskMetrics:
+    @pytest.fixture
+    def task(self):
+        send_webpush.push_request(sent_at=time.time() - 3)
+        yield send_webpush
+        send_webpush.pop_request()
+
+    def test_run(self, task):
+        labels = {"task": task.name}
+
+        count = get_sample("localhub_task_latency_seconds_count", **labels)
+        queue_wait = get_sample("localhub_task_queue_wait_seconds_sum", **labels)
+
+        record_task_started(task_id="abc", task=task)
+        record_task_finished(task_id="abc", task=task)
+
+        assert get_sample("localhub_task_latency_seconds_count", **labels) == count + 1
+        assert (
+            get_sample("localhub_task_queue_wait_seconds_sum", **labels)
+            >= queue_wait + 3
+        )
+
+    def test_failure(self, task):
+        failures = get_sample("localhub_task_failures_total", task=task.name)
+        record_task_failure(sender=task)
+        assert get_sample("localhub_task_failures_total", task=task.name) == (
+            failures + 1
+        )
@@ -0,0 +1,34 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.urls import reverse
+
+# Third Party Libraries
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+class TestMetricsView:
+    def test_get_if_no_token(self, client, settings):
+        settings.METRICS_AUTH_TOKEN = None
+        response = client.get(reverse("metrics"))
+        assert response.status_code == 404
+
+    def test_get_if_wrong_token(self, client, settings):
+        settings.METRICS_AUTH_TOKEN = "secret"
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong")
+        assert response.status_code == 404
+
+    def test_get_if_token(self, client, settings):
+        settings.METRICS_AUTH_TOKEN = "secret"
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == 200
+        assert b"localhub_request_latency_seconds" in response.content
+
+    def test_get_if_debug(self, client, settings):
+        settings.METRICS_AUTH_TOKEN = None
+        settings.DEBUG = True
+        response = client.get(reverse("metrics"))
+        assert response.status_code == 200
@@ -0,0 +1,264 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Eager thumbnail generation for image fields.
+
+Thumbnails are generated in a celery task when an image is uploaded, and
+the resulting URLs and dimensions are stored in a JSON field on the model
+row. Templates read the variants straight from the row (see templatetags),
+so rendering a page never resizes an image or makes a KVStore lookup per image.
+"""
+
+# Standard Library
+from dataclasses import dataclass
+from typing import Optional
+
+# Django
+from django.db import models, transaction
+from django.db.models.fields.json import KeyTextTransform
+
+# Third Party Libraries
+from celery.utils.log import get_logger
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.images import ImageFile
+
+celery_logger = get_logger(__name__)
+
+
+@dataclass
+class Thumbnail:
+    """Stored thumbnail variant as rendered in templates."""
+
+    url: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    webp_url: Optional[str] = None
+
+
+class ThumbnailGenerator:
+    """
+    Example:
+
+    class Photo(Activity):
+
+        image = ImageField(upload_to="photos")
+
+        thumbnails = models.JSONField(default=dict, blank=True, editable=False)
+
+        thumbnailer = ThumbnailGenerator(
+            "image",
+            ("500x300", {"crop": "top", "upscale": False}),
+            ("1000", {"upscale": False}),
+        )
+
+    Each variant is generated in the original format and as WebP. Generation is
+    queued automatically after the model is saved, unless schedule_on_save is
+    False, in which case generate() should be called explicitly e.g. after the
+    image has been processed.
+
+    The thumbnails field will contain:
+
+    {
+        "source": "photos/image.jpg",
+        "width": 1200,
+        "height": 800,
+        "variants": {
+            "500x300": {"url": ..., "width": ..., "height": ..., "webp_url": ...},
+            ...
+        },
+    }
+    """
+
+    webp_format = "WEBP"
+
+    def __init__(
+        self,
+        image_field,
+        *variants,
+        thumbnails_field="thumbnails",
+        schedule_on_save=True,
+    ):
+        self.image_field = image_field
+        self.variants = variants
+        self.thumbnails_field = thumbnails_field
+        self.schedule_on_save = schedule_on_save
+
+    def get_thumbnails(self, instance):
+        return getattr(instance, self.thumbnails_field) or {}
+
+    def is_generated(self, instance):
+        """Checks if thumbnails have been generated for the current image.
+
+        Args:
+            instance (Model)
+
+        Returns:
+            bool
+        """
+        image = getattr(instance, self.image_field)
+        return bool(image) and self.get_thumbnails(instance).get("source") == image.name
+
+    def get_queryset_to_generate(self):
+        """Returns rows with an image but without thumbnails of that image,
+        e.g. rows created before thumbnails were generated on upload. Only
+        one row is returned for each image, as generate() updates all rows
+        sharing the image.
+
+        Returns:
+            QuerySet
+        """
+        return (
+            self.cls._default_manager.exclude(
+                models.Q(**{f"{self.image_field}__isnull": True})
+                | models.Q(**{self.image_field: ""})
+            )
+            .annotate(
+                thumbnails_source=KeyTextTransform("source", self.thumbnails_field)
+            )
+            .filter(
+                models.Q(thumbnails_source__isnull=True)
+                | ~models.Q(thumbnails_source=models.F(self.image_field))
+            )
+            .order_by(self.image_field, "pk")
+            .distinct(self.image_field)
+        )
+
+    def get_thumbnail(self, instance, geometry):
+        """Returns stored thumbnail variant. If the variant has not yet been
+        generated, returns the original image with the requested geometry as
+        dimensions, so the template never has to resize the image itself.
+
+        Args:
+            instance (Model)
+            geometry (str): geometry string e.g. "32x32"
+
+        Returns:
+            Thumbnail or None if no image
+        """
+        image = getattr(instance, self.image_field)
+        if not image:
+            return None
+
+        if self.is_generated(instance) and (
+            variant := self.get_thumbnails(instance)["variants"].get(geometry)
+        ):
+            return Thumbnail(**variant)
+
+        width, _, height = geometry.partition("x")
+        return Thumbnail(
+            url=image.url,
+            width=int(width) if width else None,
+            height=int(height) if height else None,
+        )
+
+    def is_portrait(self, instance):
+        """Checks stored source dimensions. If thumbnails have not yet been
+        generated then returns False.
+
+        Args:
+            instance (Model)
+
+        Returns:
+            bool
+        """
+        if not self.is_generated(instance):
+            return False
+        thumbnails = self.get_thumbnails(instance)
+        return thumbnails["height"] > thumbnails["width"]
+
+    def generate(self, instance):
+        """Generates all variants and stores them on every row sharing
+        the same source image (e.g. reshares).
+
+        Args:
+            instance (Model)
+
+        Returns:
+            dict: thumbnails
+        """
+        image = getattr(instance, self.image_field)
+
+        if not image:
+            return self.update_thumbnails(instance, {})
+
+        variants = {}
+
+        for geometry, options in self.variants:
+            thumbnail = get_thumbnail(image, geometry, **options)
+            webp = get_thumbnail(
+                image, geometry, **{**options, "format": self.webp_format}
+            )
+            variants[geometry] = {
+                "url": thumbnail.url,
+                "width": thumbnail.width,
+                "height": thumbnail.height,
+                "webp_url": webp.url,
+            }
+
+        source = default.kvstore.get_or_set(ImageFile(image))
+
+        return self.update_thumbnails(
+            instance,
+            {
+                "source": image.name,
+                "width": source.width,
+                "height": source.height,
+                "variants": variants,
+            },
+        )
+
+    def update_thumbnails(self, instance, thumbnails):
+        qs = self.cls._default_manager.all()
+        if thumbnails:
+            qs = qs.filter(**{self.image_field: thumbnails["source"]})
+        else:
+            qs = qs.filter(pk=instance.pk)
+        qs.update(**{self.thumbnails_field: thumbnails})
+
+        setattr(instance, self.thumbnails_field, thumbnails)
+        return thumbnails
+
+    def schedule(self, instance):
+        """Queues thumbnail generation if the image has changed since
+        the last run.
+
+        Args:
+            instance (Model)
+        """
+        image = getattr(instance, self.image_field)
+
+        if not image:
+            if self.get_thumbnails(instance):
+                self.update_thumbnails(instance, {})
+            return
+
+        if self.is_generated(instance):
+            return
+
+        # Local
+        from . import tasks
+
+        try:
+            return tasks.generate_thumbnails.delay(
+                instance._meta.label_lower, instance.pk
+            )
+        except tasks.generate_thumbnails.OperationalError as e:
+            celery_logger.exception(e)
+
+    def finalize(self, sender, **kwargs):
+        if not self.schedule_on_save:
+            return
+
+        def schedule_thumbnails(instance, **kwargs):
+            transaction.on_commit(lambda: self.schedule(instance))
+
+        models.signals.post_save.connect(schedule_thumbnails, sender=sender, weak=False)
+
+    def contribute_to_class(self, cls, name):
+
+        self.cls = cls
+
+        setattr(cls, name, self)
+
+        models.signals.class_prepared.connect(self.finalize, sender=cls, weak=False)
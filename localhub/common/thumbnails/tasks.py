@@ -0,0 +1,57 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.apps import apps
+
+# Third Party Libraries
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(name="localhub.common.thumbnails.generate_thumbnails")
+def generate_thumbnails(model_label, pk):
+    """Generates all thumbnail variants for a model instance.
+
+    Args:
+        model_label (str): model label e.g. "photos.photo"
+        pk (int): primary key of instance
+    """
+    model = apps.get_model(model_label)
+    try:
+        instance = model._default_manager.get(pk=pk)
+    except model.DoesNotExist:
+        logger.info("%s %s no longer exists", model_label, pk)
+        return
+
+    try:
+        model.thumbnailer.generate(instance)
+        logger.info("Thumbnails generated for %s %s", model_label, pk)
+    except Exception as e:
+        logger.exception(e)
+
+
+@shared_task(name="localhub.common.thumbnails.generate_thumbnails_for_batch")
+def generate_thumbnails_for_batch(model_label, pks):
+    """Generates all thumbnail variants for a batch of model instances, e.g.
+    when backfilling existing rows: see the generatethumbnails command.
+
+    Instances already generated since the batch was queued are skipped.
+
+    Args:
+        model_label (str): model label e.g. "photos.photo"
+        pks (List[int]): primary keys of instances
+    """
+    model = apps.get_model(model_label)
+
+    for instance in model._default_manager.filter(pk__in=pks):
+        if model.thumbnailer.is_generated(instance):
+            continue
+        try:
+            model.thumbnailer.generate(instance)
+        except Exception as e:
+            logger.exception(e)
+
+    logger.info("Thumbnails generated for %d %s rows", len(pks), model_label)
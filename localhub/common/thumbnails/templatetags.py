@@ -0,0 +1,42 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag
+def get_thumbnail(obj, geometry):
+    """Returns pre-generated thumbnail variant stored on the model. Never
+    resizes the image: if the variant is not yet available the original
+    image is returned instead.
+
+    Usage:
+    {% get_thumbnail user "32x32" as avatar %}
+    <img src="{{ avatar.url }}" width="{{ avatar.width }}">
+
+    Args:
+        obj (Model): model with a ThumbnailGenerator
+        geometry (str): geometry string e.g. "32x32"
+
+    Returns:
+        Thumbnail or None
+    """
+    if not obj:
+        return None
+    return obj.thumbnailer.get_thumbnail(obj, geometry)
+
+
+@register.filter
+def is_portrait(obj):
+    """Checks stored source image dimensions.
+
+    Args:
+        obj (Model): model with a ThumbnailGenerator
+
+    Returns:
+        bool
+    """
+    return obj.thumbnailer.is_portrait(obj)
@@ -0,0 +1,159 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.template import engines
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.photos.factories import PhotoFactory
+from localhub.activities.photos.models import Photo
+from localhub.users.factories import UserFactory
+
+# Local
+from ..tasks import generate_thumbnails, generate_thumbnails_for_batch
+from ..templatetags import get_thumbnail, is_portrait
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def mock_generate_thumbnails(mocker):
+    return mocker.patch("localhub.common.thumbnails.tasks.generate_thumbnails")
+
+
+class TestThumbnailGenerator:
+    def test_generate(self, photo):
+        thumbnails = Photo.thumbnailer.generate(photo)
+
+        assert thumbnails["source"] == photo.image.name
+        assert set(thumbnails["variants"].keys()) == {"500x300", "500", "1000"}
+
+        variant = thumbnails["variants"]["500"]
+        assert variant["url"]
+        assert variant["webp_url"].endswith(".webp")
+
+        photo.refresh_from_db()
+        assert photo.thumbnails == thumbnails
+        assert Photo.thumbnailer.is_generated(photo)
+
+    def test_generate_updates_reshares(self, photo, user):
+        reshare = photo.reshare(user)
+        Photo.thumbnailer.generate(photo)
+        reshare.refresh_from_db()
+        assert reshare.thumbnails["source"] == photo.image.name
+
+    def test_generate_if_no_image(self):
+        user = UserFactory(thumbnails={"source": "avatars/old.png"})
+        assert user.thumbnailer.generate(user) == {}
+        user.refresh_from_db()
+        assert user.thumbnails == {}
+
+    def test_schedule_if_not_generated(self, photo, mock_generate_thumbnails):
+        photo.thumbnailer.schedule(photo)
+        mock_generate_thumbnails.delay.assert_called_with("photos.photo", photo.id)
+
+    def test_schedule_if_generated(self, photo, mock_generate_thumbnails):
+        photo.thumbnailer.generate(photo)
+        photo.thumbnailer.schedule(photo)
+        mock_generate_thumbnails.delay.assert_not_called()
+
+    def test_schedule_if_image_changed(self, photo, mock_generate_thumbnails):
+        photo.thumbnailer.generate(photo)
+        photo.image = PhotoFactory().image
+        photo.thumbnailer.schedule(photo)
+        mock_generate_thumbnails.delay.assert_called_with("photos.photo", photo.id)
+
+    def test_get_queryset_to_generate(self, photo, user):
+        reshare = photo.reshare(user)
+        generated = PhotoFactory()
+        generated.thumbnailer.generate(generated)
+
+        assert list(Photo.thumbnailer.get_queryset_to_generate()) == [photo]
+
+        Photo.thumbnailer.generate(photo)
+        assert not Photo.thumbnailer.get_queryset_to_generate().exists()
+
+        reshare.image = PhotoFactory().image
+        reshare.save()
+        assert list(Photo.thumbnailer.get_queryset_to_generate()) == [reshare]
+
+    def test_get_queryset_to_generate_if_no_image(self, user):
+        assert not user.thumbnailer.get_queryset_to_generate().exists()
+
+    def test_get_thumbnail_if_not_generated(self, photo):
+        thumbnail = photo.thumbnailer.get_thumbnail(photo, "500x300")
+        assert thumbnail.url == photo.image.url
+        assert thumbnail.width == 500
+        assert thumbnail.height == 300
+        assert thumbnail.webp_url is None
+
+    def test_get_thumbnail_if_generated(self, photo):
+        photo.thumbnailer.generate(photo)
+        thumbnail = photo.thumbnailer.get_thumbnail(photo, "1000")
+        assert thumbnail.url != photo.image.url
+        assert thumbnail.webp_url
+
+    def test_get_thumbnail_if_no_image(self, user):
+        assert user.thumbnailer.get_thumbnail(user, "32x32") is None
+
+
+class TestGenerateThumbnailsTask:
+    def test_generate(self, photo):
+        generate_thumbnails("photos.photo", photo.id)
+        photo.refresh_from_db()
+        assert photo.thumbnails["source"] == photo.image.name
+
+    def test_if_deleted(self, photo):
+        photo_id = photo.id
+        photo.delete()
+        generate_thumbnails("photos.photo", photo_id)
+
+
+class TestGenerateThumbnailsForBatchTask:
+    def test_generate(self, photo, mocker):
+        other = PhotoFactory()
+        other.thumbnailer.generate(other)
+        mock_generate = mocker.spy(Photo.thumbnailer, "generate")
+
+        generate_thumbnails_for_batch("photos.photo", [photo.id, other.id])
+
+        photo.refresh_from_db()
+        assert photo.thumbnails["source"] == photo.image.name
+        # already generated
+        assert mock_generate.call_count == 1
+
+
+class TestTemplateTags:
+    def test_get_thumbnail(self, photo):
+        photo.thumbnailer.generate(photo)
+        assert (
+            get_thumbnail(photo, "500").url
+            == photo.thumbnails["variants"]["500"]["url"]
+        )
+
+    def test_get_thumbnail_if_none(self):
+        assert get_thumbnail(None, "500") is None
+
+    def test_is_portrait(self, photo):
+        assert not is_portrait(photo)
+        photo.thumbnailer.generate(photo)
+        photo.thumbnails["height"] = photo.thumbnails["width"] + 1
+        assert is_portrait(photo)
+
+    def test_render_avatar_no_resize(self, mocker, user, fake_image):
+        user.avatar = fake_image
+        user.save()
+        mock_get_thumbnail = mocker.patch("localhub.common.thumbnails.get_thumbnail")
+
+        tmpl = engines["django"].from_string(
+            """
+        {% load users %}
+        {% avatar user "32x32" %}
+        """
+        )
+        response = tmpl.render({"user": user})
+        assert user.avatar.url in response
+        mock_get_thumbnail.assert_not_called()
@@ -5,6 +5,12 @@
 from PIL import Image
 from PIL.ExifTags import GPSTAGS, TAGS
 
+# reverse lookups so we don't have to scan TAGS for each image
+TAG_IDS = {name: tag for tag, name in TAGS.items()}
+
+ORIENTATION_TAG = TAG_IDS["Orientation"]
+GPS_INFO_TAG = TAG_IDS["GPSInfo"]
+
 
 class Exif:
 
@@ -15,7 +21,9 @@ class Exif:
 
     @classmethod
     def from_image(cls, fp):
-        """Returns Exif instance from file-like object
+        """Returns Exif instance from file-like object. Only the image
+        headers are read: pixel data is not decoded until the image is
+        actually loaded.
 
         Args:
             fp (file): file-like object containing an Image
@@ -39,26 +47,24 @@ class Exif:
         self.image = image
         self.exif = exif
 
+    @property
+    def orientation(self):
+        """Returns orientation tag value, or None if not available."""
+        return self.exif.get(ORIENTATION_TAG)
+
     def rotate(self):
-        """Attempt to rotate image based on EXIF orientation tags.
+        """Rotates image based on EXIF orientation tag.
+
+        Returns:
+            Image: rotated copy of the image
 
         Raises:
-            Exif.Invalid: if data does not contain orientation tags.
+            Exif.Invalid: if data does not contain a valid orientation tag.
         """
+        if (orientation := self.orientation) not in self.ROTATIONS:
+            raise self.Invalid(f"Invalid orientation: {orientation}")
 
-        self.image.seek(0)
-
-        orientation = None
-
-        for key in TAGS.keys():
-            if TAGS[key] == "Orientation":
-                orientation = key
-                break
-
-        if orientation is None or orientation not in self.ROTATIONS:
-            raise self.Invalid("Cannot find valid orientation key")
-
-        self.image.rotate(self.ROTATIONS[orientation], expand=True)
+        return self.image.rotate(self.ROTATIONS[orientation], expand=True)
 
     def locate(self):
         """Returns lat, lng pair of coordinates.
@@ -86,15 +92,11 @@ class Exif:
         return lat, lng
 
     def convert_to_decimal(self, degrees, minutes, seconds):
-        return round(degrees + (minutes / 60) + (seconds / 3600), 5)
+        # values may be IFDRational rather than float
+        return round(float(degrees + (minutes / 60) + (seconds / 3600)), 5)
 
     def build_gps_dict(self):
-        raw_values = {}
-        for tag, value in self.exif.items():
-            if TAGS.get(tag, tag) == "GPSInfo":
-                raw_values = value
-
-        if not raw_values:
+        if not (raw_values := self.exif.get(GPS_INFO_TAG)):
             raise self.Invalid("GPSInfo not found in exif")
 
         gps_dict = {GPSTAGS.get(tag, tag): raw_values[tag] for tag in raw_values}
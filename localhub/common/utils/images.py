@@ -0,0 +1,85 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import io
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# Third Party Libraries
+from PIL import Image
+
+# Local
+from .exif import Exif
+
+
+@dataclass
+class ProcessedImage:
+    """Result of normalize_image()."""
+
+    content: bytes
+    format: str
+    width: int
+    height: int
+    location: Optional[Tuple[float, float]] = None
+
+
+def normalize_image(fp, max_size):
+    """Prepares an uploaded image for storage:
+
+    1. rotates the image based on EXIF orientation
+    2. extracts GPS coordinates if available
+    3. downsizes the image so neither side exceeds max_size
+    4. re-encodes the image without EXIF or other metadata
+
+    EXIF tags are read before pixel data is decoded. GPS coordinates are
+    always returned, as they cannot be read from the processed image: it is
+    up to the caller whether to use or keep them.
+
+    Args:
+        fp (file): file-like object containing an image
+        max_size (int): maximum width/height in pixels
+
+    Returns:
+        ProcessedImage
+    """
+    try:
+        exif = Exif.from_image(fp)
+        image = exif.image
+    except Exif.Invalid:
+        exif = None
+        fp.seek(0)
+        image = Image.open(fp)
+
+    # keep original format: rotate() etc return new images without format
+    image_format = image.format
+
+    location = None
+
+    if exif:
+        try:
+            location = exif.locate()
+        except Exif.Invalid:
+            pass
+
+        try:
+            image = exif.rotate()
+        except Exif.Invalid:
+            pass
+
+    image.thumbnail((max_size, max_size))
+
+    if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    output = io.BytesIO()
+    # info is not passed on, so EXIF, ICC and other metadata are dropped
+    image.save(output, image_format)
+
+    return ProcessedImage(
+        content=output.getvalue(),
+        format=image_format,
+        width=image.width,
+        height=image.height,
+        location=location,
+    )
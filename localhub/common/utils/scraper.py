@@ -9,6 +9,9 @@ import random
 import requests
 from bs4 import BeautifulSoup
 
+# Localhub
+from localhub.common.metrics import SCRAPER_LATENCY
+
 # Local
 from .http import URLResolver, get_domain
 
@@ -84,21 +87,23 @@ class HTMLScraper:
             HTMLScraper.Invalid: if unreachable URL or data returned not HTML
         """
         try:
-            response = requests.get(
-                url,
-                headers={
-                    "User-Agent": random.choice(cls.USER_AGENTS),
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'}",
-                },
-                stream=True,
-            )
-            response.raise_for_status()
-            if "text/html" not in response.headers.get("Content-Type", ""):
-                raise cls.Invalid("response is not html")
+            with SCRAPER_LATENCY.time():
+                response = requests.get(
+                    url,
+                    headers={
+                        "User-Agent": random.choice(cls.USER_AGENTS),
+                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'}",
+                    },
+                    stream=True,
+                )
+                response.raise_for_status()
+                if "text/html" not in response.headers.get("Content-Type", ""):
+                    raise cls.Invalid("response is not html")
+                content = response.content
         except requests.RequestException as e:
             raise cls.Invalid(e)
 
-        return cls(url).scrape(response.content)
+        return cls(url).scrape(content)
 
     def scrape(self, html):
         """Parses HTML title, image and description from HTML OpenGraph and
@@ -1,11 +1,69 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Standard Library
+import io
+
 # Third Party Libraries
 import pytest
+from PIL import Image
 
 # Local
-from ..exif import Exif
+from ..exif import GPS_INFO_TAG, ORIENTATION_TAG, Exif
+
+
+def make_image(tags):
+    exif = Image.Exif()
+    for tag, value in tags.items():
+        exif[tag] = value
+    fp = io.BytesIO()
+    Image.new("RGB", (300, 100), color="blue").save(fp, "JPEG", exif=exif.tobytes())
+    fp.seek(0)
+    return fp
+
+
+class TestFromImage:
+    def test_no_exif(self):
+        fp = io.BytesIO()
+        Image.new("RGB", (300, 100)).save(fp, "PNG")
+        fp.seek(0)
+        with pytest.raises(Exif.Invalid):
+            Exif.from_image(fp)
+
+    def test_orientation(self):
+        exif = Exif.from_image(make_image({ORIENTATION_TAG: 6}))
+        assert exif.orientation == 6
+
+
+class TestRotate:
+    def test_rotate(self):
+        image = Exif(Image.new("RGB", (300, 100)), {ORIENTATION_TAG: 6}).rotate()
+        assert image.size == (100, 300)
+
+    def test_no_orientation(self):
+        with pytest.raises(Exif.Invalid):
+            Exif(Image.new("RGB", (300, 100)), {}).rotate()
+
+    def test_no_rotation_required(self):
+        with pytest.raises(Exif.Invalid):
+            Exif(Image.new("RGB", (300, 100)), {ORIENTATION_TAG: 1}).rotate()
+
+
+class TestBuildGpsDict:
+    def test_ok(self):
+        gps_dict = Exif(
+            None, {GPS_INFO_TAG: {1: "N", 2: (61, 3, 1), 3: "E", 4: (24, 1, 3)}}
+        ).build_gps_dict()
+        assert gps_dict["GPSLatitudeRef"] == "N"
+        assert gps_dict["GPSLongitude"] == (24, 1, 3)
+
+    def test_missing(self):
+        with pytest.raises(Exif.Invalid):
+            Exif(None, {}).build_gps_dict()
+
+    def test_incomplete(self):
+        with pytest.raises(Exif.Invalid):
+            Exif(None, {GPS_INFO_TAG: {1: "N"}}).build_gps_dict()
 
 
 class TestLocate:
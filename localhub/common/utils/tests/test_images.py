@@ -0,0 +1,61 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import io
+
+# Third Party Libraries
+import pytest
+from PIL import Image
+
+# Local
+from ..exif import GPS_INFO_TAG, ORIENTATION_TAG
+from ..images import normalize_image
+
+
+def make_jpeg(size, tags=None):
+    exif = Image.Exif()
+    for tag, value in (tags or {}).items():
+        exif[tag] = value
+    fp = io.BytesIO()
+    Image.new("RGB", size, color="blue").save(fp, "JPEG", exif=exif.tobytes())
+    fp.seek(0)
+    return fp
+
+
+class TestNormalizeImage:
+    def test_resize(self):
+        processed = normalize_image(make_jpeg((400, 200)), 100)
+        assert processed.format == "JPEG"
+        assert (processed.width, processed.height) == (100, 50)
+
+    def test_no_upscale(self):
+        processed = normalize_image(make_jpeg((400, 200)), 1000)
+        assert (processed.width, processed.height) == (400, 200)
+
+    def test_rotate_and_strip_exif(self):
+        processed = normalize_image(make_jpeg((400, 200), {ORIENTATION_TAG: 6}), 1000)
+        assert (processed.width, processed.height) == (200, 400)
+        assert not Image.open(io.BytesIO(processed.content)).getexif()
+
+    def test_extract_gps_data(self):
+        fp = make_jpeg(
+            (400, 200),
+            {GPS_INFO_TAG: {1: "N", 2: (61.0, 0.0, 0.0), 3: "E", 4: (24.0, 0.0, 0.0)}},
+        )
+        processed = normalize_image(fp, 1000)
+        lat, lng = processed.location
+        assert lat == pytest.approx(61)
+        assert lng == pytest.approx(24)
+        assert not Image.open(io.BytesIO(processed.content)).getexif()
+
+    def test_extract_gps_data_if_none(self):
+        assert normalize_image(make_jpeg((400, 200)), 1000).location is None
+
+    def test_no_exif(self):
+        fp = io.BytesIO()
+        Image.new("RGBA", (400, 200)).save(fp, "PNG")
+        fp.seek(0)
+        processed = normalize_image(fp, 100)
+        assert processed.format == "PNG"
+        assert processed.location is None
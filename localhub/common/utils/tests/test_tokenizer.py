@@ -0,0 +1,51 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Local
+from ..tokenizer import get_url_parts, tokenize
+
+
+class TestTokenize:
+    def test_empty(self):
+        tokens = tokenize("")
+        assert tokens.hashtags == set()
+        assert tokens.mentions == set()
+        assert tokens.text == ""
+
+    def test_extract(self):
+        tokens = tokenize("hello @danjac!\n#Coding #kesä email@example.com a#b")
+        assert tokens.hashtags == {"coding", "kesä"}
+        assert tokens.mentions == {"danjac"}
+
+    def test_text_unchanged_if_not_linkified(self):
+        content = "hello @danjac #coding"
+        assert tokenize(content).text == content
+
+    def test_linkify(self):
+        tokens = tokenize(
+            "hello @danjac  #coding\n@kesämies",
+            linkify_hashtags=True,
+            linkify_mentions=True,
+            css_class="mr-1",
+        )
+        assert tokens.text == (
+            'hello <a href="/people/danjac/" class="mr-1">@danjac</a>'
+            '  <a href="/tags/coding/" class="mr-1">#coding</a>\n'
+            '<a href="/people/kesamies/" class="mr-1">@kesämies</a>'
+        )
+        assert tokens.hashtags == {"coding"}
+        assert tokens.mentions == {"danjac", "kesämies"}
+
+    def test_linkify_hashtags_only(self):
+        tokens = tokenize("@danjac #coding", linkify_hashtags=True)
+        assert tokens.text == '@danjac <a href="/tags/coding/">#coding</a>'
+        assert tokens.mentions == {"danjac"}
+
+    def test_linkify_tag_prefix_of_other_tag(self):
+        tokens = tokenize("#a\n#ab", linkify_hashtags=True)
+        assert tokens.text == ('<a href="/tags/a/">#a</a>\n<a href="/tags/ab/">#ab</a>')
+
+
+class TestGetUrlParts:
+    def test_get_url_parts(self):
+        assert get_url_parts("hashtags:detail") == ("/tags/", "/")
@@ -0,0 +1,31 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Third Party Libraries
+import pytest
+
+# Local
+from ..versions import bump_versions, get_version
+
+pytestmark = pytest.mark.usefixtures("locmem_cache")
+
+
+class TestVersions:
+    def test_get_version(self):
+        version = get_version("test")
+        assert version
+        assert get_version("test") == version
+
+    def test_bump_versions(self):
+        first = get_version("first")
+        second = get_version("second")
+        other = get_version("other")
+
+        bump_versions("first", "second")
+
+        assert get_version("first") != first
+        assert get_version("second") != second
+        assert get_version("other") == other
+
+    def test_bump_versions_none(self):
+        bump_versions()
@@ -0,0 +1,102 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Single pass scanner for #hashtags and @mentions in text, which can also
+replace them with links to tag and user pages.
+"""
+
+# Standard Library
+import functools
+import re
+from dataclasses import dataclass
+
+# Django
+from django.conf import settings
+from django.urls import get_script_prefix, get_urlconf, reverse
+
+# Localhub
+from localhub.hashtags.app_settings import HASHTAG_PATTERN
+from localhub.users.app_settings import MENTION_PATTERN
+
+# Local
+from .text import slugify_unicode
+
+# tokens must be at start of text or follow whitespace
+TOKENS_RE = re.compile(rf"(?<!\S)(?:{HASHTAG_PATTERN}|{MENTION_PATTERN})")
+
+_SLUG_PLACEHOLDER = "__slug__"
+
+
+@dataclass
+class Tokens:
+    hashtags: set
+    mentions: set
+    text: str
+
+
+@functools.lru_cache(maxsize=None)
+def _get_url_parts(viewname, urlconf, script_prefix):
+    url = reverse(viewname, args=[_SLUG_PLACEHOLDER], urlconf=urlconf)
+    prefix, suffix = url.split(_SLUG_PLACEHOLDER, 1)
+    return prefix, suffix
+
+
+def get_url_parts(viewname):
+    """Returns URL before and after the slug, so links can be built
+    without calling reverse() for each one.
+
+    Args:
+        viewname (str): view taking a single slug argument
+
+    Returns:
+        Tuple[str, str]
+    """
+    return _get_url_parts(
+        viewname, get_urlconf() or settings.ROOT_URLCONF, get_script_prefix()
+    )
+
+
+def tokenize(
+    content, *, linkify_hashtags=False, linkify_mentions=False, css_class=None
+):
+    """Finds all #hashtags and @mentions in text. Hashtags are lower case.
+
+    Args:
+        content (str)
+        linkify_hashtags (bool, optional): replace hashtags with links
+        linkify_mentions (bool, optional): replace mentions with links
+        css_class (str, optional): CSS class of links
+
+    Returns:
+        Tokens: hashtags and mentions without prefixes, and text with
+            links if any
+    """
+    hashtags, mentions = set(), set()
+
+    if not linkify_hashtags and not linkify_mentions:
+        for match in TOKENS_RE.finditer(content):
+            if (hashtag := match["hashtag"]) is not None:
+                hashtags.add(hashtag.lower())
+            else:
+                mentions.add(match["mention"])
+        return Tokens(hashtags, mentions, content)
+
+    css_class = f' class="{css_class}"' if css_class else ""
+    hashtag_url = get_url_parts("hashtags:detail") if linkify_hashtags else None
+    mention_url = get_url_parts("users:activities") if linkify_mentions else None
+
+    def _replace(match):
+        if (value := match["hashtag"]) is not None:
+            hashtags.add(value.lower())
+            url = hashtag_url
+        else:
+            value = match["mention"]
+            mentions.add(value)
+            url = mention_url
+
+        if url and (slug := slugify_unicode(value)):
+            return f'<a href="{url[0]}{slug}{url[1]}"{css_class}>{match[0]}</a>'
+        return match[0]
+
+    return Tokens(hashtags, mentions, TOKENS_RE.sub(_replace, content))
@@ -0,0 +1,36 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Version numbers kept in the cache, used to invalidate cached pages and
+HTTP validators. A version is bumped by deleting its key: the next
+version is taken from the current time, so versions are never reused,
+even if a key is evicted from the cache.
+"""
+
+# Standard Library
+import time
+
+# Django
+from django.core.cache import cache
+
+
+def get_version(key):
+    """
+    Args:
+        key (str)
+
+    Returns:
+        int: current version
+    """
+    return cache.get_or_set(key, time.time_ns, timeout=None)
+
+
+def bump_versions(*keys):
+    """Changes versions of all keys.
+
+    Args:
+        *keys (str)
+    """
+    if keys:
+        cache.delete_many(keys)
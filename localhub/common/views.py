@@ -0,0 +1,34 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import hmac
+
+# Django
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+
+# Third Party Libraries
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+# Localhub
+from localhub.common.metrics import get_registry
+
+
+@require_safe
+def metrics_view(request):
+    """Prometheus metrics exposition. Requires an
+    "Authorization: Bearer <METRICS_AUTH_TOKEN>" header, unless DEBUG is
+    enabled.
+    """
+    if not settings.DEBUG:
+        token = settings.METRICS_AUTH_TOKEN
+        if not token or not hmac.compare_digest(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        ):
+            raise Http404()
+
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
@@ -2,6 +2,7 @@
 from django.contrib import admin
 
 # Localhub
+from localhub.common.db.admin import ChunkedDeletionAdminMixin
 from localhub.common.markdown.admin import MarkdownFieldMixin
 
 # Local
@@ -9,7 +10,7 @@ from .models import Community, Membership
 
 
 @admin.register(Community)
-class CommunityAdmin(MarkdownFieldMixin, admin.ModelAdmin):
+class CommunityAdmin(ChunkedDeletionAdminMixin, MarkdownFieldMixin, admin.ModelAdmin):
     search_fields = ("domain", "name")
     list_display = (
         "domain",
@@ -0,0 +1,221 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Shared page cache for anonymous visitors to public communities.
+
+Pages are cached per community, path, query string and language. Each
+community has a content version, which is bumped whenever activities,
+comments, likes or memberships are saved or deleted, the community is
+saved, or a member changes their profile: cached pages with an older
+version are ignored, so there is no need to find and delete individual
+pages.
+
+Only one request at a time renders a missing page: other requests for the
+same page are given the previous version if available, or wait for the
+page to be rendered.
+"""
+
+# Standard Library
+import functools
+import hashlib
+import re
+import time
+
+# Django
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+
+# Localhub
+from localhub.common.utils.versions import bump_versions, get_version
+
+_csrf_input_re = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+# how often to check if the page has been rendered by another request
+LOCK_POLL_INTERVAL = 0.1
+
+
+def get_content_version_key(community_id):
+    return f"communities.content-version:{community_id}"
+
+
+def get_content_version(community_id):
+    """
+    Args:
+        community_id (int)
+
+    Returns:
+        int
+    """
+    return get_version(get_content_version_key(community_id))
+
+
+def bump_content_version(*community_ids):
+    """Changes content versions of communities, so all cached pages are
+    re-rendered.
+
+    Args:
+        *community_ids (int)
+    """
+    bump_versions(*map(get_content_version_key, community_ids))
+
+
+def get_page_cache_key(request):
+    """
+    Args:
+        request (HttpRequest)
+
+    Returns:
+        str
+    """
+    digest = hashlib.md5(
+        "|".join(
+            [
+                request.get_full_path(),
+                request.LANGUAGE_CODE,
+                request.headers.get("Turbo-Frame", ""),
+                # shows cookie notice
+                str("accept-cookies" in request.COOKIES),
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+    return f"communities.page:{request.community.id}:{digest}"
+
+
+def is_cacheable_request(request):
+    """
+    Args:
+        request (HttpRequest)
+
+    Returns:
+        bool
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and request.user.is_anonymous
+        and request.community.id is not None
+        and request.community.active
+        and request.community.public
+        and not len(get_messages(request))
+    )
+
+
+def is_cacheable_response(response):
+    """
+    Args:
+        response (HttpResponse)
+
+    Returns:
+        bool
+    """
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and "private" not in response.get("Cache-Control", "")
+    )
+
+
+def get_cached_page(key):
+    """
+    Args:
+        key (str)
+
+    Returns:
+        Tuple[int, HttpResponse] or None: content version and response
+    """
+    return cache.get(key)
+
+
+def set_cached_page(key, version, response):
+    """
+    Args:
+        key (str)
+        version (int)
+        response (HttpResponse)
+    """
+    # TemplateResponse must be rendered before it can be pickled
+    if hasattr(response, "render"):
+        response.render()
+    cache.set(key, (version, response), settings.PAGE_CACHE_TIMEOUT)
+
+
+def wait_for_cached_page(key, version):
+    """Waits for page to be rendered by another request.
+
+    Args:
+        key (str)
+        version (int)
+
+    Returns:
+        HttpResponse or None if timed out
+    """
+    deadline = time.monotonic() + settings.PAGE_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        if (cached := get_cached_page(key)) and cached[0] == version:
+            return cached[1]
+    return None
+
+
+def prepare_cached_response(request, response):
+    """Replaces CSRF tokens rendered in cached page (e.g. in the cookie
+    notice form) with tokens for the current visitor.
+
+    Args:
+        request (HttpRequest)
+        response (HttpResponse)
+
+    Returns:
+        HttpResponse
+    """
+    content = response.content.decode(response.charset)
+    if "csrfmiddlewaretoken" in content:
+        token = get_token(request)
+        response.content = _csrf_input_re.sub(rf"\g<1>{token}\g<2>", content)
+    return response
+
+
+def cache_anonymous_page(view):
+    """Caches response for anonymous visitors to public communities. Should
+    be used after community_required:
+
+    @community_required
+    @cache_anonymous_page
+    def my_view(request):
+        ...
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not is_cacheable_request(request):
+            return view(request, *args, **kwargs)
+
+        key = get_page_cache_key(request)
+        version = get_content_version(request.community.id)
+
+        cached = get_cached_page(key)
+        if cached and cached[0] == version:
+            return prepare_cached_response(request, cached[1])
+
+        lock_key = f"{key}:lock"
+
+        if not cache.add(lock_key, 1, settings.PAGE_CACHE_LOCK_TIMEOUT):
+            # another request is rendering this page
+            if cached:
+                return prepare_cached_response(request, cached[1])
+            if response := wait_for_cached_page(key, version):
+                return prepare_cached_response(request, response)
+            return view(request, *args, **kwargs)
+
+        try:
+            response = view(request, *args, **kwargs)
+            if is_cacheable_response(response):
+                set_cached_page(key, version, response)
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    return wrapper
@@ -0,0 +1,64 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+# Localhub
+from localhub.common.thumbnails import ThumbnailGenerator
+from localhub.common.thumbnails.tasks import generate_thumbnails_for_batch
+
+
+class Command(BaseCommand):
+    help = "Queues thumbnail generation for existing photos, avatars and logos without thumbnails of their current image."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help="Model labels e.g. photos.photo (default: all models with thumbnails)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Number of rows per task"
+        )
+
+    def handle(self, *args, **options):
+
+        for model in self.get_models(options["models"]):
+            label = model._meta.label_lower
+
+            pks = model.thumbnailer.get_queryset_to_generate().values_list(
+                "pk", flat=True
+            )
+
+            num_rows = 0
+            batch = []
+
+            for pk in pks.iterator(chunk_size=options["batch_size"]):
+                batch.append(pk)
+                if len(batch) == options["batch_size"]:
+                    generate_thumbnails_for_batch.delay(label, batch)
+                    num_rows += len(batch)
+                    batch = []
+
+            if batch:
+                generate_thumbnails_for_batch.delay(label, batch)
+                num_rows += len(batch)
+
+            self.stdout.write(f"Thumbnails queued for {num_rows} {label} rows")
+
+    def get_models(self, labels):
+        models = [
+            model
+            for model in apps.get_models()
+            if isinstance(getattr(model, "thumbnailer", None), ThumbnailGenerator)
+        ]
+        if not labels:
+            return models
+
+        models_by_label = {model._meta.label_lower: model for model in models}
+        try:
+            return [models_by_label[label.lower()] for label in labels]
+        except KeyError as e:
+            raise CommandError(f"No thumbnails for model {e}")
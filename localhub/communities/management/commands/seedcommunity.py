@@ -0,0 +1,89 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+import time
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Localhub
+from localhub.communities.models import Community
+from localhub.communities.seeder import CommunitySeeder
+
+
+class Command(BaseCommand):
+    help = "Populates a community with generated users and content for load testing and benchmarks. The community is created if it does not exist."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "domain", help="Community domain e.g. mydomain.localhub.social"
+        )
+        parser.add_argument(
+            "--users", type=int, default=1000, help="Number of new members"
+        )
+        parser.add_argument(
+            "--activities",
+            type=int,
+            default=10000,
+            help="Number of posts, photos, events and polls",
+        )
+        parser.add_argument(
+            "--comments-per-activity",
+            type=float,
+            default=2,
+            help="Average number of comments for each activity",
+        )
+        parser.add_argument(
+            "--likes-per-activity",
+            type=float,
+            default=5,
+            help="Average number of likes for each activity",
+        )
+        parser.add_argument(
+            "--messages-per-user",
+            type=float,
+            default=2,
+            help="Average number of private messages sent by each user",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=None, help="Random seed, for repeatable data"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=5000, help="Number of rows per INSERT"
+        )
+
+    def handle(self, *args, **options):
+
+        community, created = Community.objects.get_or_create(
+            domain__iexact=options["domain"],
+            defaults={
+                "domain": options["domain"],
+                "name": options["domain"],
+                "active": True,
+            },
+        )
+        if created:
+            self.stdout.write(f"Community '{community.name}' has been created")
+
+        start = time.perf_counter()
+
+        counts = CommunitySeeder(
+            community,
+            num_users=options["users"],
+            num_activities=options["activities"],
+            comments_per_activity=options["comments_per_activity"],
+            likes_per_activity=options["likes_per_activity"],
+            messages_per_user=options["messages_per_user"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=self.stdout.write,
+        ).seed()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "{} rows created in {:.1f} seconds".format(
+                    sum(counts.values()), time.perf_counter() - start
+                )
+            )
+        )
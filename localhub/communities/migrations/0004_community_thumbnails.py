@@ -0,0 +1,19 @@
+# Generated by Django 3.1.14 on 2026-10-19 01:46
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communities", "0003_remove_community_google_tracking_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="community",
+            name="thumbnails",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
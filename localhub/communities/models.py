@@ -9,20 +9,25 @@ from urllib.parse import urljoin
 from django.conf import settings
 from django.contrib.sites.shortcuts import get_current_site
 from django.core.validators import RegexValidator, URLValidator
-from django.db import models
+from django.db import models, transaction
 from django.http import HttpRequest
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 # Third Party Libraries
+from celery.utils.log import get_logger
 from model_utils.models import TimeStampedModel
 from sorl.thumbnail import ImageField
 
 # Localhub
 from localhub.common.db.search.mixins import SearchQuerySetMixin
+from localhub.common.db.tracker import TrackerModelMixin
 from localhub.common.markdown.fields import MarkdownField
+from localhub.common.thumbnails import ThumbnailGenerator
 from localhub.hashtags.utils import extract_hashtags
 
+celery_logger = get_logger(__name__)
+
 DOMAIN_VALIDATOR = RegexValidator(
     regex=URLValidator.host_re, message=_("This is not a valid domain")
 )
@@ -129,7 +134,7 @@ class RequestCommunity:
         return False
 
 
-class Community(TimeStampedModel):
+class Community(TrackerModelMixin, TimeStampedModel):
     domain = models.CharField(
         unique=True, max_length=100, validators=[DOMAIN_VALIDATOR]
     )
@@ -137,6 +142,7 @@ class Community(TimeStampedModel):
     name = models.CharField(max_length=255)
 
     logo = ImageField(upload_to="logo", null=True, blank=True)
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
 
     tagline = models.TextField(blank=True)
 
@@ -173,6 +179,10 @@ class Community(TimeStampedModel):
 
     blacklisted_email_addresses = models.TextField(blank=True)
 
+    thumbnailer = ThumbnailGenerator("logo", ("32", {"format": "PNG"}))
+
+    tracked_fields = ["content_warning_tags"]
+
     objects = CommunityManager()
 
     class Meta:
@@ -181,6 +191,47 @@ class Community(TimeStampedModel):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        should_update_content_warning_tags = (
+            not self._state.adding and self.has_tracker_changed()
+        )
+
+        super().save(*args, **kwargs)
+
+        if should_update_content_warning_tags:
+            self.reset_tracker()
+            transaction.on_commit(self.schedule_content_warning_tags_update)
+
+    def schedule_content_warning_tags_update(self):
+        """Queues celery task to recalculate content warning tags of all
+        activities in the community.
+        """
+        # Localhub
+        from localhub.activities import tasks
+
+        try:
+            return tasks.update_community_content_warning_tags.delay(self.id)
+        except tasks.update_community_content_warning_tags.OperationalError as e:
+            celery_logger.exception(e)
+
+    def schedule_deletion(self):
+        """Deactivates the community immediately, and queues celery task to
+        delete it with all content and memberships.
+        """
+        # Local
+        from . import tasks
+
+        self.active = False
+        self.save(update_fields=["active"])
+
+        def _schedule():
+            try:
+                tasks.delete_community.delay(self.id)
+            except tasks.delete_community.OperationalError as e:
+                celery_logger.exception(e)
+
+        transaction.on_commit(_schedule)
+
     def get_absolute_url(self):
         protocol = "https" if settings.SECURE_SSL_REDIRECT else "http"
         return f"{protocol}://{self.domain}"
@@ -0,0 +1,377 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Bulk moderation of activities and comments, e.g. removing all content
+posted by a spammer, or a selection of flagged content.
+
+Content is handled in chunks of primary keys. For each chunk the content
+is soft deleted (or deleted) and related bookmarks, likes, flags and
+notifications are removed with a few set-based statements, rather than
+one object at a time. Owners of soft deleted content are notified in a
+single batch for each chunk.
+
+Large jobs should be run in a celery task (see schedule_moderation_job).
+Progress is kept in the cache, so it can be shown to the moderator.
+"""
+
+# Standard Library
+import uuid
+
+# Django
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+# Third Party Libraries
+from celery.utils.log import get_logger
+
+# Localhub
+from localhub.activities import signals as activity_signals
+from localhub.activities.utils import get_activity_models
+from localhub.bookmarks.models import Bookmark
+from localhub.comments.models import Comment
+from localhub.flags.models import Flag
+from localhub.likes.models import Like
+from localhub.notifications.decorators import notify
+from localhub.notifications.models import Notification
+
+# Local
+from .cache import bump_content_version
+
+celery_logger = get_logger(__name__)
+
+
+class JobStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+def chunked(pks, size):
+    """
+    Args:
+        pks (list): primary keys
+        size (int): max chunk size
+
+    Yields:
+        list
+    """
+    for offset in range(0, len(pks), size):
+        yield pks[offset : offset + size]
+
+
+def get_job_key(job_id):
+    return f"communities.moderation-job:{job_id}"
+
+
+def get_job_progress(job_id):
+    """
+    Args:
+        job_id (str)
+
+    Returns:
+        dict or None: community_id, status, done and total
+    """
+    return cache.get(get_job_key(job_id))
+
+
+def set_job_progress(job_id, **progress):
+    """Updates stored progress of job.
+
+    Args:
+        job_id (str)
+        **progress: any of community_id, status, done or total
+    """
+    cache.set(
+        get_job_key(job_id),
+        {**(get_job_progress(job_id) or {}), **progress},
+        settings.MODERATION_JOB_TIMEOUT,
+    )
+
+
+def delete_related(content_type, pks, *models):
+    """Deletes rows of generic relations (e.g. likes) of objects.
+
+    Args:
+        content_type (ContentType): content type of objects
+        pks (list): primary keys of objects
+        *models: related Model classes
+    """
+    for model in models:
+        model.objects.filter(content_type=content_type, object_id__in=pks).delete()
+
+
+def notify_owners(objects, moderator):
+    """Sends "delete" notifications to owners of soft deleted objects in a
+    single batch. Owners are not notified if they are the moderator.
+
+    Args:
+        objects (list): Activity or Comment instances
+        moderator (User)
+
+    Returns:
+        list: Notification instances
+    """
+
+    @notify
+    def notify_on_delete():
+        return [
+            Notification(
+                content_object=obj,
+                recipient_id=obj.owner_id,
+                actor=moderator,
+                community_id=obj.community_id,
+                verb="delete",
+            )
+            for obj in objects
+            if obj.owner_id != moderator.id
+        ]
+
+    return notify_on_delete()
+
+
+@transaction.atomic
+def soft_delete_activities(model, pks, moderator):
+    """Soft deletes activities, as Activity.soft_delete() and
+    notify_on_delete() would for each activity.
+
+    Args:
+        model (Activity class)
+        pks (list): primary keys
+        moderator (User)
+
+    Returns:
+        int: number of activities soft deleted
+    """
+    activities = list(
+        model.objects.filter(pk__in=pks, deleted__isnull=True).select_for_update()
+    )
+    if not activities:
+        return 0
+
+    pks = [activity.pk for activity in activities]
+    now = timezone.now()
+
+    model.objects.filter(pk__in=pks).update(deleted=now, published=None, modified=now)
+
+    content_type = ContentType.objects.get_for_model(model)
+
+    Comment.objects.filter(
+        content_type=content_type, object_id__in=pks
+    ).remove_content_objects()
+
+    delete_related(content_type, pks, Bookmark, Like, Flag, Notification)
+
+    for activity in activities:
+        activity.deleted = now
+        activity.published = None
+        activity_signals.soft_delete.send(sender=model, instance=activity)
+
+    notify_owners(activities, moderator)
+    return len(activities)
+
+
+@transaction.atomic
+def soft_delete_comments(pks, moderator):
+    """Soft deletes comments, as Comment.soft_delete() and notify_on_delete()
+    would for each comment.
+
+    Args:
+        pks (list): primary keys
+        moderator (User)
+
+    Returns:
+        int: number of comments soft deleted
+    """
+    comments = list(
+        Comment.objects.filter(pk__in=pks, deleted__isnull=True).select_for_update()
+    )
+    if not comments:
+        return 0
+
+    pks = [comment.pk for comment in comments]
+    now = timezone.now()
+
+    Comment.objects.filter(pk__in=pks).update(deleted=now, modified=now)
+
+    delete_related(
+        ContentType.objects.get_for_model(Comment), pks, Like, Flag, Notification
+    )
+
+    for comment in comments:
+        comment.deleted = now
+
+    notify_owners(comments, moderator)
+    return len(comments)
+
+
+@transaction.atomic
+def delete_activities(model, pks):
+    """Deletes activities, as Activity.delete() would for each activity.
+
+    Args:
+        model (Activity class)
+        pks (list): primary keys
+
+    Returns:
+        int: number of activities deleted
+    """
+    Comment.objects.filter(
+        content_type=ContentType.objects.get_for_model(model), object_id__in=pks
+    ).remove_content_objects()
+
+    _, num_deleted = model.objects.filter(pk__in=pks).delete()
+    return num_deleted.get(model._meta.label, 0)
+
+
+@transaction.atomic
+def delete_comments(pks):
+    """
+    Args:
+        pks (list): primary keys
+
+    Returns:
+        int: number of comments deleted
+    """
+    _, num_deleted = Comment.objects.filter(pk__in=pks).delete()
+    return num_deleted.get(Comment._meta.label, 0)
+
+
+def get_user_content(community, user):
+    """Returns primary keys of all activities and comments by user in
+    community that have not been soft deleted.
+
+    Args:
+        community (Community)
+        user (User)
+
+    Returns:
+        dict: model -> list of primary keys
+    """
+    return {
+        model: list(
+            model.objects.filter(
+                community=community, owner=user, deleted__isnull=True
+            ).values_list("pk", flat=True)
+        )
+        for model in get_activity_models() + [Comment]
+    }
+
+
+def get_flagged_content(community, flags):
+    """Returns primary keys of flagged activities and comments.
+
+    Args:
+        community (Community)
+        flags (QuerySet): Flag QuerySet
+
+    Returns:
+        dict: model -> list of primary keys
+    """
+    content = {}
+    for content_type_id, object_id in (
+        flags.filter(community=community)
+        .values_list("content_type", "object_id")
+        .distinct()
+    ):
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        content.setdefault(model, []).append(object_id)
+    return content
+
+
+def moderate_content(
+    community, moderator, content, *, purge=False, batch_size=None, progress=None
+):
+    """Soft deletes (or deletes if purge) content in chunks.
+
+    Args:
+        community (Community)
+        moderator (User)
+        content (dict): model -> list of primary keys, e.g. from get_user_content()
+        purge (bool, optional): delete rather than soft delete (default: False)
+        batch_size (int, optional): objects in each chunk (default:
+            settings.MODERATION_BATCH_SIZE)
+        progress (callable, optional): called with (done, total) after each chunk
+
+    Returns:
+        int: number of objects soft deleted or deleted
+    """
+    batch_size = batch_size or settings.MODERATION_BATCH_SIZE
+    total = sum(len(pks) for pks in content.values())
+    done = num_moderated = 0
+
+    for model, pks in content.items():
+        for chunk in chunked(pks, batch_size):
+            if model is Comment:
+                num_moderated += (
+                    delete_comments(chunk)
+                    if purge
+                    else soft_delete_comments(chunk, moderator)
+                )
+            elif purge:
+                num_moderated += delete_activities(model, chunk)
+            else:
+                num_moderated += soft_delete_activities(model, chunk, moderator)
+
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+
+    if num_moderated:
+        bump_content_version(community.id)
+
+    return num_moderated
+
+
+def schedule_moderation_job(
+    community, moderator, *, user=None, flags=None, purge=False
+):
+    """Queues celery task to moderate all content by a user, or all flagged
+    content.
+
+    Args:
+        community (Community)
+        moderator (User)
+        user (User, optional): moderate all content by this user
+        flags (QuerySet, optional): moderate content with these flags
+        purge (bool, optional): delete rather than soft delete (default: False)
+
+    Returns:
+        str: job id, used to check progress
+    """
+    # Local
+    from . import tasks
+
+    job_id = uuid.uuid4().hex
+    set_job_progress(
+        job_id,
+        community_id=community.id,
+        status=JobStatus.PENDING,
+        done=0,
+        total=None,
+    )
+
+    kwargs = {
+        "job_id": job_id,
+        "community_id": community.id,
+        "moderator_id": moderator.id,
+        "user_id": user.id if user else None,
+        "flag_ids": list(flags.values_list("pk", flat=True))
+        if flags is not None
+        else None,
+        "purge": purge,
+    }
+
+    def _schedule():
+        try:
+            tasks.moderate_content.delay(**kwargs)
+        except tasks.moderate_content.OperationalError as e:
+            celery_logger.exception(e)
+            set_job_progress(job_id, status=JobStatus.FAILED)
+
+    transaction.on_commit(_schedule)
+    return job_id
@@ -72,3 +72,9 @@ rules.add_perm(
     "communities.delete_membership",
     is_admin_member | is_self,
 )
+
+# removes member and all their content
+rules.add_perm(
+    "communities.remove_membership",
+    is_admin_member & ~is_self,
+)
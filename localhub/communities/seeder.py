@@ -0,0 +1,618 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Generates large synthetic communities for load testing and benchmarks.
+
+All rows are inserted with bulk_create() in batches, and search documents
+are updated with a single UPDATE for each model, so no model save() methods
+or signals are run: no thumbnails, notification emails or webpushes.
+"""
+
+# Standard Library
+import io
+import itertools
+import random
+from datetime import timedelta
+
+# Django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchVector
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+# Third Party Libraries
+from faker import Faker
+from PIL import Image
+from taggit.models import Tag, TaggedItem
+
+# Localhub
+from localhub.activities.events.models import Event
+from localhub.activities.photos.models import Photo
+from localhub.activities.polls.models import Answer, Poll
+from localhub.activities.posts.models import Post
+from localhub.bookmarks.models import Bookmark
+from localhub.comments.models import Comment
+from localhub.flags.models import Flag
+from localhub.likes.models import Like
+from localhub.notifications.models import Notification
+from localhub.private_messages.models import Message
+
+# Local
+from .models import Membership
+
+ACTIVITY_MODELS = {
+    Post: 0.6,
+    Photo: 0.2,
+    Event: 0.1,
+    Poll: 0.1,
+}
+
+ACTIVITY_DESCRIPTION_VECTOR = SearchVector(
+    "description", "hashtags", "mentions", weight="B"
+)
+
+SEARCH_VECTORS = {
+    Post: SearchVector("title", weight="A") + ACTIVITY_DESCRIPTION_VECTOR,
+    Photo: SearchVector("title", weight="A") + ACTIVITY_DESCRIPTION_VECTOR,
+    Poll: SearchVector("title", weight="A") + ACTIVITY_DESCRIPTION_VECTOR,
+    Event: SearchVector("title", weight="A")
+    + SearchVector("venue", "street_address", "locality", weight="B")
+    + SearchVector("description", "hashtags", "mentions", weight="C"),
+    Comment: SearchVector("content", weight="A"),
+    Message: SearchVector("message", weight="A"),
+    get_user_model(): SearchVector("username", weight="A")
+    + SearchVector("name", weight="B")
+    + SearchVector("bio", weight="C"),
+}
+
+
+def chunked(iterable, size):
+    """Splits iterable into lists of max size.
+
+    Args:
+        iterable (iterable)
+        size (int): max size of each list
+
+    Yields:
+        list
+    """
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+class SkewedChoice:
+    """Chooses items with a Zipf-like distribution: the item at position n
+    is chosen with weight 1 / (n + 1) ** exponent, so a few items (e.g. the
+    most active users or most popular posts) are chosen far more often than
+    the rest.
+    """
+
+    def __init__(self, items, rnd, exponent=1.0):
+        self.items = list(items)
+        self.random = rnd
+        self.cum_weights = list(
+            itertools.accumulate(
+                1 / (n + 1) ** exponent for n in range(len(self.items))
+            )
+        )
+
+    def choice(self):
+        return self.choices(1)[0]
+
+    def choices(self, k):
+        return self.random.choices(self.items, cum_weights=self.cum_weights, k=k)
+
+    def sample(self, k):
+        """Returns up to k unique items.
+
+        Args:
+            k (int): max number of items
+
+        Returns:
+            list
+        """
+        return list(dict.fromkeys(self.choices(k * 2)))[:k]
+
+
+class CommunitySeeder:
+    """Populates a community with users, activities, comments, likes,
+    bookmarks, flags, messages and notifications.
+
+    Args:
+        community (Community)
+        num_users (int): number of new members
+        num_activities (int): number of posts, photos, events and polls
+        comments_per_activity (float): average comments per activity
+        likes_per_activity (float): average likes per activity
+        messages_per_user (float): average messages sent per user
+        seed (int, optional): random seed, for repeatable datasets
+        batch_size (int, optional): rows per INSERT (default: 5000)
+        log (callable, optional): called with progress messages
+    """
+
+    def __init__(
+        self,
+        community,
+        num_users,
+        num_activities,
+        comments_per_activity=2,
+        likes_per_activity=5,
+        messages_per_user=2,
+        seed=None,
+        batch_size=5000,
+        log=None,
+    ):
+        self.community = community
+        self.warning_tags = community.get_content_warning_tags()
+        self.num_users = num_users
+        self.num_activities = num_activities
+        self.comments_per_activity = comments_per_activity
+        self.likes_per_activity = likes_per_activity
+        self.messages_per_user = messages_per_user
+        self.batch_size = batch_size
+        self.log = log or (lambda msg: None)
+
+        self.random = random.Random(seed)
+        self.faker = Faker()
+        self.faker.seed_instance(seed)
+
+        self.now = timezone.now()
+        self.counts = {}
+
+    def seed(self):
+        """Generates the complete dataset.
+
+        Returns:
+            dict: number of rows inserted for each model
+        """
+        self.words = [
+            word.lower()
+            for word in self.faker.words(500, unique=True)
+            if word.isalpha()
+        ]
+
+        self.create_users()
+        self.create_tags()
+        self.create_follows()
+        self.create_activities()
+        self.create_comments()
+        self.create_likes()
+        self.create_bookmarks()
+        self.create_flags()
+        self.create_messages()
+        self.create_notifications()
+        self.update_search_documents()
+
+        return self.counts
+
+    def insert(self, model, rows, **kwargs):
+        """Inserts (instance, data) rows in batches.
+
+        Args:
+            model (Model class)
+            rows (iterable): (instance, data) tuples, where data is any
+                value to be returned with the new primary key.
+            **kwargs: bulk_create() arguments e.g. ignore_conflicts
+
+        Returns:
+            List[Tuple[int, any]]: (primary key, data)
+        """
+        inserted = []
+        for batch in chunked(rows, self.batch_size):
+            instances = model.objects.bulk_create(
+                [instance for instance, _ in batch], **kwargs
+            )
+            inserted += [
+                (instance.pk, data) for instance, (_, data) in zip(instances, batch)
+            ]
+        self.counts[model._meta.label] = self.counts.get(model._meta.label, 0) + len(
+            inserted
+        )
+        self.log(f"{len(inserted)} {model._meta.verbose_name_plural} created")
+        return inserted
+
+    def get_count(self, mean):
+        """Returns random count with exponential distribution, so most
+        counts are small and a few are large.
+
+        Args:
+            mean (float): mean count
+
+        Returns:
+            int
+        """
+        return int(self.random.expovariate(1 / mean) + self.random.random())
+
+    def get_random_date(self, days=365):
+        return self.now - timedelta(seconds=self.random.randint(0, days * 24 * 3600))
+
+    def get_text(self, min_words=3, max_words=12):
+        return " ".join(
+            self.random.choices(self.words, k=self.random.randint(min_words, max_words))
+        ).capitalize()
+
+    def get_description(self, hashtags, mentions):
+        return " ".join(
+            [self.get_text(10, 60) + "."]
+            + [f"#{tag}" for tag in hashtags]
+            + [f"@{username}" for username in mentions]
+        )
+
+    def create_users(self):
+        User = get_user_model()
+
+        # password hashing is slow, so share one hash between all users
+        password = make_password("password")
+        prefix = f"c{self.community.id}-{self.faker.pystr(max_chars=6).lower()}-"
+
+        rows = (
+            (
+                User(
+                    username=f"{prefix}{counter}",
+                    email=f"{prefix}{counter}@{self.community.domain}",
+                    name=self.faker.name(),
+                    bio=self.get_text(0, 30),
+                    password=password,
+                ),
+                f"{prefix}{counter}",
+            )
+            for counter in range(self.num_users)
+        )
+
+        # users are ordered by activity: the first users create most
+        # content and have the most followers
+        self.users = self.insert(User, rows)
+        self.user_ids = [pk for pk, _ in self.users]
+        self.usernames = dict(self.users)
+
+        self.active_users = SkewedChoice(self.user_ids, self.random)
+
+        self.insert(
+            Membership,
+            (
+                (
+                    Membership(
+                        member_id=user_id,
+                        community=self.community,
+                        role=Membership.Role.ADMIN
+                        if counter == 0
+                        else Membership.Role.MEMBER,
+                    ),
+                    None,
+                )
+                for counter, user_id in enumerate(self.user_ids)
+            ),
+        )
+
+    def create_tags(self):
+        Tag.objects.bulk_create(
+            [Tag(name=word, slug=word) for word in self.words], ignore_conflicts=True
+        )
+        self.tags = dict(
+            Tag.objects.filter(name__in=self.words).values_list("name", "pk")
+        )
+        self.popular_tags = SkewedChoice(self.words, self.random)
+
+    def create_follows(self):
+        User = get_user_model()
+
+        def generate_follows():
+            for user_id in self.user_ids:
+                for followed_id in self.active_users.sample(self.get_count(20)):
+                    if followed_id != user_id:
+                        yield User.following.through(
+                            from_user_id=user_id, to_user_id=followed_id
+                        ), None
+
+        def generate_blocks():
+            for user_id in self.random.sample(self.user_ids, len(self.user_ids) // 50):
+                blocked_id = self.random.choice(self.user_ids)
+                if blocked_id != user_id:
+                    yield User.blocked.through(
+                        from_user_id=user_id, to_user_id=blocked_id
+                    ), None
+
+        def generate_tag_follows():
+            for user_id in self.user_ids:
+                for tag in self.popular_tags.sample(self.get_count(3)):
+                    yield User.following_tags.through(
+                        user_id=user_id, tag_id=self.tags[tag]
+                    ), None
+
+        self.insert(User.following.through, generate_follows(), ignore_conflicts=True)
+        self.insert(User.blocked.through, generate_blocks(), ignore_conflicts=True)
+        self.insert(
+            User.following_tags.through,
+            generate_tag_follows(),
+            ignore_conflicts=True,
+        )
+
+    def create_activities(self):
+        self.activities = []
+
+        for model, weight in ACTIVITY_MODELS.items():
+            content_type = ContentType.objects.get_for_model(model)
+            activities = self.insert(
+                model,
+                (
+                    self.make_activity(model)
+                    for _ in range(round(self.num_activities * weight))
+                ),
+            )
+
+            self.insert(
+                TaggedItem,
+                (
+                    (
+                        TaggedItem(
+                            content_type=content_type,
+                            object_id=pk,
+                            tag_id=self.tags[tag],
+                        ),
+                        None,
+                    )
+                    for pk, (_, hashtags, _) in activities
+                    for tag in hashtags
+                ),
+            )
+
+            if model is Poll:
+                self.create_answers([pk for pk, _ in activities])
+
+            self.activities += [
+                (content_type.id, pk, owner_id, mentions)
+                for pk, (owner_id, _, mentions) in activities
+            ]
+
+        # most popular activities get most comments, likes etc.
+        self.random.shuffle(self.activities)
+        self.popular_activities = SkewedChoice(
+            self.activities, self.random, exponent=0.8
+        )
+
+    def make_activity(self, model):
+        owner_id = self.active_users.choice()
+        published = self.get_random_date()
+
+        hashtags = set(self.popular_tags.sample(self.random.choice((0, 0, 1, 2, 3))))
+        mentions = set(
+            self.usernames[user_id]
+            for user_id in self.active_users.sample(self.random.choice((0, 0, 0, 1)))
+            if user_id != owner_id
+        )
+
+        fields = {
+            "community": self.community,
+            "owner_id": owner_id,
+            "title": self.get_text(),
+            "description": self.get_description(hashtags, mentions),
+            "hashtags": " ".join(f"#{tag}" for tag in sorted(hashtags)),
+            "mentions": " ".join(f"@{username}" for username in sorted(mentions)),
+            "content_warning_tags": sorted(hashtags & self.warning_tags),
+            "created": published,
+            "published": published,
+        }
+
+        if model is Photo:
+            fields["image"] = self.get_image()
+        elif model is Event:
+            fields.update(
+                {
+                    "starts": published + timedelta(days=self.random.randint(1, 60)),
+                    "venue": self.faker.company(),
+                    "street_address": self.faker.street_address(),
+                    "locality": self.faker.city(),
+                }
+            )
+        elif model is Post and self.random.random() < 0.3:
+            fields["url"] = self.faker.url()
+
+        return model(**fields), (owner_id, hashtags, mentions)
+
+    def get_image(self):
+        if not hasattr(self, "image"):
+            fp = io.BytesIO()
+            Image.new("RGB", size=(800, 600), color="blue").save(fp, "JPEG")
+            self.image = default_storage.save(
+                "photos/seed.jpg", ContentFile(fp.getvalue())
+            )
+        return self.image
+
+    def create_answers(self, poll_ids):
+        answers = self.insert(
+            Answer,
+            (
+                (Answer(poll_id=poll_id, description=self.get_text(1, 5)), None)
+                for poll_id in poll_ids
+                for _ in range(self.random.randint(2, 4))
+            ),
+        )
+
+        self.insert(
+            Answer.voters.through,
+            (
+                (Answer.voters.through(answer_id=answer_id, user_id=user_id), None)
+                for answer_id, _ in answers
+                for user_id in self.active_users.sample(self.get_count(5))
+            ),
+            ignore_conflicts=True,
+        )
+
+    def create_comments(self):
+        def generate_comments():
+            for content_type_id, object_id, owner_id, _ in (
+                self.popular_activities.choices(
+                    round(len(self.activities) * self.comments_per_activity)
+                )
+                if self.activities
+                else []
+            ):
+                user_id = self.active_users.choice()
+                yield Comment(
+                    community=self.community,
+                    owner_id=user_id,
+                    content_type_id=content_type_id,
+                    object_id=object_id,
+                    content=self.get_text(3, 40),
+                    created=self.get_random_date(),
+                ), (content_type_id, object_id, owner_id, user_id)
+
+        self.comments = self.insert(Comment, generate_comments())
+
+    def generate_reactions(self, per_activity):
+        """Generates unique (user, activity) pairs, excluding owners.
+
+        Args:
+            per_activity (float): average number for each activity
+
+        Yields:
+            Tuple[int, int, int, int]: user id, content type id, object id, owner id
+        """
+        for content_type_id, object_id, owner_id, _ in self.activities:
+            for user_id in self.active_users.sample(self.get_count(per_activity)):
+                if user_id != owner_id:
+                    yield user_id, content_type_id, object_id, owner_id
+
+    def create_likes(self):
+        self.likes = self.insert(
+            Like,
+            (
+                (
+                    Like(
+                        community=self.community,
+                        user_id=user_id,
+                        recipient_id=owner_id,
+                        content_type_id=content_type_id,
+                        object_id=object_id,
+                    ),
+                    (content_type_id, object_id, owner_id, user_id),
+                )
+                for user_id, content_type_id, object_id, owner_id in self.generate_reactions(
+                    self.likes_per_activity
+                )
+            ),
+        )
+
+    def create_bookmarks(self):
+        self.insert(
+            Bookmark,
+            (
+                (
+                    Bookmark(
+                        community=self.community,
+                        user_id=user_id,
+                        content_type_id=content_type_id,
+                        object_id=object_id,
+                    ),
+                    None,
+                )
+                for user_id, content_type_id, object_id, _ in self.generate_reactions(
+                    self.likes_per_activity / 5
+                )
+            ),
+        )
+
+    def create_flags(self):
+        self.insert(
+            Flag,
+            (
+                (
+                    Flag(
+                        community=self.community,
+                        user_id=user_id,
+                        content_type_id=content_type_id,
+                        object_id=object_id,
+                        reason=self.random.choice(Flag.Reason.values),
+                    ),
+                    None,
+                )
+                for user_id, content_type_id, object_id, _ in self.generate_reactions(
+                    0.01
+                )
+            ),
+        )
+
+    def create_messages(self):
+        def generate_messages():
+            for _ in range(round(self.num_users * self.messages_per_user)):
+                sender_id, recipient_id = self.active_users.choices(2)
+                if sender_id != recipient_id:
+                    sent = self.get_random_date()
+                    yield Message(
+                        community=self.community,
+                        sender_id=sender_id,
+                        recipient_id=recipient_id,
+                        message=self.get_text(3, 40),
+                        created=sent,
+                        read=sent if self.random.random() < 0.7 else None,
+                    ), None
+
+        self.insert(Message, generate_messages())
+
+    def create_notifications(self):
+        comment_type = ContentType.objects.get_for_model(Comment)
+
+        def make_notification(content_type_id, object_id, recipient_id, actor_id, verb):
+            created = self.get_random_date(days=90)
+            return (
+                Notification(
+                    community=self.community,
+                    content_type_id=content_type_id,
+                    object_id=object_id,
+                    recipient_id=recipient_id,
+                    actor_id=actor_id,
+                    verb=verb,
+                    is_read=self.random.random() < 0.6,
+                    created=created,
+                    modified=created,
+                ),
+                None,
+            )
+
+        def generate_notifications():
+            for content_type_id, object_id, owner_id, user_id in (
+                data for _, data in self.likes
+            ):
+                yield make_notification(
+                    content_type_id, object_id, owner_id, user_id, "like"
+                )
+
+            for comment_id, (_, _, owner_id, user_id) in self.comments:
+                if owner_id != user_id:
+                    yield make_notification(
+                        comment_type.id, comment_id, owner_id, user_id, "new_comment"
+                    )
+
+            user_ids = {username: pk for pk, username in self.users}
+
+            for content_type_id, object_id, owner_id, mentions in self.activities:
+                for username in mentions:
+                    yield make_notification(
+                        content_type_id,
+                        object_id,
+                        user_ids[username],
+                        owner_id,
+                        "mention",
+                    )
+
+        self.insert(Notification, generate_notifications())
+
+    def update_search_documents(self):
+        """Updates search documents of all new rows in a single UPDATE for
+        each model, rather than one for each row.
+        """
+        for model, vector in SEARCH_VECTORS.items():
+            queryset = model.objects.filter(search_document__isnull=True)
+            if model is get_user_model():
+                queryset = queryset.filter(membership__community=self.community)
+            else:
+                queryset = queryset.filter(community=self.community)
+            num_updated = queryset.update(search_document=vector)
+            self.log(
+                f"{num_updated} {model._meta.verbose_name_plural} search documents updated"
+            )
@@ -4,14 +4,19 @@
 # Django
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 # Localhub
+from localhub.activities.utils import get_activity_models
+from localhub.comments.models import Comment
 from localhub.join_requests.models import JoinRequest
+from localhub.likes.models import Like
+from localhub.users.models import User
 
 # Local
-from .models import Membership
+from .cache import bump_content_version
+from .models import Community, Membership
 
 
 @receiver(
@@ -33,3 +38,48 @@ def membership_deleted(instance, **kwargs):
             pass
 
     transaction.on_commit(cleanup)
+
+
+def content_changed(instance, **kwargs):
+    """
+    Invalidates cached pages and validators of the community when
+    activities or comments are published, edited, commented on, liked or
+    deleted, or when members join or leave.
+    """
+    transaction.on_commit(lambda: bump_content_version(instance.community_id))
+
+
+for model in get_activity_models() + [Comment, Like, Membership]:
+    for signal in (post_save, post_delete):
+        signal.connect(
+            content_changed,
+            sender=model,
+            dispatch_uid=f"communities.content_changed.{model._meta.label}",
+        )
+
+
+@receiver(post_save, sender=Community, dispatch_uid="communities.community_saved")
+def community_saved(instance, **kwargs):
+    """
+    Invalidates cached pages of the community when e.g. the name, logo or
+    description are changed.
+    """
+    transaction.on_commit(lambda: bump_content_version(instance.id))
+
+
+@receiver(post_save, sender=User, dispatch_uid="communities.user_saved")
+def user_saved(instance, created, **kwargs):
+    """
+    Invalidates cached pages of all communities of the user when their
+    profile (e.g. avatar or name) is changed, or the account is deactivated.
+    """
+    if created or not (instance.has_tracker_changed() or not instance.is_active):
+        return
+
+    transaction.on_commit(
+        lambda: bump_content_version(
+            *Membership.objects.filter(member=instance).values_list(
+                "community", flat=True
+            )
+        )
+    )
@@ -0,0 +1,96 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.contrib.auth import get_user_model
+
+# Third Party Libraries
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+# Localhub
+from localhub.common.db.deletion import DELETION_TASK_OPTIONS, delete_object_in_chunks
+from localhub.flags.models import Flag
+
+# Local
+from . import moderation
+from .models import Community
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(name="localhub.communities.moderate_content")
+def moderate_content(
+    job_id, community_id, moderator_id, user_id=None, flag_ids=None, purge=False
+):
+    """Soft deletes (or deletes) all content by a user, or all flagged
+    content, in a community. Progress is stored under the job id.
+
+    Args:
+        job_id (str): moderation job id
+        community_id (int): Community primary key
+        moderator_id (int): primary key of user running the job
+        user_id (int, optional): moderate all content by this user
+        flag_ids (list, optional): moderate content with these flags
+        purge (bool, optional): delete rather than soft delete (default: False)
+    """
+    User = get_user_model()
+
+    try:
+        community = Community.objects.get(pk=community_id)
+        moderator = User.objects.get(pk=moderator_id)
+    except (Community.DoesNotExist, User.DoesNotExist):
+        logger.info("Moderation job %s: community or moderator not found", job_id)
+        moderation.set_job_progress(job_id, status=moderation.JobStatus.FAILED)
+        return
+
+    if user_id:
+        content = moderation.get_user_content(community, User(pk=user_id))
+    else:
+        content = moderation.get_flagged_content(
+            community, Flag.objects.filter(pk__in=flag_ids or [])
+        )
+
+    moderation.set_job_progress(
+        job_id,
+        status=moderation.JobStatus.RUNNING,
+        done=0,
+        total=sum(len(pks) for pks in content.values()),
+    )
+
+    try:
+        num_moderated = moderation.moderate_content(
+            community,
+            moderator,
+            content,
+            purge=purge,
+            progress=lambda done, total: moderation.set_job_progress(job_id, done=done),
+        )
+    except Exception:
+        moderation.set_job_progress(job_id, status=moderation.JobStatus.FAILED)
+        raise
+
+    moderation.set_job_progress(job_id, status=moderation.JobStatus.DONE)
+
+    logger.info(
+        "Moderation job %s: %d objects moderated in community %s",
+        job_id,
+        num_moderated,
+        community_id,
+    )
+
+
+@shared_task(name="localhub.communities.delete_community", **DELETION_TASK_OPTIONS)
+def delete_community(community_id):
+    """Deletes inactive community with all related rows in chunks. Can be
+    run again if interrupted.
+
+    Args:
+        community_id (int): Community primary key
+    """
+    if Community.objects.filter(pk=community_id, active=True).exists():
+        logger.info("Community %s is active, not deleted", community_id)
+        return
+
+    if delete_object_in_chunks(Community, community_id):
+        logger.info("Community %s deleted", community_id)
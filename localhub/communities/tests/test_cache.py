@@ -0,0 +1,251 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotFound
+from django.urls import reverse
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.posts.factories import PostFactory
+from localhub.activities.views import streams
+from localhub.likes.factories import LikeFactory
+from localhub.users.factories import UserFactory
+from localhub.users.models import User
+
+# Local
+from ..cache import (
+    bump_content_version,
+    cache_anonymous_page,
+    get_content_version,
+    get_page_cache_key,
+)
+from ..factories import CommunityFactory, MembershipFactory
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("locmem_cache")]
+
+
+@pytest.fixture
+def make_request(rf, community, anonymous_user):
+    def _make_request(path="/", user=None, **extra):
+        req = rf.get(path, **extra)
+        req.user = user or anonymous_user
+        req.community = community
+        req.LANGUAGE_CODE = "en"
+        return req
+
+    return _make_request
+
+
+@pytest.fixture
+def run_signals_on_commit(mocker):
+    return mocker.patch(
+        "localhub.communities.signals.transaction.on_commit",
+        side_effect=lambda func: func(),
+    )
+
+
+@pytest.fixture
+def view(mocker):
+    mock = mocker.Mock(side_effect=lambda request: HttpResponse("ok"))
+    return mock, cache_anonymous_page(mock)
+
+
+class TestContentVersion:
+    def test_get_content_version(self, community):
+        version = get_content_version(community.id)
+        assert version
+        assert get_content_version(community.id) == version
+
+    def test_bump_content_version(self, community):
+        version = get_content_version(community.id)
+        bump_content_version(community.id)
+        assert get_content_version(community.id) != version
+
+    def test_bump_content_version_if_missing(self, community):
+        bump_content_version(community.id)
+        assert get_content_version(community.id)
+
+    def test_bump_content_version_of_many_communities(self, community):
+        other = CommunityFactory()
+        versions = [get_content_version(community.id), get_content_version(other.id)]
+        bump_content_version(community.id, other.id)
+        assert get_content_version(community.id) != versions[0]
+        assert get_content_version(other.id) != versions[1]
+
+    def test_bump_on_activity_saved(self, run_signals_on_commit, community):
+        version = get_content_version(community.id)
+        PostFactory(community=community)
+        assert get_content_version(community.id) > version
+
+    def test_bump_on_like_saved(self, run_signals_on_commit, post):
+        version = get_content_version(post.community_id)
+        LikeFactory(content_object=post, community=post.community)
+        assert get_content_version(post.community_id) > version
+
+    def test_bump_on_membership_deleted(self, run_signals_on_commit, member):
+        version = get_content_version(member.community_id)
+        member.delete()
+        assert get_content_version(member.community_id) > version
+
+    def test_bump_on_community_saved(self, run_signals_on_commit, community):
+        version = get_content_version(community.id)
+        community.name = "changed"
+        community.save()
+        assert get_content_version(community.id) > version
+
+    def test_bump_on_user_profile_changed(self, run_signals_on_commit, member):
+        other = MembershipFactory(member=member.member).community
+        versions = [
+            get_content_version(member.community_id),
+            get_content_version(other.id),
+        ]
+
+        user = User.objects.get(pk=member.member_id)
+        user.name = "changed"
+        user.save()
+
+        assert get_content_version(member.community_id) > versions[0]
+        assert get_content_version(other.id) > versions[1]
+
+    def test_bump_on_user_deactivated(self, run_signals_on_commit, member):
+        version = get_content_version(member.community_id)
+
+        user = User.objects.get(pk=member.member_id)
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+
+        assert get_content_version(member.community_id) > version
+
+    def test_no_bump_if_user_profile_not_changed(self, run_signals_on_commit, member):
+        version = get_content_version(member.community_id)
+
+        user = User.objects.get(pk=member.member_id)
+        user.save(update_fields=["last_login"])
+
+        assert get_content_version(member.community_id) == version
+
+    def test_no_bump_if_new_user(self, run_signals_on_commit, community):
+        version = get_content_version(community.id)
+        UserFactory()
+        assert get_content_version(community.id) == version
+
+
+class TestCacheAnonymousPage:
+    def test_anonymous(self, make_request, view):
+        mock, wrapped = view
+
+        assert wrapped(make_request()).content == b"ok"
+        assert wrapped(make_request()).content == b"ok"
+
+        assert mock.call_count == 1
+
+    def test_authenticated(self, make_request, view, user):
+        mock, wrapped = view
+
+        wrapped(make_request(user=user))
+        wrapped(make_request(user=user))
+
+        assert mock.call_count == 2
+
+    def test_private_community(self, make_request, view, community):
+        mock, wrapped = view
+        community.public = False
+
+        wrapped(make_request())
+        wrapped(make_request())
+
+        assert mock.call_count == 2
+
+    def test_different_query_string(self, make_request, view):
+        mock, wrapped = view
+
+        wrapped(make_request("/", data={"page": 1}))
+        wrapped(make_request("/", data={"page": 2}))
+
+        assert mock.call_count == 2
+
+    def test_content_version_changed(self, make_request, view, community):
+        mock, wrapped = view
+
+        wrapped(make_request())
+        bump_content_version(community.id)
+        wrapped(make_request())
+
+        assert mock.call_count == 2
+
+    def test_not_found(self, make_request, mocker):
+        mock = mocker.Mock(side_effect=lambda request: HttpResponseNotFound())
+        wrapped = cache_anonymous_page(mock)
+
+        wrapped(make_request())
+        wrapped(make_request())
+
+        assert mock.call_count == 2
+
+    def test_locked_with_previous_version(self, make_request, view, community):
+        mock, wrapped = view
+
+        wrapped(make_request())
+        bump_content_version(community.id)
+
+        cache.add(get_page_cache_key(make_request()) + ":lock", 1)
+        assert wrapped(make_request()).content == b"ok"
+
+        assert mock.call_count == 1
+
+    def test_locked_wait_for_page(self, make_request, view, mocker, community):
+        mock, wrapped = view
+        key = get_page_cache_key(make_request())
+
+        cache.add(key + ":lock", 1)
+
+        # page is rendered by another request while waiting
+        mocker.patch(
+            "localhub.communities.cache.time.sleep",
+            side_effect=lambda seconds: cache.set(
+                key,
+                (get_content_version(community.id), HttpResponse("ok")),
+            ),
+        )
+
+        assert wrapped(make_request()).content == b"ok"
+        assert mock.call_count == 0
+
+    def test_locked_wait_timeout(self, make_request, view, settings):
+        mock, wrapped = view
+        settings.PAGE_CACHE_LOCK_TIMEOUT = 0
+
+        cache.add(get_page_cache_key(make_request()) + ":lock", 1)
+
+        assert wrapped(make_request()).content == b"ok"
+        assert mock.call_count == 1
+
+    def test_csrf_token_replaced(self, make_request, mocker):
+        wrapped = cache_anonymous_page(
+            lambda request: HttpResponse(
+                '<input type="hidden" name="csrfmiddlewaretoken" value="first">'
+            )
+        )
+        wrapped(make_request())
+
+        mocker.patch("localhub.communities.cache.get_token", return_value="second")
+        response = wrapped(make_request())
+
+        assert b'value="second"' in response.content
+
+
+class TestCachedViews:
+    def test_activity_stream(self, client, community, mocker):
+        PostFactory(community=community)
+
+        render_activity_stream = mocker.spy(streams, "render_activity_stream")
+
+        first = client.get(reverse("activity_stream"))
+        second = client.get(reverse("activity_stream"))
+
+        assert first.status_code == second.status_code == 200
+        assert render_activity_stream.call_count == 1
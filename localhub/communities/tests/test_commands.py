@@ -7,6 +7,19 @@ from django.core.management.base import CommandError
 
 # Third Party Libraries
 import pytest
+from taggit.models import TaggedItem
+
+# Localhub
+from localhub.activities.events.models import Event
+from localhub.activities.photos.factories import PhotoFactory
+from localhub.activities.photos.models import Photo
+from localhub.activities.polls.models import Answer, Poll
+from localhub.activities.posts.models import Post
+from localhub.comments.models import Comment
+from localhub.likes.models import Like
+from localhub.notifications.models import Notification
+from localhub.private_messages.models import Message
+from localhub.users.factories import UserFactory
 
 # Local
 from ..models import Community, Membership
@@ -50,3 +63,77 @@ class TestCreateCommunity:
         assert community.active
         membership = Membership.objects.get(community=community, member=user)
         assert membership.role == Membership.Role.ADMIN
+
+
+class TestSeedCommunity:
+    def test_seed(self):
+        call_command(
+            "seedcommunity",
+            "seed.localhub.social",
+            users=30,
+            activities=50,
+            seed=1,
+            batch_size=20,
+        )
+
+        community = Community.objects.get(domain="seed.localhub.social")
+        assert Membership.objects.filter(community=community).count() == 30
+
+        assert Post.objects.filter(community=community).count() == 30
+        assert Photo.objects.filter(community=community).count() == 10
+        assert Event.objects.filter(community=community).count() == 5
+        assert Poll.objects.filter(community=community).count() == 5
+        assert Answer.objects.filter(poll__community=community).exists()
+
+        assert Comment.objects.filter(community=community).exists()
+        assert Like.objects.filter(community=community).exists()
+        assert Notification.objects.filter(community=community).exists()
+        assert Message.objects.filter(community=community).exists()
+
+        assert not Post.objects.filter(
+            community=community, search_document__isnull=True
+        ).exists()
+        assert not Comment.objects.filter(
+            community=community, search_document__isnull=True
+        ).exists()
+
+        assert TaggedItem.objects.filter(
+            object_id__in=Post.objects.filter(community=community).exclude(hashtags="")
+        ).exists()
+
+    def test_seed_existing_community(self, community):
+        call_command("seedcommunity", community.domain, users=5, activities=5)
+        assert Membership.objects.filter(community=community).count() == 5
+        assert Community.objects.count() == 1
+
+
+class TestGenerateThumbnails:
+    @pytest.fixture
+    def mock_generate(self, mocker):
+        return mocker.patch(
+            "localhub.communities.management.commands.generatethumbnails.generate_thumbnails_for_batch"
+        )
+
+    def test_generate(self, photo, user, mock_generate):
+        photo.reshare(user)
+        other = PhotoFactory()
+        generated = PhotoFactory()
+        generated.thumbnailer.generate(generated)
+
+        call_command("generatethumbnails", batch_size=1)
+
+        assert mock_generate.delay.call_count == 2
+        mock_generate.delay.assert_any_call("photos.photo", [photo.id])
+        mock_generate.delay.assert_any_call("photos.photo", [other.id])
+
+    def test_generate_for_model(self, photo, mock_generate):
+        UserFactory(avatar=photo.image)
+
+        call_command("generatethumbnails", "users.user")
+
+        mock_generate.delay.assert_called_once()
+        assert mock_generate.delay.call_args[0][0] == "users.user"
+
+    def test_generate_for_model_without_thumbnails(self, mock_generate):
+        with pytest.raises(CommandError):
+            call_command("generatethumbnails", "posts.post")
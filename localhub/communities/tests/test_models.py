@@ -139,6 +139,49 @@ class TestCommunityModel:
         community = Community(content_warning_tags="#nsfw #politics")
         assert community.get_content_warning_tags() == {"nsfw", "politics"}
 
+    def test_save_if_content_warning_tags_changed(self, community, mocker):
+        mocker.patch(
+            "localhub.communities.models.transaction.on_commit",
+            side_effect=lambda func: func(),
+        )
+        mock_task = mocker.patch(
+            "localhub.activities.tasks.update_community_content_warning_tags"
+        )
+        community = Community.objects.get(pk=community.id)
+        community.content_warning_tags = "#nsfw #spoilers"
+        community.save()
+        mock_task.delay.assert_called_once_with(community.id)
+
+    def test_save_if_content_warning_tags_not_changed(self, community, mocker):
+        mocker.patch(
+            "localhub.communities.models.transaction.on_commit",
+            side_effect=lambda func: func(),
+        )
+        mock_task = mocker.patch(
+            "localhub.activities.tasks.update_community_content_warning_tags"
+        )
+        community = Community.objects.get(pk=community.id)
+        community.name = "Changed"
+        community.save()
+        assert not mock_task.delay.called
+
+    def test_schedule_deletion(self, community, run_on_commit, locmem_cache):
+        MembershipFactory(community=community)
+        community.schedule_deletion()
+        assert not Community.objects.filter(pk=community.id).exists()
+        assert not Membership.objects.filter(community=community).exists()
+
+    def test_schedule_deletion_deactivates(self, community):
+        community.schedule_deletion()
+        community.refresh_from_db()
+        assert not community.active
+
+    def test_schedule_deletion_if_reactivated(self, community, run_on_commit, mocker):
+        # reactivated before task is run
+        mocker.patch.object(Community, "save")
+        community.schedule_deletion()
+        assert Community.objects.filter(pk=community.id).exists()
+
     def test_invalid_domain_name(self):
 
         community = Community(name="test", domain="testing")
@@ -0,0 +1,232 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.activities.events.factories import EventFactory
+from localhub.activities.posts.factories import PostFactory
+from localhub.activities.posts.models import Post
+from localhub.bookmarks.factories import BookmarkFactory
+from localhub.comments.factories import CommentFactory
+from localhub.comments.models import Comment
+from localhub.flags.factories import FlagFactory
+from localhub.flags.models import Flag
+from localhub.likes.factories import LikeFactory
+from localhub.likes.models import Like
+from localhub.notifications.models import Notification
+
+# Local
+from ..cache import get_content_version
+from ..factories import MembershipFactory
+from ..moderation import (
+    JobStatus,
+    get_flagged_content,
+    get_job_progress,
+    get_user_content,
+    moderate_content,
+    schedule_moderation_job,
+    set_job_progress,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("locmem_cache")]
+
+
+@pytest.fixture
+def spammer(community):
+    return MembershipFactory(community=community).member
+
+
+class TestGetUserContent:
+    def test_get_user_content(self, community, spammer):
+        post = PostFactory(community=community, owner=spammer)
+        event = EventFactory(community=community, owner=spammer)
+        comment = CommentFactory(community=community, owner=spammer)
+
+        # not included
+        PostFactory(community=community)
+        PostFactory(owner=spammer)
+        PostFactory(community=community, owner=spammer, deleted=post.created)
+
+        content = get_user_content(community, spammer)
+
+        assert content[Post] == [post.id]
+        assert content[type(event)] == [event.id]
+        assert content[Comment] == [comment.id]
+
+
+class TestGetFlaggedContent:
+    def test_get_flagged_content(self, community):
+        post = PostFactory(community=community)
+        comment = CommentFactory(community=community)
+
+        FlagFactory(content_object=post, community=community)
+        FlagFactory(content_object=post, community=community)
+        FlagFactory(content_object=comment, community=community)
+
+        # other community
+        FlagFactory(content_object=PostFactory())
+
+        content = get_flagged_content(community, Flag.objects.all())
+
+        assert content == {Post: [post.id], Comment: [comment.id]}
+
+
+class TestModerateContent:
+    def test_soft_delete(self, community, moderator, spammer, send_webpush_mock):
+        posts = PostFactory.create_batch(3, community=community, owner=spammer)
+        comment = CommentFactory(content_object=posts[0], community=community)
+        spam_comment = CommentFactory(
+            content_object=PostFactory(community=community),
+            community=community,
+            owner=spammer,
+        )
+
+        LikeFactory(content_object=posts[0], community=community)
+        LikeFactory(content_object=spam_comment, community=community)
+        BookmarkFactory(content_object=posts[1], community=community)
+        FlagFactory(content_object=posts[2], community=community)
+        FlagFactory(content_object=spam_comment, community=community)
+
+        version = get_content_version(community.id)
+        progress = []
+
+        num_moderated = moderate_content(
+            community,
+            moderator.member,
+            get_user_content(community, spammer),
+            batch_size=2,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+
+        assert num_moderated == 4
+        assert progress == [(2, 4), (3, 4), (4, 4)]
+
+        for post in posts:
+            post.refresh_from_db()
+            assert post.deleted
+            assert post.published is None
+
+        spam_comment.refresh_from_db()
+        assert spam_comment.deleted
+
+        comment.refresh_from_db()
+        assert comment.content_object is None
+
+        assert not Like.objects.exists()
+        assert not Flag.objects.exists()
+        assert not posts[1].bookmarks.exists()
+
+        assert (
+            Notification.objects.filter(
+                recipient=spammer, actor=moderator.member, verb="delete"
+            ).count()
+            == 4
+        )
+
+        assert get_content_version(community.id) != version
+
+    def test_soft_delete_own_content(self, community, moderator):
+        post = PostFactory(community=community, owner=moderator.member)
+
+        assert moderate_content(community, moderator.member, {Post: [post.id]}) == 1
+
+        post.refresh_from_db()
+        assert post.deleted
+        assert not Notification.objects.filter(verb="delete").exists()
+
+    def test_soft_delete_already_deleted(self, community, moderator):
+        post = PostFactory(community=community)
+        post.soft_delete()
+
+        version = get_content_version(community.id)
+
+        assert moderate_content(community, moderator.member, {Post: [post.id]}) == 0
+        assert get_content_version(community.id) == version
+
+    def test_purge(self, community, moderator, spammer):
+        post = PostFactory(community=community, owner=spammer)
+        comment = CommentFactory(content_object=post, community=community)
+        spam_comment = CommentFactory(community=community, owner=spammer)
+
+        num_moderated = moderate_content(
+            community,
+            moderator.member,
+            get_user_content(community, spammer),
+            purge=True,
+        )
+
+        assert num_moderated == 2
+        assert not Post.objects.filter(pk=post.id).exists()
+        assert not Comment.objects.filter(pk=spam_comment.id).exists()
+
+        comment.refresh_from_db()
+        assert comment.content_object is None
+
+        assert not Notification.objects.filter(verb="delete").exists()
+
+
+class TestScheduleModerationJob:
+    def test_schedule_user(self, community, moderator, spammer, run_on_commit):
+        post = PostFactory(community=community, owner=spammer)
+
+        job_id = schedule_moderation_job(community, moderator.member, user=spammer)
+
+        post.refresh_from_db()
+        assert post.deleted
+
+        progress = get_job_progress(job_id)
+        assert progress["community_id"] == community.id
+        assert progress["status"] == JobStatus.DONE
+        assert progress["done"] == progress["total"] == 1
+
+    def test_schedule_flags(self, community, moderator, run_on_commit):
+        post = PostFactory(community=community)
+        other = PostFactory(community=community)
+        flag = FlagFactory(content_object=post, community=community)
+        FlagFactory(content_object=other, community=community)
+
+        job_id = schedule_moderation_job(
+            community, moderator.member, flags=Flag.objects.filter(pk=flag.id)
+        )
+
+        post.refresh_from_db()
+        assert post.deleted
+
+        other.refresh_from_db()
+        assert not other.deleted
+
+        assert get_job_progress(job_id)["status"] == JobStatus.DONE
+
+    def test_schedule_celery_unavailable(
+        self, community, moderator, spammer, run_on_commit, mocker
+    ):
+        # Local
+        from .. import tasks
+
+        mocker.patch.object(
+            tasks.moderate_content,
+            "delay",
+            side_effect=tasks.moderate_content.OperationalError,
+        )
+
+        job_id = schedule_moderation_job(community, moderator.member, user=spammer)
+
+        assert get_job_progress(job_id)["status"] == JobStatus.FAILED
+
+
+class TestJobProgress:
+    def test_set_job_progress(self):
+        set_job_progress("abc", community_id=1, status=JobStatus.PENDING)
+        set_job_progress("abc", status=JobStatus.RUNNING, done=0, total=10)
+
+        assert get_job_progress("abc") == {
+            "community_id": 1,
+            "status": JobStatus.RUNNING,
+            "done": 0,
+            "total": 10,
+        }
+
+    def test_get_job_progress_if_missing(self):
+        assert get_job_progress("abc") is None
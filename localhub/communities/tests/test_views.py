@@ -11,9 +11,13 @@ from django.urls import reverse
 # Third Party Libraries
 import pytest
 
+# Localhub
+from localhub.activities.posts.factories import PostFactory
+
 # Local
 from ..factories import CommunityFactory, MembershipFactory
 from ..models import Membership
+from ..moderation import JobStatus, set_job_progress
 
 pytestmark = pytest.mark.django_db
 
@@ -168,6 +172,60 @@ class TestMembershipDeleteView:
         assert not Membership.objects.filter(pk=member.id).exists()
 
 
+class TestMembershipRemoveView:
+    def test_remove(self, client, admin, mailoutbox, run_on_commit, locmem_cache):
+        membership = MembershipFactory(community=admin.community)
+        post = PostFactory(community=admin.community, owner=membership.member)
+
+        response = client.post(
+            reverse("communities:membership_remove", args=[membership.id])
+        )
+
+        assert "/moderation/" in response.url
+        assert not Membership.objects.filter(pk=membership.pk).exists()
+        assert mailoutbox[0].to == [membership.member.email]
+
+        post.refresh_from_db()
+        assert post.deleted
+
+    def test_remove_own_membership(self, client, admin):
+        response = client.post(
+            reverse("communities:membership_remove", args=[admin.id])
+        )
+
+        assert response.status_code == http.HTTPStatus.FORBIDDEN
+        assert Membership.objects.filter(pk=admin.id).exists()
+
+
+class TestModerationJobView:
+    def test_get(self, client, moderator, locmem_cache):
+        set_job_progress(
+            "abc",
+            community_id=moderator.community.id,
+            status=JobStatus.RUNNING,
+            done=1,
+            total=3,
+        )
+        response = client.get(reverse("communities:moderation_job", args=["abc"]))
+        assert response.status_code == http.HTTPStatus.OK
+        assert response.context["is_running"]
+
+    def test_get_other_community(self, client, moderator, locmem_cache):
+        set_job_progress(
+            "abc",
+            community_id=CommunityFactory().id,
+            status=JobStatus.DONE,
+            done=3,
+            total=3,
+        )
+        response = client.get(reverse("communities:moderation_job", args=["abc"]))
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+    def test_get_if_not_found(self, client, moderator, locmem_cache):
+        response = client.get(reverse("communities:moderation_job", args=["abc"]))
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+
 class TestMembershipLeaveView:
     def test_get(self, client, member, user):
         assert (
@@ -30,4 +30,14 @@ urlpatterns = [
         views.membership_delete_view,
         name="membership_delete",
     ),
+    path(
+        "memberships/<int:pk>/~remove/",
+        views.membership_remove_view,
+        name="membership_remove",
+    ),
+    path(
+        "moderation/<str:job_id>/",
+        views.moderation_job_view,
+        name="moderation_job",
+    ),
 ]
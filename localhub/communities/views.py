@@ -7,6 +7,7 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.db.models import Count, F, Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.utils.translation import gettext as _
@@ -23,10 +24,15 @@ from localhub.join_requests.models import JoinRequest
 from localhub.users.utils import has_perm_or_403
 
 # Local
-from .decorators import community_admin_required, community_required
+from .decorators import (
+    community_admin_required,
+    community_moderator_required,
+    community_required,
+)
 from .emails import send_membership_deleted_email
 from .forms import CommunityForm, MembershipForm
 from .models import Community, Membership
+from .moderation import JobStatus, get_job_progress, schedule_moderation_job
 
 
 @community_required
@@ -271,6 +277,35 @@ def membership_delete_view(request, pk):
         return redirect("communities:membership_list")
 
 
+@require_POST
+@login_required
+@community_required
+def membership_remove_view(request, pk):
+    """
+    Deletes membership and removes all content by the member in this community,
+    e.g. to get rid of a spammer. Content is soft deleted in a background job.
+    """
+    member = get_membership_or_404(
+        request, pk, permission="communities.remove_membership"
+    )
+
+    member.delete()
+
+    send_membership_deleted_email(member.member, member.community)
+
+    job_id = schedule_moderation_job(
+        request.community, request.user, user=member.member
+    )
+
+    messages.success(
+        request,
+        _("You have deleted the membership for %(user)s and their content")
+        % {"user": member.member.username},
+    )
+
+    return redirect("communities:moderation_job", job_id)
+
+
 @login_required
 @community_required
 def membership_leave_view(request):
@@ -291,6 +326,27 @@ def membership_leave_view(request):
     return TemplateResponse(request, "communities/membership_leave.html")
 
 
+@login_required
+@community_moderator_required
+def moderation_job_view(request, job_id):
+    """
+    Shows progress of a bulk moderation job.
+    """
+    job = get_job_progress(job_id)
+    if not job or job["community_id"] != request.community.id:
+        raise Http404(_("Moderation job not found"))
+
+    return TemplateResponse(
+        request,
+        "communities/moderation_job.html",
+        {
+            "job": job,
+            "is_running": job["status"] in (JobStatus.PENDING, JobStatus.RUNNING),
+            "is_failed": job["status"] == JobStatus.FAILED,
+        },
+    )
+
+
 def get_membership_or_404(request, pk, permission=None):
     obj = get_object_or_404(get_membership_queryset(request), pk=pk)
     if permission:
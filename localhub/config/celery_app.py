@@ -7,6 +7,10 @@ import os
 # Third Party Libraries
 from celery import Celery
 
+# Localhub
+# connects celery task metrics signals
+from localhub.common import metrics  # noqa
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "localhub.config.settings.local")
 
 app = Celery("localhub")
@@ -14,6 +14,7 @@ from django.urls import reverse_lazy
 import environ
 import pymdownx
 import pymdownx.emoji
+from celery.schedules import crontab
 
 env = environ.Env()
 
@@ -27,6 +28,59 @@ DATABASES = {
     "default": env.db(),
 }
 
+# read replicas: reads in safe requests are sent to a random replica. To
+# try this locally just point a replica URL at the same database.
+DATABASE_REPLICAS = []
+
+for counter, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    alias = f"replica_{counter}"
+    DATABASES[alias] = {**env.db_url_config(url), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["localhub.common.db.routers.ReplicaRouter"]
+
+# users stick to the primary database for this long after a write
+REPLICA_STICKY_SECONDS = env.int("REPLICA_STICKY_SECONDS", default=10)
+
+# bearer token required to access /metrics
+METRICS_AUTH_TOKEN = env("METRICS_AUTH_TOKEN", default=None)
+
+# request profiling: see localhub.common.middleware.profiling
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=False)
+
+# fraction of profiled requests logged
+PROFILING_LOG_SAMPLE_RATE = env.float("PROFILING_LOG_SAMPLE_RATE", default=0.1)
+
+# dump cProfile stats for requests slower than this (ms). 0 to disable.
+PROFILING_CPROFILE_THRESHOLD = env.int("PROFILING_CPROFILE_THRESHOLD", default=0)
+PROFILING_CPROFILE_DIR = env("PROFILING_CPROFILE_DIR", default="/tmp/profiles")
+
+# anonymous page cache: see localhub.communities.cache
+PAGE_CACHE_TIMEOUT = env.int("PAGE_CACHE_TIMEOUT", default=300)
+
+# max time (seconds) other requests wait for a page to be rendered
+PAGE_CACHE_LOCK_TIMEOUT = env.int("PAGE_CACHE_LOCK_TIMEOUT", default=10)
+
+# rendered activity content: see localhub.activities.templatetags.activities
+ACTIVITY_CONTENT_CACHE_TIMEOUT = env.int(
+    "ACTIVITY_CONTENT_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+
+# change when activity templates change, e.g. to release tag
+ACTIVITY_CONTENT_CACHE_VERSION = env("ACTIVITY_CONTENT_CACHE_VERSION", default="1")
+
+# bulk moderation: see localhub.communities.moderation
+MODERATION_BATCH_SIZE = env.int("MODERATION_BATCH_SIZE", default=500)
+
+# how long moderation job progress is kept (seconds)
+MODERATION_JOB_TIMEOUT = env.int("MODERATION_JOB_TIMEOUT", default=60 * 60 * 24)
+
+# account and community deletion: see localhub.common.db.deletion
+DELETION_BATCH_SIZE = env.int("DELETION_BATCH_SIZE", default=1000)
+
+# how long deletion progress is kept (seconds)
+DELETION_PROGRESS_TIMEOUT = env.int("DELETION_PROGRESS_TIMEOUT", default=60 * 60 * 24)
+
 REDIS_URL = env("REDIS_URL")
 
 CACHES = {"default": env.cache("REDIS_URL")}
@@ -100,6 +154,11 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "localhub.common.middleware.metrics.MetricsMiddleware",
+    # runs before other middleware, so all queries (e.g. community lookup)
+    # are profiled
+    "localhub.common.middleware.profiling.ProfilingMiddleware",
+    "localhub.common.middleware.replicas.ReplicaMiddleware",
     "django.contrib.sites.middleware.CurrentSiteMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -110,6 +169,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "localhub.users.middleware.UserLocaleMiddleware",
+    "localhub.users.middleware.UserStateMiddleware",
     "django.middleware.gzip.GZipMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -236,6 +296,24 @@ MICAWBER_TEMPLATE_EXTENSIONS = [("oembed_no_urlize", {"urlize_all": False})]
 result_backend = CELERY_BROKER_URL = REDIS_URL
 result_serializer = "json"
 
+# run by a single celery beat process, separate from the workers: see heroku.yml
+CELERY_BEAT_SCHEDULE = {
+    "send-hourly-notification-digests": {
+        "task": "localhub.notifications.send_notification_digests",
+        "schedule": crontab(minute=0),
+        "args": ("hourly",),
+    },
+    "send-daily-notification-digests": {
+        "task": "localhub.notifications.send_notification_digests",
+        "schedule": crontab(minute=0, hour=7),
+        "args": ("daily",),
+    },
+    "purge-expired-notifications": {
+        "task": "localhub.notifications.purge_expired_notifications",
+        "schedule": crontab(minute=30, hour=3),
+    },
+}
+
 # https://django-taggit.readthedocs.io/en/latest/getting_started.html
 
 TAGGIT_CASE_INSENSITIVE = True
@@ -248,6 +326,20 @@ VAPID_ADMIN_EMAIL = env("VAPID_ADMIN_EMAIL", default=None)
 
 WEBPUSH_ENABLED = env.bool("WEBPUSH_ENABLED", default=True)
 
+# merge notifications with same recipient, object and verb within this period
+NOTIFICATION_COALESCE_SECONDS = env.int("NOTIFICATION_COALESCE_SECONDS", default=3600)
+
+# delete notifications older than this number of days, with optional
+# per-verb periods. None keeps notifications indefinitely.
+NOTIFICATION_RETENTION_DAYS = {
+    "default": env.int("NOTIFICATION_RETENTION_DAYS", default=365),
+    "like": 90,
+    "reshare": 90,
+}
+
+# max rows deleted in each batch by the purge_expired_notifications task
+NOTIFICATION_PURGE_BATCH_SIZE = env.int("NOTIFICATION_PURGE_BATCH_SIZE", default=1000)
+
 GEOLOCATOR_USER_AGENT = env("GEOLOCATOR_USER_AGENT", default="localhub.locator")
 
 MEDIA_URL = env("MEDIA_URL", default="/media/")
@@ -281,7 +373,10 @@ TEMPLATES = [
                 "localhub.common.template.context_processors.home_page_url",
                 "localhub.common.template.context_processors.is_cookies_accepted",
             ],
-            "libraries": {"pagination": "localhub.common.pagination.templatetags"},
+            "libraries": {
+                "pagination": "localhub.common.pagination.templatetags",
+                "thumbnails": "localhub.common.thumbnails.templatetags",
+            },
         },
     }
 ]
@@ -298,8 +393,16 @@ LOGGING = {
         "root": {"handlers": ["console"], "level": "INFO"},
         "django.security.DisallowedHost": {"handlers": ["null"], "propagate": False},
         "django.request": {"handlers": ["console"], "level": "ERROR"},
-        "localhub.activities.photos.forms": {"handlers": ["console"], "level": "INFO"},
+        "localhub.activities.photos.tasks": {"handlers": ["console"], "level": "INFO"},
+        "localhub.common.middleware.profiling": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
         "localhub.notifications.adapter": {"handlers": ["console"], "level": "INFO"},
         "localhub.notifications.tasks": {"handlers": ["console"], "level": "INFO"},
+        "localhub.common.thumbnails.tasks": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
     },
 }
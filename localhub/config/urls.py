@@ -10,6 +10,7 @@ from django.views.generic import TemplateView
 
 # Localhub
 from localhub.activities.views.streams import activity_stream_view
+from localhub.common.views import metrics_view
 from localhub.communities.views import (
     community_list_view,
     community_not_found_view,
@@ -48,6 +49,7 @@ urlpatterns = [
     path("not-found/", view=community_not_found_view, name="community_not_found"),
     path("~accept-cookies/", accept_cookies, name="accept_cookies"),
     path("~dismiss-notice/<str:notice>/", dismiss_notice_view, name="dismiss_notice"),
+    path("metrics", metrics_view, name="metrics"),
     # Third-party
     path("account/", include("turbo_allauth.urls")),
     path("markdownx/", include("markdownx.urls")),
@@ -7,6 +7,7 @@ import io
 # Django
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.core.files import File
 from django.http import HttpResponse
 
@@ -35,6 +36,25 @@ def get_response():
     return lambda req: HttpResponse()
 
 
+@pytest.fixture
+def locmem_cache(settings):
+    # test settings use a dummy cache: use a real cache to test caching
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture
+def run_on_commit(mocker):
+    # tests run inside a transaction, so on_commit callbacks never fire
+    return mocker.patch(
+        "django.db.transaction.on_commit", side_effect=lambda func, using=None: func()
+    )
+
+
 @pytest.fixture
 def user_model():
     return get_user_model()
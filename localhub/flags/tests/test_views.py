@@ -26,6 +26,26 @@ class TestFlagListView:
         )
         response = client.get(reverse("flags:list"))
         assert response.status_code == 200
+        assert len(response.context["object_list"]) == 1
+
+
+class TestFlagModerateView:
+    def test_post(self, client, moderator, run_on_commit, locmem_cache):
+        post = PostFactory(community=moderator.community)
+        flag = FlagFactory(
+            content_object=post,
+            community=moderator.community,
+        )
+        response = client.post(reverse("flags:moderate"), {"flag": [flag.id]})
+        assert "/moderation/" in response.url
+        assert not Flag.objects.exists()
+
+        post.refresh_from_db()
+        assert post.deleted
+
+    def test_post_none_selected(self, client, moderator):
+        response = client.post(reverse("flags:moderate"))
+        assert response.url == reverse("flags:list")
 
 
 class TestFlagDeleteView:
@@ -2,12 +2,13 @@
 from django.urls import path
 
 # Local
-from .views import flag_delete_view, flag_list_view
+from .views import flag_delete_view, flag_list_view, flag_moderate_view
 
 app_name = "flags"
 
 
 urlpatterns = [
     path("", view=flag_list_view, name="list"),
+    path("~moderate/", view=flag_moderate_view, name="moderate"),
     path("<int:pk>/~delete/", view=flag_delete_view, name="delete"),
 ]
@@ -6,14 +6,16 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect
-from django.template.response import TemplateResponse
 from django.utils.translation import gettext as _
+from django.views.decorators.http import require_POST
 
 # Third Party Libraries
 from turbo_response import redirect_303, render_form_response
 
 # Localhub
+from localhub.common.pagination import render_paginated_queryset
 from localhub.communities.decorators import community_moderator_required
+from localhub.communities.moderation import schedule_moderation_job
 
 # Local
 from .forms import FlagForm
@@ -29,7 +31,26 @@ def flag_list_view(request):
         .prefetch_related("content_object")
         .order_by("-created")
     )
-    return TemplateResponse(request, "flags/flag_list.html", {"flags": flags})
+    return render_paginated_queryset(request, flags, "flags/flag_list.html")
+
+
+@require_POST
+@login_required
+@community_moderator_required
+def flag_moderate_view(request):
+    """
+    Soft deletes all content with the selected flags in a background job.
+    """
+    flags = Flag.objects.filter(
+        community=request.community,
+        pk__in=[pk for pk in request.POST.getlist("flag") if pk.isdigit()],
+    )
+    if not flags.exists():
+        messages.error(request, _("No flags have been selected"))
+        return redirect("flags:list")
+
+    job_id = schedule_moderation_job(request.community, request.user, flags=flags)
+    return redirect("communities:moderation_job", job_id)
 
 
 @login_required
@@ -7,7 +7,9 @@ import re
 # Django
 from django.urls import reverse_lazy
 
-HASHTAGS_RE = re.compile(r"(?:^|\s)[＃#]{1}(\w+)")
+HASHTAG_PATTERN = r"[＃#]{1}(?P<hashtag>\w+)"
+
+HASHTAGS_RE = re.compile(r"(?:^|\s)" + HASHTAG_PATTERN)
 
 HASHTAGS_TYPEAHEAD_CONFIG = (
     "#",
@@ -1,8 +1,19 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Django
+from django.contrib.contenttypes.models import ContentType
+
+# Third Party Libraries
+import pytest
+from taggit.models import Tag, TaggedItem
+
+# Localhub
+from localhub.activities.posts.factories import PostFactory
+from localhub.activities.posts.models import Post
+
 # Local
-from ..utils import extract_hashtags, linkify_hashtags
+from ..utils import extract_hashtags, get_or_create_tags, linkify_hashtags, sync_tags
 
 
 class TestExtractHashtags:
@@ -26,3 +37,62 @@ class TestLinkifyHashtags:
             ' <a href="/tags/coding2019/">#Coding2019</a>'
             ' <a href="/tags/kesa/">#kesä</a>'
         )
+
+
+@pytest.mark.django_db
+class TestGetOrCreateTags:
+    def test_none(self):
+        assert get_or_create_tags([]) == []
+
+    def test_create_missing(self):
+        existing = Tag.objects.create(name="Movies")
+        tags = get_or_create_tags(["movies", "reviews"])
+        assert len(tags) == 2
+        assert existing in tags
+        assert Tag.objects.get(name="reviews").slug == "reviews"
+
+    def test_slug_conflict(self):
+        Tag.objects.create(name="kesa")
+        (tag,) = get_or_create_tags(["kesä"])
+        assert tag.name == "kesä"
+        assert tag.slug == "kesa_1"
+
+
+@pytest.mark.django_db
+class TestSyncTags:
+    def get_tags(self, post):
+        return set(post.tags.values_list("name", flat=True))
+
+    def test_add_and_remove(self):
+        post = PostFactory(hashtags="#movies #reviews")
+        unchanged = TaggedItem.objects.get(
+            content_type=ContentType.objects.get_for_model(Post),
+            object_id=post.id,
+            tag__name="movies",
+        )
+
+        sync_tags(Post, [post.id], {"movies", "coding"})
+        assert self.get_tags(post) == {"movies", "coding"}
+        assert TaggedItem.objects.filter(pk=unchanged.pk).exists()
+
+    def test_clear(self):
+        post = PostFactory(hashtags="#movies #reviews")
+        sync_tags(Post, [post.id], set())
+        assert self.get_tags(post) == set()
+
+    def test_multiple_objects(self):
+        first = PostFactory(hashtags="#movies")
+        second = PostFactory(hashtags="#reviews")
+
+        sync_tags(Post, [first.id, second.id], {"movies", "coding"})
+
+        assert self.get_tags(first) == {"movies", "coding"}
+        assert self.get_tags(second) == {"movies", "coding"}
+
+    def test_num_queries(self, django_assert_num_queries):
+        post = PostFactory(hashtags="#movies #reviews")
+        Tag.objects.create(name="coding")
+        ContentType.objects.get_for_model(Post)
+        # select tags, select current items, delete, insert
+        with django_assert_num_queries(4):
+            sync_tags(Post, [post.id], {"movies", "coding"})
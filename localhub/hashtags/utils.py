@@ -2,13 +2,14 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 # Django
-from django.urls import reverse
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.functions import Lower
 
-# Localhub
-from localhub.common.utils.text import slugify_unicode
+# Third Party Libraries
+from taggit.models import Tag, TaggedItem
 
-# Local
-from .app_settings import HASHTAGS_RE
+# Localhub
+from localhub.common.utils.tokenizer import tokenize
 
 
 def extract_hashtags(content):
@@ -21,13 +22,7 @@ def extract_hashtags(content):
     Returns:
         set: valid hashtag strings
     """
-    return set(
-        [
-            hashtag.lower()
-            for token in content.split(" ")
-            for hashtag in HASHTAGS_RE.findall(token)
-        ]
-    )
+    return tokenize(content).hashtags
 
 
 def linkify_hashtags(content, css_class=None):
@@ -39,19 +34,75 @@ def linkify_hashtags(content, css_class=None):
     Returns:
         str
     """
-    tokens = content.split(" ")
-    rv = []
-    css_class = f' class="{css_class}"' if css_class else ""
-    for token in tokens:
-
-        for tag in HASHTAGS_RE.findall(token):
-            slug = slugify_unicode(tag)
-            if slug:
-                url = reverse("hashtags:detail", args=[slug])
-                token = token.replace(
-                    "#" + tag, f'<a href="{url}"{css_class}>#{tag}</a>'
-                )
-
-        rv.append(token)
-
-    return " ".join(rv)
+    return tokenize(content, linkify_hashtags=True, css_class=css_class).text
+
+
+def get_or_create_tags(names):
+    """Returns tags matching names (case insensitive), creating any missing
+    tags with a single INSERT ... ON CONFLICT DO NOTHING.
+
+    Args:
+        names (Iterable[str]): tag names
+
+    Returns:
+        list: Tag instances
+    """
+    names = {name.lower() for name in names}
+    if not names:
+        return []
+
+    def _get_tags(names):
+        return list(
+            Tag.objects.annotate(lower_name=Lower("name")).filter(lower_name__in=names)
+        )
+
+    tags = _get_tags(names)
+
+    if missing := names - {tag.name.lower() for tag in tags}:
+        new_tags = [Tag(name=name) for name in missing]
+        for tag in new_tags:
+            tag.slug = tag.slugify(tag.name)
+        Tag.objects.bulk_create(new_tags, ignore_conflicts=True)
+
+        tags += _get_tags(missing)
+
+        # slug taken by another tag e.g. "kesa" for "kesä": save() finds a
+        # free slug
+        for name in missing - {tag.name.lower() for tag in tags}:
+            tags.append(Tag.objects.create(name=name))
+
+    return tags
+
+
+def sync_tags(model, object_ids, names):
+    """Sets tags of objects to the given tag names. Only the TaggedItem rows
+    that have changed are deleted or inserted, so the same tags can be
+    applied e.g. to an activity and all of its reshares in a few queries.
+
+    Args:
+        model (Model class): tagged model
+        object_ids (Iterable[int]): primary keys of tagged objects
+        names (Iterable[str]): tag names
+    """
+    object_ids = list(object_ids)
+    if not object_ids:
+        return
+
+    content_type = ContentType.objects.get_for_model(model)
+    tag_ids = {tag.id for tag in get_or_create_tags(names)}
+
+    items = TaggedItem.objects.filter(
+        content_type=content_type, object_id__in=object_ids
+    )
+    current = set(items.values_list("object_id", "tag_id"))
+
+    if any(tag_id not in tag_ids for _, tag_id in current):
+        items.exclude(tag_id__in=tag_ids).delete()
+
+    if new_items := [
+        TaggedItem(content_type=content_type, object_id=object_id, tag_id=tag_id)
+        for object_id in object_ids
+        for tag_id in tag_ids
+        if (object_id, tag_id) not in current
+    ]:
+        TaggedItem.objects.bulk_create(new_items, ignore_conflicts=True)
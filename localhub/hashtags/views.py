@@ -24,6 +24,7 @@ from turbo_response import TurboFrame
 from localhub.activities.utils import get_activity_models
 from localhub.activities.views.streams import render_activity_stream
 from localhub.common.pagination import render_paginated_queryset
+from localhub.communities.cache import cache_anonymous_page
 from localhub.communities.decorators import community_required
 
 
@@ -89,6 +90,7 @@ def blocked_tag_list_view(request):
 
 
 @community_required
+@cache_anonymous_page
 def tag_detail_view(request, slug):
     tag = get_object_or_404(Tag, slug=slug)
 
@@ -96,15 +98,14 @@ def tag_detail_view(request, slug):
         qs = (
             qs.exclude_blocked_users(request.user)
             .published_or_owner(request.user)
-            .filter(tags__name__in=[tag])
-            .distinct()
+            .filter(qs.exists_tags([tag]))
         )
         # ensure we block all unwanted tags *unless* it's the tag
         # in question.
         if request.user.is_authenticated:
-            qs = qs.exclude(
-                Q(tags__in=request.user.blocked_tags.exclude(id=tag.id)),
-                ~Q(owner=request.user),
+            qs = qs.filter(
+                Q(owner=request.user)
+                | ~Q(qs.exists_tags(request.user.blocked_tags.exclude(id=tag.id)))
             )
         return qs
 
@@ -7,16 +7,27 @@ from django.core.mail import send_mail
 from django.template import loader
 from django.templatetags.static import static
 from django.utils.encoding import force_text
-from django.utils.translation import override
+from django.utils.translation import ngettext, override
 
 # Third Party Libraries
 from celery.utils.log import get_logger
 
+# Localhub
+from localhub.common.metrics import EMAIL_ENQUEUE_LATENCY, SEND_FAILURES
+
 celery_logger = get_logger(__name__)
 
 
 class TemplateRenderer:
-    """Renders notification to template."""
+    """Renders notification to template.
+
+    The template resolved from get_template_names() is cached for each
+    engine and list of template names, so select_template() is not run for
+    every notification in a list. The cache is not used if settings.DEBUG
+    is True.
+    """
+
+    template_cache = {}
 
     def __init__(self, adapter, prefixes):
         """
@@ -77,6 +88,31 @@ class TemplateRenderer:
         """
         return self.adapter.as_dict() | (extra_context or {})
 
+    def get_template(self, template_engine=loader, suffix=".html"):
+        """Returns first matching template from get_template_names().
+
+        Args:
+            template_engine (object, optional): Django template engine (default: loader)
+            suffix (str): suffix appended to all paths e.g. ".txt"
+
+        Returns:
+            Template
+        """
+        template_names = self.get_template_names(suffix)
+
+        if settings.DEBUG:
+            return template_engine.select_template(template_names)
+
+        # template names include the prefixes, so e.g. email and include
+        # templates with the same suffix are cached separately
+        key = (template_engine, tuple(template_names))
+
+        if (template := self.template_cache.get(key)) is None:
+            template = self.template_cache[key] = template_engine.select_template(
+                template_names
+            )
+        return template
+
     def render(self, extra_context=None, template_engine=loader, suffix=".html"):
         """Renders a list of templates to a str. Use with TemplateResolver
         and TemplateContext.
@@ -88,9 +124,8 @@ class TemplateRenderer:
         Returns:
             str: rendered template
         """
-        return template_engine.render_to_string(
-            self.get_template_names(suffix),
-            context=self.get_context(extra_context),
+        return self.get_template(template_engine, suffix).render(
+            self.get_context(extra_context)
         )
 
 
@@ -109,20 +144,27 @@ class Mailer:
     def send(self, **kwargs):
         recipient = self.get_recipient()
 
-        if recipient.send_email_notifications:
+        # digest emails are sent in a scheduled task: see digests.py
+        if (
+            recipient.send_email_notifications
+            and recipient.notification_digest == recipient.NotificationDigest.IMMEDIATE
+        ):
             subject = self.get_subject()
             context = {"subject": subject}
 
-            return send_mail(
-                f"{self.adapter.community.name} | {subject}",
-                self.renderer.render(suffix=(".txt"), extra_context=context),
-                self.get_sender(),
-                [recipient.email],
-                html_message=self.renderer.render(
-                    suffix=".html", extra_context=context
-                ),
-                **kwargs,
-            )
+            with EMAIL_ENQUEUE_LATENCY.time(), SEND_FAILURES.labels(
+                "email"
+            ).count_exceptions():
+                return send_mail(
+                    f"{self.adapter.community.name} | {subject}",
+                    self.renderer.render(suffix=(".txt"), extra_context=context),
+                    self.get_sender(),
+                    [recipient.email],
+                    html_message=self.renderer.render(
+                        suffix=".html", extra_context=context
+                    ),
+                    **kwargs,
+                )
 
     def get_subject(self):
         return str(self.adapter.object)
@@ -146,6 +188,7 @@ class Webpusher:
         Sends a webpush notification to registered browsers through celery.
         """
         if settings.WEBPUSH_ENABLED:
+            # Local
             from . import tasks
 
             try:
@@ -267,6 +310,41 @@ class Adapter:
         """
         return self.community.resolve_url(self.get_object_url())
 
+    def get_actor_display(self):
+        """Returns actor display name. If other actors have been merged into
+        this notification includes the number of other actors e.g.
+        "Tom (and 3 others)".
+
+        Returns:
+            str
+        """
+        display_name = self.actor.get_display_name()
+        if (others := self.notification.actor_count - 1) > 0:
+            return (
+                ngettext(
+                    "%(actor)s (and %(count)d other)",
+                    "%(actor)s (and %(count)d others)",
+                    others,
+                )
+                % {"actor": display_name, "count": others}
+            )
+        return display_name
+
+    def render_to_digest(self):
+        """Renders HTML snippet of the notification for digest emails. This
+        is the same as render_to_tag() but with complete URLs.
+
+        Returns:
+            str: rendered template str
+        """
+        actor_url = self.actor.get_absolute_url()
+        return self.render_to_tag(
+            extra_context={
+                "actor_url": self.community.resolve_url(actor_url),
+                "object_url": self.get_absolute_url(),
+            }
+        )
+
     def render_to_tag(self, **template_kwargs):
         """Used with the {% notification %} template tag under notification_tags.
 
@@ -291,17 +369,18 @@ class Adapter:
         """
         actor_url = self.actor.get_absolute_url()
         recipient_url = self.recipient.get_absolute_url()
+        object_url = self.get_object_url()
 
         return {
             "actor_url": actor_url,
             "recipient_url": recipient_url,
             "notification": self.notification,
             "object": self.object,
-            "object_url": self.get_object_url(),
-            "absolute_url": self.get_absolute_url(),
+            "object_url": object_url,
+            "absolute_url": self.community.resolve_url(object_url),
             "object_name": self.object_name,
             "actor": self.actor,
-            "actor_display": self.actor.get_display_name(),
+            "actor_display": self.get_actor_display(),
             "actor_absolute_url": self.community.resolve_url(actor_url),
             "recipient": self.recipient,
             "recipient_display": self.recipient.get_display_name(),
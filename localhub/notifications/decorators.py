@@ -3,6 +3,17 @@
 
 # Standard Library
 import functools
+from datetime import timedelta
+
+# Django
+from django.conf import settings
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+
+# Localhub
+from localhub.common.db.routers import use_primary
+from localhub.common.metrics import NOTIFY_LATENCY, NOTIFY_RECIPIENTS
+from localhub.users.utils import bump_state_versions
 
 # Local
 from .registry import registry
@@ -39,6 +50,14 @@ def notify(func):
     Check is run on all notifications to ensure only permitted verbs are saved
     and dispatched.
 
+    Notifications matching a recent unread notification (same recipient,
+    content object and verb) within NOTIFICATION_COALESCE_SECONDS are merged
+    into that notification rather than saved, and no email or push is sent
+    for them.
+
+    All queries are run against the primary database, as notifications are
+    usually created immediately after a write.
+
     Args:
         func (function): Method or function returning a single instance
         or iterable of Notification instances.
@@ -49,31 +68,53 @@ def notify(func):
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        from .models import Notification
+        with use_primary(), NOTIFY_LATENCY.time():
+            return _notify(func, *args, **kwargs)
+
+    return wrapper
+
 
-        notifications = func(*args, **kwargs)
+def _notify(func, *args, **kwargs):
+    # Local
+    from .models import Notification
 
-        if not notifications:
-            return []
+    notifications = func(*args, **kwargs)
 
-        if isinstance(notifications, Notification):
-            notifications = [notifications]
-        else:
-            notifications = list(notifications)
+    if not notifications:
+        return []
 
-        for_create = []
-        adapters = []
+    if isinstance(notifications, Notification):
+        notifications = [notifications]
+    else:
+        notifications = list(notifications)
 
-        for notification in notifications:
-            adapter = registry.get_adapter(notification)
-            if adapter.is_allowed():
-                for_create.append(notification)
-                adapters.append(adapter)
+    # notifications may be created with just a recipient_id
+    prefetch_related_objects(notifications, "recipient")
 
-        Notification.objects.bulk_create(for_create)
+    adapters = []
 
-        for adapter in adapters:
+    for notification in notifications:
+        adapter = registry.get_adapter(notification)
+        if adapter.is_allowed():
+            adapters.append(adapter)
+
+    for_create = Notification.objects.coalesce(
+        [adapter.notification for adapter in adapters],
+        timedelta(seconds=settings.NOTIFICATION_COALESCE_SECONDS),
+    )
+
+    Notification.objects.bulk_create(for_create)
+
+    # unsaved instances are not hashable
+    created = {id(notification) for notification in for_create}
+
+    for adapter in adapters:
+        if id(adapter.notification) in created:
             adapter.send_notification()
-        return notifications
 
-    return wrapper
+    # new and coalesced notifications change recipients' unread counts
+    recipient_ids = {adapter.notification.recipient_id for adapter in adapters}
+    transaction.on_commit(lambda: bump_state_versions(*recipient_ids))
+
+    NOTIFY_RECIPIENTS.observe(len(created))
+    return notifications
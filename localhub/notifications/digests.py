@@ -0,0 +1,142 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Notification digest emails, for users who prefer an hourly or daily
+summary to an email for each notification. Digests are sent by the
+scheduled send_notification_digests task.
+"""
+
+# Standard Library
+import itertools
+from datetime import timedelta
+
+# Django
+from django.core.mail import send_mail
+from django.db.models import F
+from django.template import loader
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.translation import ngettext, override
+
+# Local
+from .models import Notification
+from .registry import registry
+
+DIGEST_PERIODS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+}
+
+
+def get_digest_notifications(recipient, since):
+    """Returns unread notifications created or updated since the last
+    digest, across all communities where the recipient is an active member.
+
+    Args:
+        recipient (User)
+        since (datetime)
+
+    Returns:
+        QuerySet
+    """
+    return (
+        Notification.objects.filter(
+            community__membership__member=recipient,
+            community__membership__active=True,
+            community__active=True,
+            actor__membership__community=F("community"),
+            actor__membership__active=True,
+            actor__is_active=True,
+            modified__gt=since,
+        )
+        .for_recipient(recipient)
+        .exclude_blocked_actors(recipient)
+        .unread()
+        .prefetch_related("content_object")
+        .select_related("actor", "content_type", "community", "recipient")
+        .order_by("community", "-created")
+    )
+
+
+def send_notification_digest(recipient):
+    """Sends a digest email per community with all new notifications
+    since the last digest.
+
+    Args:
+        recipient (User)
+
+    Returns:
+        int: number of emails sent
+    """
+    now = timezone.now()
+
+    since = recipient.notification_digest_sent or (
+        now - DIGEST_PERIODS.get(recipient.notification_digest, timedelta(days=1))
+    )
+
+    num_sent = 0
+
+    with override(recipient.language):
+        for community, notifications in itertools.groupby(
+            get_digest_notifications(recipient, since), lambda n: n.community
+        ):
+            adapters = [
+                adapter
+                for adapter in map(registry.get_adapter, notifications)
+                if adapter.is_allowed()
+            ]
+
+            if adapters:
+                send_digest_email(recipient, community, adapters)
+                num_sent += 1
+
+    recipient.__class__.objects.filter(pk=recipient.pk).update(
+        notification_digest_sent=now
+    )
+    return num_sent
+
+
+def send_digest_email(recipient, community, adapters):
+    """Renders and sends digest email.
+
+    Args:
+        recipient (User)
+        community (Community)
+        adapters (List[Adapter]): notification adapters
+    """
+    subject = (
+        ngettext(
+            "You have %(count)d new notification",
+            "You have %(count)d new notifications",
+            len(adapters),
+        )
+        % {"count": len(adapters)}
+    )
+
+    items = [adapter.render_to_digest() for adapter in adapters]
+
+    context = {
+        "subject": subject,
+        "recipient": recipient,
+        "community": community,
+        "notifications": items,
+        "notifications_url": community.resolve_url(reverse("notifications:list")),
+    }
+
+    return send_mail(
+        f"{community.name} | {subject}",
+        loader.render_to_string(
+            "notifications/emails/digest.txt",
+            {
+                **context,
+                "notifications": [" ".join(strip_tags(item).split()) for item in items],
+            },
+        ),
+        community.resolve_email("no-reply"),
+        [recipient.email],
+        html_message=loader.render_to_string(
+            "notifications/emails/digest.html", context
+        ),
+    )
@@ -0,0 +1,37 @@
+# Generated by Django 3.1.14 on 2026-10-19 02:27
+
+# Django
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # indexes are created concurrently to avoid locking the table
+    atomic = False
+
+    dependencies = [
+        ("notifications", "0003_notification_actor_count"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="notification",
+            index=models.Index(
+                fields=["recipient", "community", "-created"],
+                name="notification_recipient_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(is_read=False),
+                fields=["recipient", "community"],
+                name="notification_unread_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="notification",
+            index=models.Index(fields=["created"], name="notification_created_idx"),
+        ),
+    ]
@@ -2,20 +2,25 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 # Standard Library
+import collections
 import json
+from datetime import timedelta
 
 # Django
 from django.conf import settings
-from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.utils import timezone
 
 # Third Party Libraries
 from model_utils.models import TimeStampedModel
 from pywebpush import WebPushException, webpush
 
 # Localhub
-from localhub.common.db.generic import get_generic_related_exists
+from localhub.common.db.generic import (
+    SelectRelatedGenericForeignKey,
+    get_generic_related_exists,
+)
 from localhub.common.db.utils import boolean_value
 from localhub.communities.models import Community
 
@@ -103,6 +108,122 @@ class NotificationQuerySet(models.QuerySet):
 
         return self.filter(is_read=False)
 
+    def coalesce(self, notifications, window):
+        """Merges new notifications into any matching unread notification
+        with the same recipient, content object and verb created within
+        the time window. The matching notification is updated with the new
+        actor, an incremented actor_count and a new created timestamp, so
+        it is shown again at the top of the recipient's notifications.
+
+        Note that actor_count is approximate: it is only incremented if the
+        actor is different from the latest actor.
+
+        Args:
+            notifications (List[Notification]): new unsaved notifications
+            window (timedelta): time window
+
+        Returns:
+            List[Notification]: notifications not merged, which should be created
+        """
+        if not window or not notifications:
+            return notifications
+
+        def get_key(notification):
+            return (
+                notification.recipient_id,
+                notification.content_type_id,
+                notification.object_id,
+                notification.verb,
+            )
+
+        now = timezone.now()
+
+        new_notifications = {get_key(n): n for n in notifications}
+        matches = {}
+
+        for pk, *key in (
+            self.unread()
+            .filter(
+                created__gte=now - window,
+                recipient__in={n.recipient_id for n in notifications},
+                content_type__in={n.content_type_id for n in notifications},
+                object_id__in={n.object_id for n in notifications},
+                verb__in={n.verb for n in notifications},
+            )
+            .order_by("-created")
+            .values_list("pk", "recipient", "content_type", "object_id", "verb")
+        ):
+            if (key := tuple(key)) in new_notifications:
+                matches.setdefault(key, pk)
+
+        if not matches:
+            return notifications
+
+        merged = collections.defaultdict(list)
+        for key, pk in matches.items():
+            merged[new_notifications[key].actor_id].append(pk)
+
+        for actor_id, pks in merged.items():
+            self.filter(pk__in=pks).update(
+                actor=actor_id,
+                actor_count=models.Case(
+                    models.When(actor=actor_id, then=models.F("actor_count")),
+                    default=models.F("actor_count") + 1,
+                ),
+                created=now,
+                modified=now,
+            )
+
+        return [n for n in notifications if get_key(n) not in matches]
+
+    def expired(self, retention=None):
+        """Filters notifications older than their retention period. The
+        retention period may be set for each verb, with a "default" period
+        for all other verbs. If a period is None then notifications are
+        kept indefinitely.
+
+        Args:
+            retention (dict, optional): number of days for each verb
+                (default: settings.NOTIFICATION_RETENTION_DAYS)
+
+        Returns:
+            QuerySet
+        """
+        retention = {
+            **(settings.NOTIFICATION_RETENTION_DAYS if retention is None else retention)
+        }
+        default = retention.pop("default", None)
+
+        now = timezone.now()
+
+        q = models.Q()
+
+        for verb, days in retention.items():
+            if days is not None:
+                q |= models.Q(verb=verb, created__lt=now - timedelta(days=days))
+
+        if default is not None:
+            q |= models.Q(created__lt=now - timedelta(days=default)) & ~models.Q(
+                verb__in=list(retention)
+            )
+
+        return self.filter(q) if q else self.none()
+
+    def delete_in_batches(self, batch_size=1000):
+        """Deletes notifications in small batches, to avoid holding long
+        locks on the table when deleting large numbers of rows.
+
+        Args:
+            batch_size (int, optional): max rows in each DELETE (default: 1000)
+
+        Returns:
+            int: number of deleted notifications
+        """
+        num_deleted = 0
+        while pks := list(self.order_by().values_list("pk", flat=True)[:batch_size]):
+            num_deleted += self.model.objects.filter(pk__in=pks).delete()[0]
+        return num_deleted
+
     def mark_read(self):
         """Marks all notifications read if they are unread.
 
@@ -135,11 +256,18 @@ class Notification(TimeStampedModel):
 
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
-    content_object = GenericForeignKey("content_type", "object_id")
+    content_object = SelectRelatedGenericForeignKey(
+        "content_type",
+        "object_id",
+        select_related=["owner", "sender", "community"],
+    )
 
     verb = models.CharField(max_length=30)
     is_read = models.BooleanField(default=False)
 
+    # number of actors merged into this notification: see coalesce()
+    actor_count = models.PositiveIntegerField(default=1)
+
     objects = NotificationManager()
 
     class Meta:
@@ -152,7 +280,17 @@ class Notification(TimeStampedModel):
                     "-created",
                     "is_read",
                 ]
-            )
+            ),
+            models.Index(
+                fields=["recipient", "community", "-created"],
+                name="notification_recipient_idx",
+            ),
+            models.Index(
+                fields=["recipient", "community"],
+                condition=models.Q(is_read=False),
+                name="notification_unread_idx",
+            ),
+            models.Index(fields=["created"], name="notification_created_idx"),
         ]
 
 
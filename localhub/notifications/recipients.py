@@ -0,0 +1,112 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.db import connections, models
+
+# Local
+from .models import Notification
+
+
+class RecipientResolver:
+    """Resolves notification recipients from a number of sources in a
+    single query.
+
+    Each source is a User QuerySet with a verb. Sources are prioritized in
+    the order they are added: a recipient matching more than one source
+    receives a single notification with the verb of the first source. This
+    is done in the database with a UNION of all the sources and DISTINCT ON
+    the recipient, so only (recipient_id, verb) pairs are fetched, rather
+    than complete User rows.
+
+    Example:
+
+    resolver = RecipientResolver()
+    resolver.add("mention", recipients.matches_usernames(mentions))
+    resolver.add("followed_user", recipients.filter(following=owner))
+
+    notifications = resolver.make_notifications(
+        content_object=post,
+        actor=owner,
+        community=community,
+    )
+    """
+
+    def __init__(self):
+        self.sources = []
+
+    def add(self, verb, queryset):
+        """Adds a source of recipients.
+
+        Args:
+            verb (str): notification verb
+            queryset (QuerySet): User QuerySet
+
+        Returns:
+            RecipientResolver: this instance, so calls can be chained
+        """
+        # e.g. matches_usernames() with no names returns none()
+        if not queryset.query.is_empty():
+            self.sources.append((verb, queryset))
+        return self
+
+    def get_queryset(self):
+        """Returns UNION ALL of all sources, with recipient id, verb and
+        priority columns.
+
+        Returns:
+            QuerySet or None if no sources
+        """
+        querysets = [
+            queryset.order_by()
+            .annotate(
+                notification_verb=models.Value(verb, output_field=models.CharField()),
+                notification_priority=models.Value(
+                    priority, output_field=models.IntegerField()
+                ),
+            )
+            .values_list("pk", "notification_verb", "notification_priority")
+            for priority, (verb, queryset) in enumerate(self.sources)
+        ]
+        if not querysets:
+            return None
+        return querysets[0].union(*querysets[1:], all=True)
+
+    def resolve(self):
+        """Runs the query.
+
+        Returns:
+            List[Tuple[int, str]]: (recipient_id, verb) ordered by source priority
+        """
+        if (queryset := self.get_queryset()) is None:
+            return []
+
+        sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+
+        # PostgreSQL DISTINCT ON: keep the highest priority row per recipient
+        query = (
+            "SELECT recipient_id, verb FROM ("
+            "SELECT DISTINCT ON (recipient_id) recipient_id, verb, priority "
+            f"FROM ({sql}) AS sources (recipient_id, verb, priority) "
+            "ORDER BY recipient_id, priority"
+            ") AS recipients ORDER BY priority, recipient_id"
+        )
+
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def make_notifications(self, **kwargs):
+        """Builds (unsaved) Notification instances from resolved
+        recipients.
+
+        Args:
+            **kwargs: common Notification fields e.g. content_object, actor
+
+        Returns:
+            List[Notification]
+        """
+        return [
+            Notification(recipient_id=recipient_id, verb=verb, **kwargs)
+            for recipient_id, verb in self.resolve()
+        ]
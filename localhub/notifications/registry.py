@@ -32,7 +32,7 @@ class AdapterRegistry:
         except KeyError:
             raise ImproperlyConfigured(
                 "%r does not have a registered notification adapter"
-                % self.content_object
+                % notification.content_object
             )
 
     def register(self, adapter_cls, model):
@@ -1,12 +1,21 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
+
 # Third Party Libraries
 from celery import shared_task
 from celery.utils.log import get_task_logger
 
+# Localhub
+from localhub.common.metrics import SEND_FAILURES, SEND_LATENCY
+
 # Local
-from .models import PushSubscription
+from . import digests
+from .models import Notification, PushSubscription
 
 logger = get_task_logger(__name__)
 
@@ -17,7 +26,55 @@ def send_webpush(recipient_id, community_id, payload):
         user__pk=recipient_id, community__pk=community_id
     ):
         try:
-            if subscription.push(payload):
-                logger.info("Notification push sent")
+            with SEND_LATENCY.labels("webpush").time():
+                if subscription.push(payload):
+                    logger.info("Notification push sent")
         except Exception as e:
+            SEND_FAILURES.labels("webpush").inc()
             logger.exception(e)
+
+
+@shared_task(name="localhub.notifications.send_notification_digests")
+def send_notification_digests(frequency):
+    """Queues digest emails for all users with this digest frequency.
+    Should be run on a schedule e.g. with celery beat.
+
+    Args:
+        frequency (str): "hourly" or "daily"
+    """
+    for recipient_id in (
+        get_user_model()
+        .objects.filter(
+            is_active=True,
+            send_email_notifications=True,
+            notification_digest=frequency,
+        )
+        .values_list("pk", flat=True)
+    ):
+        send_notification_digest.delay(recipient_id)
+
+
+@shared_task(name="localhub.notifications.send_notification_digest")
+def send_notification_digest(recipient_id):
+    try:
+        recipient = get_user_model().objects.get(pk=recipient_id)
+    except ObjectDoesNotExist:
+        return
+
+    try:
+        if num_sent := digests.send_notification_digest(recipient):
+            logger.info("%d digest email(s) sent to user %s", num_sent, recipient_id)
+    except Exception as e:
+        logger.exception(e)
+
+
+@shared_task(name="localhub.notifications.purge_expired_notifications")
+def purge_expired_notifications():
+    """Deletes notifications older than their retention period (see
+    settings.NOTIFICATION_RETENTION_DAYS). Should be run on a schedule e.g.
+    with celery beat.
+    """
+    num_deleted = Notification.objects.expired().delete_in_batches(
+        settings.NOTIFICATION_PURGE_BATCH_SIZE
+    )
+    logger.info("%d expired notification(s) deleted", num_deleted)
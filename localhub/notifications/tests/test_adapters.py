@@ -1,8 +1,12 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Django
+from django.template import loader
+
 # Third Party Libraries
 import pytest
+from prometheus_client import REGISTRY
 
 # Localhub
 from localhub.activities.posts.notifications import PostAdapter
@@ -30,11 +34,57 @@ class TestAdapter:
         assert "has mentioned you" in response
         assert "post" in response
 
+    def test_render_to_tag_template_cached(self, adapter, mocker):
+        adapter.renderer.template_cache.clear()
+        mock_select_template = mocker.spy(loader, "select_template")
+
+        adapter.render_to_tag()
+
+        other = PostAdapter(
+            NotificationFactory(verb="mention", community=adapter.community)
+        )
+        assert "has mentioned you" in other.render_to_tag()
+        assert mock_select_template.call_count == 1
+
+    def test_render_to_tag_after_mailer_send(self, adapter, mailoutbox):
+        adapter.renderer.template_cache.clear()
+
+        adapter.mailer.send()
+        assert "<html" in mailoutbox[0].alternatives[0][0]
+
+        response = adapter.render_to_tag()
+        assert "has mentioned you" in response
+        assert "<html" not in response
+
+        adapter.renderer.template_cache.clear()
+
+        adapter.render_to_tag()
+        adapter.mailer.send()
+        assert "<html" in mailoutbox[1].alternatives[0][0]
+
     def test_send_notification(self, adapter, mailoutbox, send_webpush_mock):
         adapter.send_notification()
         assert send_webpush_mock.delay.called
         assert len(mailoutbox) == 1
 
+    def test_send_notification_if_digest(self, adapter, mailoutbox, send_webpush_mock):
+        adapter.recipient.notification_digest = "daily"
+        adapter.send_notification()
+        assert send_webpush_mock.delay.called
+        assert len(mailoutbox) == 0
+
+    def test_get_actor_display(self, adapter):
+        assert adapter.get_actor_display() == adapter.actor.get_display_name()
+
+    def test_get_actor_display_if_coalesced(self, adapter):
+        adapter.notification.actor_count = 3
+        assert adapter.get_actor_display() == (
+            f"{adapter.actor.get_display_name()} (and 2 others)"
+        )
+
+    def test_render_to_digest(self, adapter):
+        assert adapter.get_absolute_url() in adapter.render_to_digest()
+
     def test_webpusher_send(self, adapter, send_webpush_mock):
         adapter.webpusher.send()
         assert send_webpush_mock.delay.called
@@ -43,3 +93,19 @@ class TestAdapter:
         adapter.mailer.send()
         assert len(mailoutbox) == 1
         assert mailoutbox[0].to == [adapter.notification.recipient.email]
+
+    def test_mailer_send_metrics(self, adapter, mailoutbox):
+        count = REGISTRY.get_sample_value(
+            "localhub_email_enqueue_latency_seconds_count"
+        )
+        adapter.mailer.send()
+        assert (
+            REGISTRY.get_sample_value("localhub_email_enqueue_latency_seconds_count")
+            == count + 1
+        )
+        assert (
+            REGISTRY.get_sample_value(
+                "localhub_send_latency_seconds_count", {"channel": "email"}
+            )
+            is None
+        )
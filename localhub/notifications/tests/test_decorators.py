@@ -3,9 +3,11 @@
 
 # Third Party Libraries
 import pytest
+from prometheus_client import REGISTRY
 
 # Localhub
 from localhub.communities.factories import MembershipFactory
+from localhub.users.utils import get_state_version
 
 # Local
 from ..decorators import notify
@@ -15,6 +17,31 @@ pytestmark = pytest.mark.django_db
 
 
 class TestDispatch:
+    def test_dispatch_metrics(self, post, send_webpush_mock):
+        def get_sample(name):
+            return REGISTRY.get_sample_value(name) or 0
+
+        count = get_sample("localhub_notify_recipients_count")
+        total = get_sample("localhub_notify_recipients_sum")
+
+        @notify
+        def do_mention(post):
+            return [
+                Notification(
+                    community=post.community,
+                    verb="mention",
+                    actor=post.owner,
+                    content_object=post,
+                    recipient=MembershipFactory(community=post.community).member,
+                )
+                for _ in range(3)
+            ]
+
+        do_mention(post)
+
+        assert get_sample("localhub_notify_recipients_count") == count + 1
+        assert get_sample("localhub_notify_recipients_sum") == total + 3
+
     def test_dispatch(self, post, mailoutbox, send_webpush_mock):
         notification = Notification(
             community=post.community,
@@ -58,3 +85,73 @@ class TestDispatch:
         assert send_webpush_mock.delay.called_once
         assert len(mailoutbox) == 1
         assert mailoutbox[0].to == [notification.recipient.email]
+
+    def test_dispatch_if_coalesced(self, post, mailoutbox, send_webpush_mock):
+        recipient = MembershipFactory(community=post.community).member
+        other = MembershipFactory(community=post.community).member
+
+        @notify
+        def do_like(actor):
+            return Notification(
+                community=post.community,
+                verb="like",
+                actor=actor,
+                content_object=post,
+                recipient=recipient,
+            )
+
+        do_like(post.owner)
+        do_like(other)
+
+        notification = Notification.objects.get()
+        assert notification.actor == other
+        assert notification.actor_count == 2
+
+        assert len(mailoutbox) == 1
+
+    def test_dispatch_if_coalesce_disabled(
+        self, post, mailoutbox, send_webpush_mock, settings
+    ):
+        settings.NOTIFICATION_COALESCE_SECONDS = 0
+
+        recipient = MembershipFactory(community=post.community).member
+
+        @notify
+        def do_like(actor):
+            return Notification(
+                community=post.community,
+                verb="like",
+                actor=actor,
+                content_object=post,
+                recipient=recipient,
+            )
+
+        do_like(post.owner)
+        do_like(MembershipFactory(community=post.community).member)
+
+        assert Notification.objects.count() == 2
+        assert len(mailoutbox) == 2
+
+    def test_dispatch_bumps_recipient_state_version(
+        self, post, mocker, send_webpush_mock, locmem_cache
+    ):
+        mocker.patch(
+            "localhub.notifications.decorators.transaction.on_commit",
+            side_effect=lambda func: func(),
+        )
+        recipient = MembershipFactory(community=post.community).member
+        version = get_state_version(recipient)
+
+        @notify
+        def do_mention(post):
+            return Notification(
+                community=post.community,
+                verb="mention",
+                actor=post.owner,
+                content_object=post,
+                recipient=recipient,
+            )
+
+        do_mention(post)
+
+        assert get_state_version(recipient) != version
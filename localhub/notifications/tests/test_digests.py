@@ -0,0 +1,85 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Standard Library
+from datetime import timedelta
+
+# Django
+from django.utils import timezone
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.communities.factories import MembershipFactory
+
+# Local
+from ..digests import send_notification_digest
+from ..factories import NotificationFactory
+from ..tasks import send_notification_digests
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def recipient(member):
+    member.member.notification_digest = "daily"
+    member.member.save()
+    return member.member
+
+
+def make_notification(recipient, community, **kwargs):
+    actor = MembershipFactory(community=community).member
+    return NotificationFactory(
+        recipient=recipient,
+        actor=actor,
+        community=community,
+        content_object__community=community,
+        content_object__owner=actor,
+        **kwargs,
+    )
+
+
+class TestSendNotificationDigest:
+    def test_send(self, recipient, community, mailoutbox):
+        make_notification(recipient, community)
+        make_notification(recipient, community)
+        make_notification(recipient, community, is_read=True)
+
+        assert send_notification_digest(recipient) == 1
+        assert len(mailoutbox) == 1
+
+        mail = mailoutbox[0]
+        assert mail.to == [recipient.email]
+        assert "2 new notifications" in mail.subject
+        assert "has mentioned you" in mail.body
+
+        recipient.refresh_from_db()
+        assert recipient.notification_digest_sent
+
+    def test_send_if_already_sent(self, recipient, community, mailoutbox):
+        make_notification(recipient, community)
+        recipient.notification_digest_sent = timezone.now() + timedelta(minutes=1)
+
+        assert send_notification_digest(recipient) == 0
+        assert len(mailoutbox) == 0
+
+    def test_send_if_no_notifications(self, recipient, mailoutbox):
+        assert send_notification_digest(recipient) == 0
+        assert len(mailoutbox) == 0
+
+
+class TestSendNotificationDigests:
+    def test_send(self, recipient, mocker):
+        mock_send = mocker.patch(
+            "localhub.notifications.tasks.send_notification_digest"
+        )
+        send_notification_digests("daily")
+        mock_send.delay.assert_called_once_with(recipient.id)
+
+    def test_send_if_other_frequency(self, recipient, mocker):
+        mock_send = mocker.patch(
+            "localhub.notifications.tasks.send_notification_digest"
+        )
+        send_notification_digests("hourly")
+        assert not mock_send.delay.called
@@ -2,13 +2,20 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
 # Standard Library
+from datetime import timedelta
 from unittest import mock
 
+# Django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
 # Third Party Libraries
 import pytest
 from pywebpush import WebPushException
 
 # Localhub
+from localhub.comments.factories import CommentFactory
 from localhub.communities.factories import CommunityFactory, MembershipFactory
 from localhub.communities.models import Community
 from localhub.users.factories import UserFactory
@@ -71,6 +78,144 @@ class TestNotificationManager:
         assert Notification.objects.for_recipient(user).count() == 1
 
 
+class TestNotificationCoalesce:
+    def make_notification(self, notification, **kwargs):
+        return Notification(
+            **{
+                "content_object": notification.content_object,
+                "community": notification.community,
+                "recipient": notification.recipient,
+                "actor": notification.actor,
+                "verb": notification.verb,
+                **kwargs,
+            }
+        )
+
+    def test_coalesce(self, notification, user):
+        new = self.make_notification(notification, actor=user)
+        other = self.make_notification(notification, verb="reshare")
+
+        assert Notification.objects.coalesce([new, other], timedelta(hours=1)) == [
+            other
+        ]
+
+        notification.refresh_from_db()
+        assert notification.actor == user
+        assert notification.actor_count == 2
+
+    def test_coalesce_if_same_actor(self, notification):
+        new = self.make_notification(notification)
+        assert Notification.objects.coalesce([new], timedelta(hours=1)) == []
+
+        notification.refresh_from_db()
+        assert notification.actor_count == 1
+
+    def test_coalesce_if_read(self, notification):
+        notification.is_read = True
+        notification.save()
+
+        new = self.make_notification(notification)
+        assert Notification.objects.coalesce([new], timedelta(hours=1)) == [new]
+
+    def test_coalesce_if_outside_window(self, notification):
+        Notification.objects.filter(pk=notification.pk).update(
+            created=timezone.now() - timedelta(hours=2)
+        )
+        new = self.make_notification(notification)
+        assert Notification.objects.coalesce([new], timedelta(hours=1)) == [new]
+
+    def test_coalesce_if_no_window(self, notification):
+        new = self.make_notification(notification)
+        assert Notification.objects.coalesce([new], None) == [new]
+
+
+def make_expired(notification, days):
+    Notification.objects.filter(pk=notification.pk).update(
+        created=timezone.now() - timedelta(days=days)
+    )
+
+
+class TestNotificationRetention:
+    retention = {"default": 365, "like": 30, "reshare": None}
+
+    def test_expired(self):
+        old = NotificationFactory()
+        old_like = NotificationFactory(verb="like")
+        old_reshare = NotificationFactory(verb="reshare")
+        recent_like = NotificationFactory(verb="like")
+        recent = NotificationFactory()
+
+        make_expired(old, 400)
+        make_expired(old_like, 40)
+        make_expired(old_reshare, 400)
+        make_expired(recent_like, 20)
+        make_expired(recent, 40)
+
+        assert set(Notification.objects.expired(self.retention)) == {old, old_like}
+
+    def test_expired_if_no_default(self):
+        old = NotificationFactory()
+        make_expired(old, 400)
+        assert not Notification.objects.expired({"default": None}).exists()
+
+    def test_delete_in_batches(self):
+        NotificationFactory.create_batch(5)
+        keep = NotificationFactory(verb="like")
+
+        assert (
+            Notification.objects.filter(verb="mention").delete_in_batches(batch_size=2)
+            == 5
+        )
+        assert list(Notification.objects.all()) == [keep]
+
+    def test_unread_query_plan(self):
+        # the planner prefers seq scans on tiny tables, so disable them
+        # to check the partial index can be used at all
+        NotificationFactory.create_batch(3)
+        recipient = UserFactory()
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = (
+            Notification.objects.filter(recipient=recipient, community_id=1)
+            .unread()
+            .explain()
+        )
+        assert "notification_unread_idx" in plan
+
+    def test_recipient_query_plan(self):
+        NotificationFactory.create_batch(3)
+        recipient = UserFactory()
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = (
+            Notification.objects.filter(recipient=recipient, community_id=1)
+            .order_by("-created")
+            .explain()
+        )
+        assert "notification_recipient_idx" in plan
+
+
+class TestNotificationModel:
+    def test_prefetch_content_objects(self, post, user):
+        NotificationFactory(content_object=post)
+        NotificationFactory(content_object=CommentFactory(content_object=post))
+        NotificationFactory(content_object=user, verb="new_follower")
+
+        notifications = list(
+            Notification.objects.prefetch_related("content_object").order_by("id")
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            post, comment, user = [n.content_object for n in notifications]
+            assert post.owner
+            assert post.community
+            assert comment.owner
+            assert comment.community
+            assert user
+
+        assert len(ctx.captured_queries) == 0
+
+
 class TestPushSubscriptionModel:
     def test_push_if_ok(self, member):
         sub = PushSubscription.objects.create(
@@ -0,0 +1,54 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Third Party Libraries
+import pytest
+
+# Localhub
+from localhub.users.factories import UserFactory
+from localhub.users.models import User
+
+# Local
+from ..recipients import RecipientResolver
+
+pytestmark = pytest.mark.django_db
+
+
+class TestRecipientResolver:
+    def test_resolve_if_no_sources(self):
+        assert RecipientResolver().resolve() == []
+
+    def test_resolve_if_empty_source(self):
+        assert RecipientResolver().add("mention", User.objects.none()).resolve() == []
+
+    def test_resolve(self):
+        first = UserFactory()
+        second = UserFactory()
+        third = UserFactory()
+
+        resolver = (
+            RecipientResolver()
+            .add("mention", User.objects.filter(pk=second.id))
+            .add("followed_user", User.objects.filter(pk__in=[first.id, second.id]))
+            .add("followed_tag", User.objects.filter(pk__in=[second.id, third.id]))
+        )
+
+        assert resolver.resolve() == [
+            (second.id, "mention"),
+            (first.id, "followed_user"),
+            (third.id, "followed_tag"),
+        ]
+
+    def test_make_notifications(self, post):
+        user = UserFactory()
+        notifications = (
+            RecipientResolver()
+            .add("mention", User.objects.filter(pk=user.id))
+            .make_notifications(
+                content_object=post, actor=post.owner, community=post.community
+            )
+        )
+        assert len(notifications) == 1
+        assert notifications[0].recipient_id == user.id
+        assert notifications[0].verb == "mention"
+        assert notifications[0].content_object == post
@@ -1,12 +1,19 @@
 # Copyright (c) 2020 by Dan Jacob
 # SPDX-License-Identifier: AGPL-3.0-or-later
 
+# Standard Library
+from datetime import timedelta
+
+# Django
+from django.utils import timezone
+
 # Third Party Libraries
 import pytest
 
 # Local
-from ..models import PushSubscription
-from ..tasks import send_webpush
+from ..factories import NotificationFactory
+from ..models import Notification, PushSubscription
+from ..tasks import purge_expired_notifications, send_webpush
 
 pytestmark = pytest.mark.django_db
 
@@ -26,3 +33,19 @@ class TestSendPushNotification:
 
         send_webpush(member.member_id, member.community_id, payload)
         assert send_webpush_mock.delay.called_once()
+
+
+class TestPurgeExpiredNotifications:
+    def test_purge(self, settings):
+        settings.NOTIFICATION_RETENTION_DAYS = {"default": 30}
+        settings.NOTIFICATION_PURGE_BATCH_SIZE = 1
+
+        Notification.objects.filter(
+            pk__in=[n.pk for n in NotificationFactory.create_batch(3)]
+        ).update(created=timezone.now() - timedelta(days=31))
+
+        keep = NotificationFactory()
+
+        purge_expired_notifications()
+
+        assert list(Notification.objects.all()) == [keep]
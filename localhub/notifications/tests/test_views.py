@@ -6,6 +6,7 @@ import http
 import json
 
 # Django
+from django.db import connection
 from django.urls import reverse
 
 # Third Party Libraries
@@ -17,6 +18,7 @@ from localhub.activities.photos.factories import PhotoFactory
 from localhub.activities.posts.factories import PostFactory
 from localhub.comments.factories import CommentFactory
 from localhub.communities.factories import MembershipFactory
+from localhub.private_messages.factories import MessageFactory
 
 # Local
 from ..factories import NotificationFactory
@@ -64,6 +66,73 @@ class TestNotificationListView:
         assert len(response.context["object_list"]) == 4
         assert response.status_code == http.HTTPStatus.OK
 
+    def test_get_if_not_modified(self, client, member, locmem_cache):
+        post = PostFactory(community=member.community)
+        NotificationFactory(
+            content_object=post,
+            recipient=member.member,
+            actor=post.owner,
+            community=post.community,
+            verb="mention",
+        )
+        etag = client.get(reverse("notifications:list"))["ETag"]
+
+        response = client.get(reverse("notifications:list"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == http.HTTPStatus.NOT_MODIFIED
+
+        NotificationFactory(
+            content_object=post,
+            recipient=member.member,
+            actor=post.owner,
+            community=post.community,
+            verb="new_comment",
+        )
+        response = client.get(reverse("notifications:list"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == http.HTTPStatus.OK
+
+    def test_get_num_queries(self, client, member):
+        def make_notifications():
+            owner = MembershipFactory(community=member.community).member
+            post = PostFactory(community=member.community, owner=owner)
+            comment = CommentFactory(content_object=post, owner=owner)
+            message = MessageFactory(
+                community=member.community, sender=owner, recipient=member.member
+            )
+            for content_object, verb in (
+                (post, "mention"),
+                (comment, "new_comment"),
+                (message, "send"),
+                (owner, "new_follower"),
+            ):
+                NotificationFactory(
+                    content_object=content_object,
+                    recipient=member.member,
+                    actor=owner,
+                    community=member.community,
+                    verb=verb,
+                )
+
+        def count_queries():
+            # not using CaptureQueriesContext, as the test client resets
+            # the queries log at the start of each request
+            queries = []
+            with connection.execute_wrapper(
+                lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)
+            ):
+                response = client.get(reverse("notifications:list"))
+                assert response.status_code == http.HTTPStatus.OK
+            return len(queries)
+
+        make_notifications()
+        # first request populates caches e.g. content types
+        count_queries()
+        num_queries = count_queries()
+
+        for _ in range(3):
+            make_notifications()
+
+        assert count_queries() == num_queries
+
 
 class TestNotificationMarkReadView:
     def test_post(self, client, member, mocker):
@@ -9,6 +9,7 @@ import json
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.db import IntegrityError
+from django.db.models import Count, Max
 from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
@@ -18,7 +19,9 @@ from django.views.decorators.http import require_POST
 from turbo_response import TurboStream
 
 # Localhub
+from localhub.common.conditional import conditional_response
 from localhub.common.pagination import render_paginated_queryset
+from localhub.communities.cache import get_content_version
 from localhub.communities.decorators import community_required
 
 # Local
@@ -37,18 +40,28 @@ def notification_list_view(request):
         .order_by("is_read", "-created")
     )
 
-    return render_paginated_queryset(
+    # count changes if notifications are deleted
+    validators = Notification.objects.filter(
+        recipient=request.user, community=request.community
+    ).aggregate(last_modified=Max("modified"), count=Count("pk"))
+
+    return conditional_response(
         request,
-        qs,
-        "notifications/notification_list.html",
-        {
-            "is_unread_notifications": qs.filter(is_read=False).exists(),
-            "webpush_settings": {
-                "public_key": settings.VAPID_PUBLIC_KEY,
-                "enabled": settings.WEBPUSH_ENABLED,
+        lambda: render_paginated_queryset(
+            request,
+            qs,
+            "notifications/notification_list.html",
+            {
+                "is_unread_notifications": qs.filter(is_read=False).exists(),
+                "webpush_settings": {
+                    "public_key": settings.VAPID_PUBLIC_KEY,
+                    "enabled": settings.WEBPUSH_ENABLED,
+                },
             },
-        },
-        page_size=settings.LONG_PAGE_SIZE,
+            page_size=settings.LONG_PAGE_SIZE,
+        ),
+        last_modified=validators["last_modified"],
+        version=[validators["count"], get_content_version(request.community.id)],
     )
 
 
@@ -249,6 +249,19 @@ class MessageQuerySet(
             QuerySet
         """
 
+        return self.filter(pk__in=[obj.id for obj in self.raw_replies(parent)])
+
+    def raw_replies(self, parent):
+        """Recursive query used by `all_replies`, returning ids of all
+        descendants of this message.
+
+        Args:
+            parent (Message): top-level message parent/grandparent
+
+        Returns:
+            RawQuerySet
+        """
+
         # does PostgreSQL WITH RECURSIVE
 
         table_name = self.model._meta.db_table
@@ -262,9 +275,7 @@ class MessageQuerySet(
             f"WHERE children.id={table_name}.id AND {table_name}.id != %(parent_id)s"
         )
 
-        return self.filter(
-            pk__in=[obj.id for obj in self.raw(query, {"parent_id": parent.pk})]
-        )
+        return self.raw(query, {"parent_id": parent.pk})
 
     def notifications(self):
         """
@@ -155,6 +155,19 @@ class TestMessageDetailView:
         message.refresh_from_db()
         assert message.read is not None
 
+    def test_get_if_not_modified(self, client, member, locmem_cache):
+        sender = MembershipFactory(community=member.community).member
+        message = MessageFactory(
+            community=member.community, recipient=member.member, sender=sender
+        )
+        response = client.get(message.get_absolute_url())
+        assert response.status_code == http.HTTPStatus.OK
+
+        response = client.get(
+            message.get_absolute_url(), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == http.HTTPStatus.NOT_MODIFIED
+
     def test_get_if_neither_recipient_nor_sender(self, client, member):
         sender = MembershipFactory(community=member.community).member
         recipient = MembershipFactory(community=member.community).member
@@ -17,10 +17,11 @@ from turbo_response import TurboFrame, TurboStream, redirect_303, render_form_re
 
 # Localhub
 from localhub.bookmarks.models import Bookmark
+from localhub.common.conditional import conditional_response
 from localhub.common.decorators import add_messages_to_response_header
 from localhub.common.pagination import render_paginated_queryset
 from localhub.communities.decorators import community_required
-from localhub.users.utils import has_perm_or_403
+from localhub.users.utils import bump_state_versions, has_perm_or_403
 
 # Local
 from .forms import MessageForm, MessageRecipientForm
@@ -226,24 +227,30 @@ def message_detail_view(request, pk):
         pk=pk,
     )
 
-    if message.recipient == request.user:
+    if message.recipient == request.user and not message.read:
         message.mark_read(mark_replies=True)
+        bump_state_versions(request.user.pk)
 
-    return TemplateResponse(
+    # new replies change the state version of the sender or recipient
+    return conditional_response(
         request,
-        "private_messages/message_detail.html",
-        {
-            "message": message,
-            "parent": message.get_parent(request.user),
-            "other_user": message.get_other_user(request.user),
-            "replies": (
-                message.get_all_replies()
-                .for_sender_or_recipient(request.user)
-                .common_select_related()
-                .order_by("created")
-                .distinct()
-            ),
-        },
+        lambda: TemplateResponse(
+            request,
+            "private_messages/message_detail.html",
+            {
+                "message": message,
+                "parent": message.get_parent(request.user),
+                "other_user": message.get_other_user(request.user),
+                "replies": (
+                    message.get_all_replies()
+                    .for_sender_or_recipient(request.user)
+                    .common_select_related()
+                    .order_by("created")
+                    .distinct()
+                ),
+            },
+        ),
+        last_modified=message.modified,
     )
 
 
@@ -6,6 +6,9 @@ from django.contrib.auth import get_user_model
 # Third Party Libraries
 from sorl.thumbnail.admin import AdminImageMixin
 
+# Localhub
+from localhub.common.db.admin import ChunkedDeletionAdminMixin
+
 # Local
 from .forms import UserChangeForm, UserCreationForm
 
@@ -13,7 +16,7 @@ User = get_user_model()
 
 
 @admin.register(User)
-class UserAdmin(AdminImageMixin, auth_admin.UserAdmin):
+class UserAdmin(ChunkedDeletionAdminMixin, AdminImageMixin, auth_admin.UserAdmin):
     form = UserChangeForm
     add_form = UserCreationForm
     fieldsets = (
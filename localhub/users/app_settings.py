@@ -7,7 +7,9 @@ import re
 # Django
 from django.urls import reverse_lazy
 
-MENTIONS_RE = re.compile(r"(?:^|\s)[＠ @]{1}([^\s#<>!.?[\]|{}]+)")
+MENTION_PATTERN = r"[＠@]{1}(?P<mention>[^\s#<>!.?[\]|{}]+)"
+
+MENTIONS_RE = re.compile(r"(?:^|\s)" + MENTION_PATTERN)
 
 MENTIONS_TYPEAHEAD_CONFIG = (
     "@",
@@ -48,6 +48,7 @@ class UserForm(forms.ModelForm):
             "language",
             "default_timezone",
             "send_email_notifications",
+            "notification_digest",
             "activity_stream_filters",
             "show_sensitive_content",
             "show_external_images",
@@ -73,6 +74,7 @@ class UserForm(forms.ModelForm):
                 "Show embedded content such as Youtube videos and tweets"
             ),
             "default_timezone": _("Timezone"),
+            "notification_digest": _("Email notifications"),
         }
 
         help_texts = {
@@ -99,6 +101,7 @@ class UserForm(forms.ModelForm):
                     "language",
                     "default_timezone",
                     "send_email_notifications",
+                    "notification_digest",
                     "bio",
                 ),
             ),
@@ -4,6 +4,9 @@
 # Django
 from django.conf import settings
 
+# Local
+from .utils import bump_state_versions
+
 
 class UserLocaleMiddleware:
     """
@@ -23,3 +26,23 @@ class UserLocaleMiddleware:
                 samesite=settings.LANGUAGE_COOKIE_SAMESITE,
             )
         return response
+
+
+class UserStateMiddleware:
+    """
+    Changes the user's state version after any unsafe request (e.g. likes,
+    follows or changing settings), so conditional GET requests return the
+    updated page.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method not in ("GET", "HEAD", "OPTIONS", "TRACE")
+            and request.user.is_authenticated
+        ):
+            bump_state_versions(request.user.pk)
+        return response
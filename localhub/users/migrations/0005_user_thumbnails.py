@@ -0,0 +1,19 @@
+# Generated by Django 3.1.14 on 2026-10-19 01:46
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_auto_20201008_1514"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="thumbnails",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.1.14 on 2026-10-19 02:18
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_user_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="notification_digest",
+            field=models.CharField(
+                choices=[
+                    ("immediate", "Send each notification immediately"),
+                    ("hourly", "Send an hourly digest"),
+                    ("daily", "Send a daily digest"),
+                ],
+                default="immediate",
+                max_length=12,
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="notification_digest_sent",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -14,6 +14,7 @@ from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 # Third Party Libraries
+from celery.utils.log import get_logger
 from sorl.thumbnail import ImageField
 from taggit.models import Tag
 from timezone_field import TimeZoneField
@@ -25,11 +26,14 @@ from localhub.common.db.search.indexer import SearchIndexer
 from localhub.common.db.search.mixins import SearchQuerySetMixin
 from localhub.common.db.tracker import TrackerModelMixin
 from localhub.common.markdown.fields import MarkdownField
+from localhub.common.thumbnails import ThumbnailGenerator
 from localhub.common.utils.itertools import takefirst
 from localhub.communities.models import Membership
 from localhub.notifications.decorators import notify
 from localhub.notifications.models import Notification
 
+celery_logger = get_logger(__name__)
+
 
 class UserQuerySet(SearchQuerySetMixin, models.QuerySet):
     def for_email(self, email):
@@ -274,9 +278,15 @@ class User(TrackerModelMixin, AbstractUser):
         USERS = "users", _("Limited to only content from people I'm following")
         TAGS = "tags", _("Limited to only tags I'm following")
 
+    class NotificationDigest(models.TextChoices):
+        IMMEDIATE = "immediate", _("Send each notification immediately")
+        HOURLY = "hourly", _("Send an hourly digest")
+        DAILY = "daily", _("Send a daily digest")
+
     name = models.CharField(_("Full name"), blank=True, max_length=255)
     bio = MarkdownField(blank=True)
     avatar = ImageField(upload_to="avatars", null=True, blank=True)
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
 
     language = models.CharField(
         max_length=6,
@@ -298,6 +308,15 @@ class User(TrackerModelMixin, AbstractUser):
 
     send_email_notifications = models.BooleanField(default=True)
 
+    notification_digest = models.CharField(
+        max_length=12,
+        choices=NotificationDigest.choices,
+        default=NotificationDigest.IMMEDIATE,
+    )
+    notification_digest_sent = models.DateTimeField(
+        null=True, blank=True, editable=False
+    )
+
     dismissed_notices = ArrayField(models.CharField(max_length=30), default=list)
 
     following = models.ManyToManyField(
@@ -316,6 +335,14 @@ class User(TrackerModelMixin, AbstractUser):
 
     search_indexer = SearchIndexer(("A", "username"), ("B", "name"), ("C", "bio"))
 
+    thumbnailer = ThumbnailGenerator(
+        "avatar",
+        *[
+            (geometry, {"format": "PNG", "crop": "center"})
+            for geometry in ("16", "32", "32x32", "64x64")
+        ],
+    )
+
     tracked_fields = ["avatar", "name", "bio"]
 
     objects = UserManager()
@@ -437,6 +464,24 @@ class User(TrackerModelMixin, AbstractUser):
         """
         return (self.blockers.all() | self.blocked.all()).distinct()
 
+    def schedule_deletion(self):
+        """Deactivates the account immediately, and queues celery task to
+        delete it with all content, messages and memberships.
+        """
+        # Local
+        from . import tasks
+
+        self.is_active = False
+        self.save(update_fields=["is_active"])
+
+        def _schedule():
+            try:
+                tasks.delete_user.delay(self.id)
+            except tasks.delete_user.OperationalError as e:
+                celery_logger.exception(e)
+
+        transaction.on_commit(_schedule)
+
     @transaction.atomic
     def block_user(self, user):
         """Blocks this user. Any following relationships are also removed.
@@ -0,0 +1,32 @@
+# Copyright (c) 2020 by Dan Jacob
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# Django
+from django.contrib.auth import get_user_model
+
+# Third Party Libraries
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+# Localhub
+from localhub.common.db.deletion import DELETION_TASK_OPTIONS, delete_object_in_chunks
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(name="localhub.users.delete_user", **DELETION_TASK_OPTIONS)
+def delete_user(user_id):
+    """Deletes deactivated user account with all related rows in chunks.
+    Can be run again if interrupted.
+
+    Args:
+        user_id (int): User primary key
+    """
+    User = get_user_model()
+
+    if User.objects.filter(pk=user_id, is_active=True).exists():
+        logger.info("User %s is active, not deleted", user_id)
+        return
+
+    if delete_object_in_chunks(User, user_id):
+        logger.info("User %s deleted", user_id)
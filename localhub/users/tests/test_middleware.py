@@ -5,8 +5,12 @@
 from django.conf import settings
 from django.utils.encoding import force_text
 
+# Third Party Libraries
+import pytest
+
 # Local
-from ..middleware import UserLocaleMiddleware
+from ..middleware import UserLocaleMiddleware, UserStateMiddleware
+from ..utils import get_state_version
 
 
 class TestUserLocaleMiddleware:
@@ -19,3 +23,21 @@ class TestUserLocaleMiddleware:
         assert "django_language=fi" in force_text(
             resp.cookies[settings.LANGUAGE_COOKIE_NAME]
         )
+
+
+class TestUserStateMiddleware:
+    @pytest.mark.django_db
+    def test_post(self, rf, get_response, user, locmem_cache):
+        version = get_state_version(user)
+        req = rf.post("/")
+        req.user = user
+        UserStateMiddleware(get_response)(req)
+        assert get_state_version(user) != version
+
+    @pytest.mark.django_db
+    def test_get(self, rf, get_response, user, locmem_cache):
+        version = get_state_version(user)
+        req = rf.get("/")
+        req.user = user
+        UserStateMiddleware(get_response)(req)
+        assert get_state_version(user) == version
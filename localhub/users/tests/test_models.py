@@ -258,6 +258,20 @@ class TestUserManager:
 
 
 class TestUserModel:
+    def test_schedule_deletion(
+        self, user_model, community, run_on_commit, locmem_cache
+    ):
+        user = MembershipFactory(community=community).member
+        MessageFactory(community=community, sender=user)
+        user.schedule_deletion()
+        assert not user_model.objects.filter(pk=user.id).exists()
+        assert not Membership.objects.filter(member=user).exists()
+
+    def test_schedule_deletion_deactivates(self, user):
+        user.schedule_deletion()
+        user.refresh_from_db()
+        assert not user.is_active
+
     def test_has_tracker_changed(self, user):
 
         user.reset_tracker()
@@ -8,11 +8,30 @@ from django.core.exceptions import PermissionDenied
 import pytest
 
 # Local
-from ..utils import extract_mentions, has_perm_or_403, linkify_mentions, user_display
+from ..utils import (
+    bump_state_versions,
+    extract_mentions,
+    get_state_version,
+    has_perm_or_403,
+    linkify_mentions,
+    user_display,
+)
 
 pytestmark = pytest.mark.django_db
 
 
+class TestStateVersion:
+    def test_anonymous(self, anonymous_user):
+        assert get_state_version(anonymous_user) == 0
+
+    def test_bump_state_versions(self, user, locmem_cache):
+        version = get_state_version(user)
+        assert get_state_version(user) == version
+
+        bump_state_versions(user.id)
+        assert get_state_version(user) != version
+
+
 class TestHasPermOr403:
     def test_has_permission(self, user):
         has_perm_or_403(user, "users.change_user", obj=user)
@@ -265,11 +265,17 @@ class TestUserUpdateView:
     def test_post(self, client, login_user):
         response = client.post(
             reverse("user_update"),
-            {"name": "New Name", "language": "en", "default_timezone": "UTC"},
+            {
+                "name": "New Name",
+                "language": "en",
+                "default_timezone": "UTC",
+                "notification_digest": "daily",
+            },
         )
         assert response.url == reverse("user_update")
         login_user.refresh_from_db()
         assert login_user.name == "New Name"
+        assert login_user.notification_digest == "daily"
 
 
 class TestUserDeleteView:
@@ -277,11 +283,16 @@ class TestUserDeleteView:
         response = client.get(reverse("user_delete"))
         assert response.status_code == http.HTTPStatus.OK
 
-    def test_post(self, client, user_model, login_user):
+    def test_post(self, client, user_model, login_user, run_on_commit):
         response = client.post(reverse("user_delete"))
         assert response.url == "/"
         assert user_model.objects.filter(username=login_user.username).count() == 0
 
+    def test_post_deactivates_account(self, client, user_model, login_user):
+        response = client.post(reverse("user_delete"))
+        assert response.url == "/"
+        assert not user_model.objects.get(username=login_user.username).is_active
+
 
 class TestUserFollowView:
     def test_post(self, client, member, mailoutbox, send_webpush_mock):
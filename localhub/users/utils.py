@@ -4,13 +4,10 @@
 
 # Django
 from django.core.exceptions import PermissionDenied
-from django.urls import reverse
 
 # Localhub
-from localhub.common.utils.text import slugify_unicode
-
-# Local
-from .app_settings import MENTIONS_RE
+from localhub.common.utils.tokenizer import tokenize
+from localhub.common.utils.versions import bump_versions, get_version
 
 
 def has_perm_or_403(user, perm, obj=None):
@@ -18,6 +15,35 @@ def has_perm_or_403(user, perm, obj=None):
         raise PermissionDenied
 
 
+def get_state_version_key(user_id):
+    return f"users.state-version:{user_id}"
+
+
+def get_state_version(user):
+    """Returns version of user-specific state shown in pages, e.g. likes,
+    bookmarks and unread notifications. Anonymous users always return 0.
+
+    Args:
+        user (User)
+
+    Returns:
+        int
+    """
+    if user.is_anonymous:
+        return 0
+    return get_version(get_state_version_key(user.pk))
+
+
+def bump_state_versions(*user_ids):
+    """Changes state versions of users, e.g. when they are sent
+    notifications.
+
+    Args:
+        *user_ids (int)
+    """
+    bump_versions(*map(get_state_version_key, user_ids))
+
+
 def user_display(user):
     """
     Returns default rendering of a user. Used with the
@@ -30,31 +56,11 @@ def extract_mentions(content):
     """
     Returns set of @mentions in text
     """
-    return set(
-        [
-            mention
-            for token in content.split(" ")
-            for mention in MENTIONS_RE.findall(token)
-        ]
-    )
+    return tokenize(content).mentions
 
 
 def linkify_mentions(content, css_class=None):
     """
     Replace all @mentions in the text with links to user profile page.
     """
-
-    tokens = content.split(" ")
-    rv = []
-    css_class = f' class="{css_class}"' if css_class else ""
-    for token in tokens:
-        for mention in MENTIONS_RE.findall(token):
-            url = reverse("users:activities", args=[slugify_unicode(mention)])
-            token = token.replace(
-                "@" + mention,
-                f'<a href="{url}"{css_class}>@{mention}</a>',
-            )
-
-        rv.append(token)
-
-    return " ".join(rv)
+    return tokenize(content, linkify_mentions=True, css_class=css_class).text
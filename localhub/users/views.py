@@ -349,7 +349,7 @@ def user_block_view(request, username, remove=False):
 @login_required
 def user_delete_view(request):
     if request.method == "POST":
-        request.user.delete()
+        request.user.schedule_deletion()
         logout(request)
         return redirect(settings.HOME_PAGE_URL)
     return TemplateResponse(request, "users/user_confirm_delete.html")